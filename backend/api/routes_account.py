@@ -1,19 +1,25 @@
-from fastapi import APIRouter
-from core.ibkr import ensure_connected, ib
+from fastapi import APIRouter, Request
+from core.ibkr import ensure_connected
+from core.serialize import etag_response
+from services.portfolio import portfolio
 
 router = APIRouter()
 
 
 @router.get("/api/account/summary")
-async def account_summary():
+async def account_summary(request: Request):
     await ensure_connected()
 
-    return [
-        {
-            "tag": s.tag,
-            "value": s.value,
-            "currency": s.currency,
-            "account": s.account
-        }
-        for s in ib.accountSummary()
-    ]
\ No newline at end of file
+    return etag_response(request, *portfolio.view("account"))
+
+
+@router.get("/api/account/pnl")
+async def account_pnl(request: Request):
+    await ensure_connected()
+
+    return etag_response(request, *portfolio.view("pnl"))
+
+
+@router.get("/api/portfolio/stats")
+async def portfolio_stats():
+    return portfolio.stats()
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException
+import asyncio
+
+import numpy as np
+
+from backtest.data import load_bars, find_bars
+from backtest.engine import CostModel, run_backtest
+from schemas.backtest import BacktestReq
+from strategy_params import StrategyParams
+
+router = APIRouter()
+
+
+def _run(req: BacktestReq):
+    costs = CostModel(req.commissionPerShare, req.minCommission, req.slippageBps)
+
+    fields = req.params.model_dump(exclude_none=True)
+
+    if "fib_ratios" in fields:
+        fields["fib_ratios"] = tuple(fields["fib_ratios"])
+
+    # types / ranges are checked by the schema; this catches the combinations
+    try:
+        params = StrategyParams(**fields).validate()
+    except ValueError as e:
+        raise HTTPException(422, f"bad params: {e}")
+
+    out = []
+
+    for symbol in req.symbols:
+        try:
+            bars = load_bars(find_bars(symbol))
+        except FileNotFoundError as e:
+            raise HTTPException(404, str(e))
+
+        result = run_backtest(bars, symbol.upper(), req.capital, costs, req.allowShort, req.barsPerYear, params)
+
+        # downsampled equity curve for the chart
+        idx = np.unique(np.linspace(0, len(result.equity) - 1, req.equityPoints).astype(int)) if len(result.equity) else []
+
+        out.append({
+            **result.summary(),
+            "equity": {
+                "time": result.time[idx].tolist(),
+                "value": result.equity[idx].tolist(),
+            },
+        })
+
+    return out
+
+
+@router.post("/api/backtest")
+async def backtest(req: BacktestReq):
+    # CPU-bound: keep it off the event loop
+    results = await asyncio.to_thread(_run, req)
+
+    return {"results": results}
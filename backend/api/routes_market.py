@@ -1,51 +1,68 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 import asyncio
-import math
-from datetime import datetime
+from typing import Optional
 
+from core.config import BATCH_MAX_INFLIGHT
 from core.ibkr import ensure_connected, ib
-from ib_insync import Stock, Forex, util
-from schemas.trade import HistoryReq
+from core.contracts import contract_resolver
+from core.metrics import ib_request_seconds
+from core.pacing import pacer
+from core.symbols import get_symbol_index
+from core.serialize import FastJSONResponse, bar_binary_response, bar_columns, dumps
+from ib_insync import Stock, Forex
+from schemas.trade import HistoryReq, BatchHistoryReq, BatchSnapshotReq
+from services.bar_cache import BarCache, get_bar_cache, bar_time
+from services.market_data import market_data
+from db.writer import db_writer
+from db.bars import save_bars, load_bars
+from backtest.archive import archive_rows
+from db.models import HistoricalRequestLog
 
 router = APIRouter()
 
+# shared by every batch request so concurrent batches don't multiply the load
+batch_slots = asyncio.Semaphore(BATCH_MAX_INFLIGHT)
 
-# ---------------- SEARCH ----------------
-@router.get("/api/search")
-async def search(q: str = Query(..., min_length=1)):
-    await ensure_connected()
+# background saves: the loop only keeps weak references to tasks
+background = set()
 
-    matches = await ib.reqMatchingSymbolsAsync(q.upper())
 
-    seen = set()
-    out = []
+def spawn(coro):
+    task = asyncio.create_task(coro)
+    background.add(task)
+    task.add_done_callback(background.discard)
 
-    for m in matches:
-        c = m.contract
 
-        if c.secType != "STK":
-            continue
+def log_history_request(req: HistoryReq, whatToShow: str, count: int, source: str):
+    db_writer.write(HistoricalRequestLog, {
+        "symbol": req.symbol,
+        "timeframe": req.barSize,
+        "duration": f"{req.durationStr} {whatToShow} rth={req.useRTH}",
+        "bars_requested": count,
+        "source": source,
+    })
 
-        if c.symbol in seen:
-            continue
 
-        seen.add(c.symbol)
+# ---------------- SEARCH ----------------
+@router.get("/api/search")
+async def search(q: str = Query(..., min_length=1), limit: int = Query(15, ge=1, le=100)):
+    # local index first; IBKR only for queries it has no match for
+    index = get_symbol_index()
 
-        out.append({
-            "symbol": c.symbol,
-            "name": getattr(c, "description", c.symbol),
-            "secType": c.secType,
-            "exchange": c.exchange
-        })
+    if index.is_miss(q, limit):
+        await ensure_connected()
 
-    return {"results": out}
+    return {"results": await index.lookup(q, limit)}
 
 
-# ---------------- HISTORY ----------------
-@router.post("/api/history")
-async def history(req: HistoryReq):
-    await ensure_connected()
+@router.get("/api/search/stats")
+async def search_stats():
+    return get_symbol_index().status()
+
 
+# ---------------- HISTORY ----------------
+async def fetch_history(req: HistoryReq):
     if "." in req.symbol:
         base, quote = req.symbol.split(".")
         contract = Forex(base + quote)
@@ -54,54 +71,180 @@ async def history(req: HistoryReq):
         contract = Stock(req.symbol, "SMART", "USD", primaryExchange="NASDAQ")
         whatToShow = req.whatToShow
 
-    await ib.qualifyContractsAsync(contract)
+    contract = await contract_resolver.resolve(contract)
 
-    bars = await ib.reqHistoricalDataAsync(
-        contract,
-        endDateTime=req.endDateTime or "",
-        durationStr=req.durationStr,
-        barSizeSetting=req.barSize,
-        whatToShow=whatToShow,
-        useRTH=req.useRTH,
-        formatDate=1
-    )
+    async def fetch(endDateTime, durationStr):
+        await pacer.acquire("historical", key=(contract.conId, endDateTime, durationStr, req.barSize, whatToShow, req.useRTH))
 
-    return {
-        "symbol": req.symbol,
-        "barCount": len(bars),
-        "bars": [
+        with ib_request_seconds.labels("historical").time():
+            return await ib.reqHistoricalDataAsync(
+                contract,
+                endDateTime=endDateTime,
+                durationStr=durationStr,
+                barSizeSetting=req.barSize,
+                whatToShow=whatToShow,
+                useRTH=req.useRTH,
+                formatDate=1
+            )
+
+    key = BarCache.make_key(contract.conId, req.barSize, whatToShow, req.useRTH)
+    rows, source = await get_bar_cache().get_bars(key, req.barSize, req.durationStr, req.endDateTime, fetch)
+
+    log_history_request(req, whatToShow, len(rows), source)
+
+    daily = not req.barSize.split()[1].startswith(("sec", "min", "hour"))
+
+    # the bars table is keyed by (conId, barSize, ts): only the default
+    # series (TRADES / forex MIDPOINT, extended hours) goes in, so other
+    # whatToShow / RTH requests can't overwrite it
+    canonical = whatToShow == ("MIDPOINT" if "." in req.symbol else "TRADES") and not req.useRTH
+
+    if source != "cache" and not daily and canonical:
+        spawn(save_bars(contract.conId, req.symbol.upper(), req.barSize, rows))
+
+    # the archive keeps every series apart (whatToShow / RTH in the path)
+    if source != "cache" and whatToShow in ("TRADES", "MIDPOINT"):
+        spawn(asyncio.to_thread(archive_rows, req.symbol, req.barSize, rows, None, whatToShow, req.useRTH))
+
+    return rows, source, daily
+
+
+def history_body(req: HistoryReq, rows, source: str, daily: bool):
+    if req.format == "columnar":
+        bars = bar_columns(rows)
+    else:
+        bars = [
             {
-                "time": b.date.isoformat() if isinstance(b.date, datetime) else str(b.date),
-                "open": b.open,
-                "high": b.high,
-                "low": b.low,
-                "close": b.close,
-                "volume": b.volume
+                "time": bar_time(ts, daily),
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v
             }
-            for b in bars
+            for ts, o, h, l, c, v in rows
         ]
+
+    return {
+        "symbol": req.symbol,
+        "barCount": len(rows),
+        "source": source,
+        "bars": bars,
     }
 
 
+async def load_history(req: HistoryReq):
+    rows, source, daily = await fetch_history(req)
+
+    return history_body(req, rows, source, daily)
+
+
+@router.post("/api/history")
+async def history(req: HistoryReq):
+    await ensure_connected()
+
+    rows, source, daily = await fetch_history(req)
+
+    if req.format == "binary":
+        return bar_binary_response(rows, {"X-Symbol": req.symbol, "X-Source": source})
+
+    return FastJSONResponse(history_body(req, rows, source, daily))
+
+
+@router.get("/api/bars")
+async def bars(
+    symbol: str,
+    barSize: str = "1 min",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    format: str = Query("rows", pattern="^(rows|columnar|binary)$"),
+):
+    """Stored bars with start <= time < end (epoch seconds), no IBKR call."""
+    rows = await load_bars(barSize, start, end, symbol=symbol)
+
+    if format == "binary":
+        return bar_binary_response(rows, {"X-Symbol": symbol.upper()})
+
+    if format == "columnar":
+        body = bar_columns(rows)
+    else:
+        body = [
+            {"time": ts, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for ts, o, h, l, c, v in rows
+        ]
+
+    return FastJSONResponse({
+        "symbol": symbol.upper(),
+        "barSize": barSize,
+        "barCount": len(rows),
+        "bars": body,
+    })
+
+
+@router.get("/api/history/cache")
+async def history_cache_stats():
+    return get_bar_cache().hit_rate()
+
+
+@router.get("/api/ibkr/pacing")
+async def pacing_stats():
+    return pacer.stats()
+
+
 # ---------------- SNAPSHOT ----------------
 @router.post("/api/quote/snapshot")
 async def snapshot(req: HistoryReq):
     await ensure_connected()
 
-    c = Stock(req.symbol, "SMART", "USD")
-    await ib.qualifyContractsAsync(c)
+    # served from the streaming ticker; only the first call waits for a tick
+    out = await market_data.snapshot(req.symbol)
 
-    t = ib.reqMktData(c, "", False, False)
-    await asyncio.sleep(0.5)
+    return {**out, "symbol": req.symbol}
 
-    out = {
-        "symbol": req.symbol,
-        "last": float(t.last or 0),
-        "bid": float(t.bid or 0),
-        "ask": float(t.ask or 0),
-        "volume": int(t.volume or 0),
-        "time": util.time.time()
-    }
 
-    ib.cancelMktData(c)
-    return out
\ No newline at end of file
+# ---------------- BATCH ----------------
+def stream_batch(symbols, load):
+    """
+    Run load(symbol) for every symbol, at most BATCH_MAX_INFLIGHT at a time,
+    and stream one NDJSON line per symbol in completion order.
+    """
+    async def one(symbol):
+        async with batch_slots:
+            try:
+                return await load(symbol)
+            except HTTPException as e:
+                return {"symbol": symbol, "error": e.detail}
+            except Exception as e:
+                return {"symbol": symbol, "error": str(e)}
+
+    async def lines():
+        tasks = [asyncio.create_task(one(s)) for s in dict.fromkeys(symbols)]
+
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield dumps(await done) + b"\n"
+        finally:
+            # client went away: stop queued symbols from hitting IBKR
+            for t in tasks:
+                t.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/api/history/batch")
+async def history_batch(req: BatchHistoryReq):
+    await ensure_connected()
+
+    fields = req.model_dump(exclude={"symbols"})
+
+    return stream_batch(
+        [s.upper() for s in req.symbols],
+        lambda symbol: load_history(HistoryReq(symbol=symbol, **fields)),
+    )
+
+
+@router.post("/api/quote/snapshot/batch")
+async def snapshot_batch(req: BatchSnapshotReq):
+    await ensure_connected()
+
+    return stream_batch([s.upper() for s in req.symbols], market_data.snapshot)
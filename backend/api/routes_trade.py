@@ -1,9 +1,17 @@
-from fastapi import APIRouter, HTTPException
-import asyncio
-
-from core.ibkr import ensure_connected, ib
+from fastapi import APIRouter, HTTPException, Query, Request
+import json
+from typing import Optional
+
+from core.ibkr import ensure_connected
+from core.contracts import contract_resolver
+from core.pacing import pacer
+from core.serialize import etag_response
+from db.models import AuditLog
+from db.writer import db_writer
 from schemas.trade import OrderReq, CancelReq
 from services.ibkr_service import build_contract, build_order
+from services.order_manager import OrderNotFound, order_manager, trade_state
+from services.portfolio import portfolio
 
 router = APIRouter()
 
@@ -12,64 +20,76 @@ router = APIRouter()
 async def place_order(req: OrderReq):
     await ensure_connected()
 
-    c = build_contract(req.contract)
-    await asyncio.get_event_loop().run_in_executor(None, ib.qualifyContracts, c)
+    c = await contract_resolver.resolve(build_contract(req.contract))
 
     order = build_order(req)
-    trade = ib.placeOrder(c, order)
 
-    await asyncio.sleep(0.1)
+    await pacer.acquire("orders")
+    trade = order_manager.place(c, order)
+
+    db_writer.write(AuditLog, {
+        "event_type": "order_place",
+        "message": json.dumps({**req.model_dump(), "orderId": trade.order.orderId}),
+    })
+
+    # status pushed by orderStatusEvent instead of sleeping and hoping
+    trade, reached = await order_manager.wait(
+        trade.order.orderId, [req.waitFor] if req.waitFor else None, req.timeout
+    )
 
-    return {
-        "orderId": trade.order.orderId,
-        "status": trade.orderStatus.status,
-        "filled": trade.orderStatus.filled,
-        "remaining": trade.orderStatus.remaining,
-        "avgFillPrice": trade.orderStatus.avgFillPrice,
-    }
+    return {**trade_state(trade), "reached": reached}
 
 
 @router.post("/api/order/cancel")
 async def cancel_order(req: CancelReq):
     await ensure_connected()
 
-    target = next((o for o in ib.orders() if o.orderId == req.orderId), None)
+    await pacer.acquire("orders")
 
-    if not target:
+    try:
+        order_manager.cancel(req.orderId)
+    except OrderNotFound:
         raise HTTPException(404, "Order not found")
 
-    ib.cancelOrder(target)
+    db_writer.write(AuditLog, {"event_type": "order_cancel", "message": json.dumps({"orderId": req.orderId})})
     return {"ok": True}
 
 
 @router.get("/api/orders/open")
-async def open_orders():
+async def open_orders(request: Request):
+    await ensure_connected()
+
+    return etag_response(request, *portfolio.view("orders"))
+
+
+@router.get("/api/orders/stats")
+async def order_stats():
+    return order_manager.stats()
+
+
+@router.get("/api/orders/{orderId}")
+async def order_status(
+    orderId: int,
+    waitFor: Optional[str] = None,
+    timeout: float = Query(10.0, ge=0, le=300),
+):
+    """Current state, or the state once it reaches waitFor (e.g. Filled)."""
     await ensure_connected()
 
-    return [
-        {
-            "orderId": t.order.orderId,
-            "symbol": t.contract.symbol,
-            "status": t.orderStatus.status,
-            "filled": t.orderStatus.filled,
-            "remaining": t.orderStatus.remaining,
-            "avgFillPrice": t.orderStatus.avgFillPrice,
-        }
-        for t in ib.openTrades()
-    ]
+    try:
+        if not waitFor:
+            return trade_state(order_manager.get(orderId))
+
+        trade, reached = await order_manager.wait(orderId, [waitFor], timeout)
+    except OrderNotFound:
+        raise HTTPException(404, "Order not found")
+
+    return {**trade_state(trade), "reached": reached}
 
 
 @router.get("/api/positions")
-async def positions():
+async def positions(request: Request):
     await ensure_connected()
 
-    return [
-        {
-            "account": p.account,
-            "symbol": p.contract.symbol,
-            "conId": p.contract.conId,
-            "position": p.position,
-            "avgCost": p.avgCost,
-        }
-        for p in ib.positions()
-    ]
\ No newline at end of file
+    # kept current from positionEvent / pnlSingleEvent, 304 while unchanged
+    return etag_response(request, *portfolio.view("positions"))
@@ -0,0 +1,297 @@
+# backend/backtest/archive.py
+#
+# Columnar bar archive: one uncompressed Arrow IPC file per
+#   <BAR_ARCHIVE_DIR>/<SYMBOL>/<bar size>/<series>/<YYYY-MM-DD>.arrow   (intraday)
+#   <BAR_ARCHIVE_DIR>/<SYMBOL>/<bar size>/<series>/<YYYY>.arrow         (daily and up)
+# where series is whatToShow plus "_RTH" for regular-hours-only bars
+# ("TRADES", "MIDPOINT_RTH"), so different series never overwrite each other.
+# Files are memory-mapped on read, so a day's columns are NumPy views of
+# the page cache. Parquet is the exchange format for export / import.
+#
+#   cd backend && python -m backtest.archive info
+#   cd backend && python -m backtest.archive export AAPL "1 min" aapl_1m.parquet
+#   cd backend && python -m backtest.archive export AAPL "1 day" aapl_1d.parquet --rth
+#   cd backend && python -m backtest.archive import aapl_1m.parquet AAPL "1 min"
+
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # archive is optional
+    pa = pq = None
+
+from core.candle_buffer import COLUMNS
+from core.config import BAR_ARCHIVE_DIR
+
+# read-merge-write of a partition must not interleave (to_thread callers)
+_write_lock = threading.Lock()
+
+SCHEMA = None if pa is None else pa.schema(
+    [("time", pa.int64())] + [(name, pa.float64()) for name in COLUMNS[1:]]
+)
+
+
+def _require():
+    if pa is None:
+        raise RuntimeError("pyarrow is not installed; the bar archive is unavailable")
+
+
+def series(symbol, what_to_show=None, use_rth=False):
+    """Series directory name; whatToShow defaults to MIDPOINT for forex ("EUR.USD"), else TRADES."""
+    what_to_show = what_to_show or ("MIDPOINT" if "." in symbol else "TRADES")
+    return what_to_show.upper() + ("_RTH" if use_rth else "")
+
+
+def _dir(symbol, bar_size, root=None, what_to_show=None, use_rth=False):
+    return os.path.join(
+        root or BAR_ARCHIVE_DIR, symbol.upper(), bar_size.replace(" ", ""), series(symbol, what_to_show, use_rth)
+    )
+
+
+def _intraday(bar_size):
+    return bar_size.split()[1].startswith(("sec", "min", "hour"))
+
+
+def _partition_bounds(name):
+    if len(name) == 4:
+        start = datetime(int(name), 1, 1, tzinfo=timezone.utc)
+        return start.timestamp(), datetime(int(name) + 1, 1, 1, tzinfo=timezone.utc).timestamp()
+
+    start = datetime.strptime(name, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+    return start, start + 86400
+
+
+# --------------------------------------------------
+# Read
+# --------------------------------------------------
+def _map(path):
+    """Columns of one partition file as zero-copy views of the mapped file."""
+    # the mapping stays alive as long as any returned array references it
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+    return {
+        name: table.column(name).chunk(0).to_numpy(zero_copy_only=True) if table.num_rows else np.empty(0)
+        for name in COLUMNS
+    }
+
+
+def partitions(symbol, bar_size, root=None, what_to_show=None, use_rth=False):
+    path = _dir(symbol, bar_size, root, what_to_show, use_rth)
+
+    if not os.path.isdir(path):
+        return []
+
+    return sorted(f[:-6] for f in os.listdir(path) if f.endswith(".arrow"))
+
+
+def read_bars(symbol, bar_size, start=None, end=None, root=None, what_to_show=None, use_rth=False):
+    """
+    OHLCV columns with start <= time < end, oldest first.
+
+    A range inside one partition is returned as read-only views of the
+    memory-mapped file; a range spanning partitions is one concatenation.
+    """
+    _require()
+
+    parts = []
+
+    path = _dir(symbol, bar_size, root, what_to_show, use_rth)
+
+    for name in partitions(symbol, bar_size, root, what_to_show, use_rth):
+        lo, hi = _partition_bounds(name)
+
+        if (end is not None and lo >= end) or (start is not None and hi <= start):
+            continue
+
+        cols = _map(os.path.join(path, name + ".arrow"))
+        t = cols["time"]
+        i = 0 if start is None else np.searchsorted(t, start)
+        j = len(t) if end is None else np.searchsorted(t, end)
+
+        if j > i:
+            parts.append({k: v[i:j] for k, v in cols.items()})
+
+    if not parts:
+        return {name: np.empty(0, np.int64 if name == "time" else np.float64) for name in COLUMNS}
+
+    if len(parts) == 1:
+        return parts[0]
+
+    return {name: np.concatenate([p[name] for p in parts]) for name in COLUMNS}
+
+
+# --------------------------------------------------
+# Write
+# --------------------------------------------------
+def _write(path, cols):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_arrays([pa.array(cols[name]) for name in COLUMNS], schema=SCHEMA)
+    tmp = path + ".tmp"
+
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+        writer.write_table(table)
+
+    # readers holding the old mapping keep their (unlinked) copy
+    os.replace(tmp, path)
+
+
+def write_bars(symbol, bar_size, bars, root=None, what_to_show=None, use_rth=False):
+    """
+    Merge OHLCV columns into the archive; bars already stored for the
+    same time are replaced. Returns the number of partitions written.
+    """
+    _require()
+
+    time_col = np.asarray(bars["time"], dtype=np.int64)
+
+    if not len(time_col):
+        return 0
+
+    # UTC day (intraday) or year partition of every bar, "2024-03-01" / "2024"
+    unit = "D" if _intraday(bar_size) else "Y"
+    keys = time_col.astype("datetime64[s]").astype(f"datetime64[{unit}]")
+    directory = _dir(symbol, bar_size, root, what_to_show, use_rth)
+    written = 0
+
+    with _write_lock:
+        for key in np.unique(keys):
+            mask = keys == key
+            new = {k: np.asarray(bars[k], dtype=np.float64)[mask] for k in COLUMNS[1:]}
+            new["time"] = time_col[mask]
+
+            path = os.path.join(directory, str(key) + ".arrow")
+
+            if os.path.exists(path):
+                old = {k: np.array(v) for k, v in _map(path).items()}
+                keep = ~np.isin(old["time"], new["time"])
+                new = {k: np.concatenate([old[k][keep], new[k]]) for k in COLUMNS}
+
+            order = np.argsort(new["time"], kind="stable")
+            _write(path, {k: new[k][order] for k in COLUMNS})
+            written += 1
+
+    return written
+
+
+def rows_to_columns(rows):
+    """(time, open, high, low, close, volume) tuples -> columns."""
+    data = np.asarray(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+
+    return {name: data[:, i].astype(np.int64) if name == "time" else data[:, i] for i, name in enumerate(COLUMNS)}
+
+
+def archive_rows(symbol, bar_size, rows, root=None, what_to_show=None, use_rth=False):
+    """write_bars for fetch results; no-op without pyarrow, errors only logged."""
+    if pa is None or not rows:
+        return 0
+
+    try:
+        return write_bars(symbol, bar_size, rows_to_columns(rows), root, what_to_show, use_rth)
+    except Exception as e:
+        print(f"[archive.py] archiving {len(rows)} {symbol} {bar_size} bars failed: {e}")
+        return 0
+
+
+# --------------------------------------------------
+# Export / import
+# --------------------------------------------------
+def export_parquet(symbol, bar_size, out, start=None, end=None, root=None, what_to_show=None, use_rth=False):
+    bars = read_bars(symbol, bar_size, start, end, root, what_to_show, use_rth)
+    table = pa.Table.from_arrays([pa.array(bars[name]) for name in COLUMNS], schema=SCHEMA)
+    table = table.replace_schema_metadata({
+        "symbol": symbol.upper(),
+        "bar_size": bar_size,
+        "series": series(symbol, what_to_show, use_rth),
+    })
+    pq.write_table(table, out, compression="zstd")
+
+    return table.num_rows
+
+
+def import_file(path, symbol=None, bar_size=None, root=None, what_to_show=None, use_rth=None):
+    """Parquet (as written by export) or CSV with time/open/high/low/close/volume."""
+    _require()
+    meta = {}
+
+    if path.endswith(".parquet"):
+        table = pq.read_table(path)
+        meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+        symbol = symbol or meta.get("symbol")
+        bar_size = bar_size or meta.get("bar_size")
+        bars = {name: table.column(name).to_numpy() for name in COLUMNS}
+    else:
+        from backtest.data import load_bars
+        bars = load_bars(path)
+
+    if not symbol or not bar_size:
+        raise ValueError("symbol and bar size are required for this file")
+
+    # series from the export metadata unless given
+    stored = meta.get("series", "")
+    what_to_show = what_to_show or stored.split("_")[0] or None
+    use_rth = stored.endswith("_RTH") if use_rth is None else use_rth
+
+    write_bars(symbol, bar_size, bars, root, what_to_show, use_rth)
+
+    return symbol.upper(), bar_size, len(bars["time"])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Arrow bar archive")
+    p.add_argument("--root", default=None, help=f"archive directory (default {BAR_ARCHIVE_DIR})")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("info")
+
+    e = sub.add_parser("export")
+    e.add_argument("symbol")
+    e.add_argument("bar_size", help='e.g. "1 min"')
+    e.add_argument("out", help=".parquet file")
+    e.add_argument("--start", type=int, default=None, help="epoch seconds")
+    e.add_argument("--end", type=int, default=None, help="epoch seconds")
+
+    i = sub.add_parser("import")
+    i.add_argument("path", help=".parquet or .csv")
+    i.add_argument("symbol", nargs="?")
+    i.add_argument("bar_size", nargs="?")
+
+    for cmd in (e, i):
+        cmd.add_argument("--what-to-show", default=None, help="default TRADES (MIDPOINT for forex)")
+        cmd.add_argument("--rth", action="store_true", default=None, help="regular trading hours series")
+
+    args = p.parse_args(argv)
+    _require()
+
+    if args.cmd == "info":
+        root = args.root or BAR_ARCHIVE_DIR
+
+        for symbol in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+            for size in sorted(os.listdir(os.path.join(root, symbol))):
+                for name in sorted(os.listdir(os.path.join(root, symbol, size))):
+                    parts = partitions(symbol, size, root, name.split("_")[0], name.endswith("_RTH"))
+
+                    if parts:
+                        print(f"{symbol:<10} {size:<8} {name:<14} {len(parts):>5} files  {parts[0]} .. {parts[-1]}")
+
+    elif args.cmd == "export":
+        n = export_parquet(
+            args.symbol, args.bar_size, args.out, args.start, args.end, args.root, args.what_to_show, bool(args.rth)
+        )
+        print(f"[archive.py] exported {n} bars to {args.out}")
+
+    else:
+        symbol, bar_size, n = import_file(
+            args.path, args.symbol, args.bar_size, args.root, args.what_to_show, args.rth
+        )
+        print(f"[archive.py] imported {n} {symbol} {bar_size} bars")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# backend/backtest/cli.py
+#
+#   cd backend && python -m backtest.cli data/bars/AAPL.csv MSFT --out results/
+#
+# Arguments are bar files (.csv / .npz) or symbols looked up in BACKTEST_DATA_DIR.
+
+import argparse
+import csv
+import os
+import time
+
+from backtest.data import load_bars, load_db_bars, load_archive_bars, find_bars
+from backtest.engine import CostModel, run_backtest
+from backtest.optimize import parse_space
+from strategy_params import StrategyParams
+
+
+def resolve(arg, data_dir):
+    if os.path.exists(arg):
+        return os.path.splitext(os.path.basename(arg))[0].upper(), arg
+
+    return arg.upper(), find_bars(arg, data_dir)
+
+
+def write_bars_csv(path, result, bars):
+    columns = ["time", "open", "high", "low", "close", "volume"]
+    extra = list(result.signals)
+
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(columns + extra + ["position", "equity"])
+
+        for i in range(len(result.time)):
+            w.writerow(
+                [bars[c][i] for c in columns]
+                + [result.signals[c][i] for c in extra]
+                + [result.position[i], result.equity[i]]
+            )
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Fractal / anchored VWAP / MACD / Fibonacci backtest")
+    p.add_argument("inputs", nargs="+", help="bar files or symbols")
+    p.add_argument("--data-dir", default=None)
+    p.add_argument("--db-bar-size", default=None, help='read symbols from the bars table instead, e.g. "1 min"')
+    p.add_argument("--archive-bar-size", default=None, help='read symbols from the Arrow archive instead, e.g. "1 min"')
+    p.add_argument("--what-to-show", default=None, help="archive series, default TRADES (MIDPOINT for forex)")
+    p.add_argument("--rth", action="store_true", help="archive series with regular trading hours only")
+    p.add_argument("--capital", type=float, default=100_000.0)
+    p.add_argument("--commission", type=float, default=0.005, help="per share")
+    p.add_argument("--min-commission", type=float, default=1.0)
+    p.add_argument("--slippage-bps", type=float, default=1.0)
+    p.add_argument("--long-only", action="store_true")
+    p.add_argument("--param", nargs="*", default=[], help="strategy parameter=value, e.g. macd_fast=8")
+    p.add_argument("--out", default=None, help="directory for per-bar CSVs")
+    args = p.parse_args(argv)
+
+    costs = CostModel(args.commission, args.min_commission, args.slippage_bps)
+    params = StrategyParams(**{k: v[0] for k, v in parse_space(args.param).items()}).validate()
+
+    print(f"{'symbol':<10} {'bars':>8} {'return':>9} {'sharpe':>8} {'max dd':>8} {'trades':>7} {'hit':>6} {'ms':>8}")
+
+    for arg in args.inputs:
+        if args.db_bar_size:
+            symbol, bars = arg.upper(), load_db_bars(arg, args.db_bar_size)
+        elif args.archive_bar_size:
+            symbol, bars = arg.upper(), load_archive_bars(arg, args.archive_bar_size, what_to_show=args.what_to_show, use_rth=args.rth)
+        else:
+            symbol, path = resolve(arg, args.data_dir)
+            bars = load_bars(path)
+
+        started = time.perf_counter()
+        result = run_backtest(bars, symbol, args.capital, costs, not args.long_only, params=params)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        s = result.stats
+        hit = f"{s['hit_rate']:.2f}" if s["hit_rate"] is not None else "-"
+
+        print(
+            f"{symbol:<10} {s['bars']:>8} {s['total_return']:>8.2%} {s['sharpe']:>8.2f} "
+            f"{s['max_drawdown']:>7.2%} {s['trades']:>7} {hit:>6} {elapsed:>8.1f}"
+        )
+
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            write_bars_csv(os.path.join(args.out, f"{symbol}_backtest.csv"), result, bars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# backend/backtest/data.py
+
+import csv
+import os
+from datetime import datetime
+
+import numpy as np
+
+from core.candle_buffer import COLUMNS
+from core.config import BACKTEST_DATA_DIR
+
+
+def _parse_time(value):
+    try:
+        return int(float(value))
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp())
+
+
+def load_csv(path):
+    rows = {name: [] for name in COLUMNS}
+
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            rows["time"].append(_parse_time(row["time"]))
+
+            for name in COLUMNS[1:]:
+                rows[name].append(float(row[name]))
+
+    return {
+        name: np.asarray(values, dtype=np.int64 if name == "time" else np.float64)
+        for name, values in rows.items()
+    }
+
+
+def load_npz(path):
+    with np.load(path) as f:
+        return {name: f[name] for name in COLUMNS}
+
+
+def load_bars(path):
+    """
+    OHLCV columns (time in epoch seconds) from a local .csv or .npz file,
+    sorted by time.
+    """
+    if path.endswith(".npz"):
+        bars = load_npz(path)
+    else:
+        bars = load_csv(path)
+
+    order = np.argsort(bars["time"], kind="stable")
+
+    if not np.all(order == np.arange(len(order))):
+        bars = {name: col[order] for name, col in bars.items()}
+
+    return bars
+
+
+def save_npz(path, bars):
+    np.savez(path, **{name: bars[name] for name in COLUMNS})
+
+
+def load_db_bars(symbol, bar_size, start=None, end=None):
+    """
+    Bars for symbol from the database bars table (filled by /api/history).
+    """
+    import asyncio
+    from db.bars import load_bars as read, to_columns
+
+    rows = asyncio.run(read(bar_size, start, end, symbol=symbol))
+
+    if not rows:
+        raise FileNotFoundError(f"no {bar_size} bars for {symbol} in the database")
+
+    return to_columns(rows)
+
+
+def load_archive_bars(symbol, bar_size, start=None, end=None, what_to_show=None, use_rth=False):
+    """
+    Bars for symbol from the Arrow archive (see backtest/archive.py).
+    """
+    from backtest.archive import read_bars
+
+    bars = read_bars(symbol, bar_size, start, end, what_to_show=what_to_show, use_rth=use_rth)
+
+    if not len(bars["time"]):
+        raise FileNotFoundError(f"no {bar_size} bars for {symbol} in the archive")
+
+    return bars
+
+
+def find_bars(symbol, data_dir=None):
+    data_dir = data_dir or BACKTEST_DATA_DIR
+
+    for ext in (".npz", ".csv"):
+        path = os.path.join(data_dir, symbol.upper() + ext)
+
+        if os.path.exists(path):
+            return path
+
+    raise FileNotFoundError(f"no bar file for {symbol} in {data_dir}")
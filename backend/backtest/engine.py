@@ -0,0 +1,227 @@
+# backend/backtest/engine.py
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from indicators.fractals import detect_fractals_np, HIGH, LOW
+from indicators.vwap import anchored_vwap_series_np
+from indicators.macd import macd_series_np
+from indicators.fibonacci import fib_levels
+from strategy_params import DEFAULT_PARAMS
+
+# same warm-up as StrategyEngine.compute
+MIN_BARS = 30
+
+# equity calendar used when bars_per_year is not given
+TRADING_DAYS_PER_YEAR = 252
+DAY = 86400
+
+
+@dataclass
+class CostModel:
+    """
+    IBKR fixed-rate style commission plus proportional slippage.
+    """
+    commission_per_share: float = 0.005
+    min_commission: float = 1.0
+    slippage_bps: float = 1.0
+
+    def commission(self, shares):
+        return np.where(shares > 0, np.maximum(self.min_commission, shares * self.commission_per_share), 0.0)
+
+
+@dataclass
+class BacktestResult:
+    symbol: str
+    time: np.ndarray
+    signals: dict
+    position: np.ndarray
+    equity: np.ndarray
+    trade_pnl: np.ndarray
+    stats: dict = field(default_factory=dict)
+
+    def summary(self):
+        return {"symbol": self.symbol, **self.stats}
+
+
+# --------------------------------------------------
+# Signals
+# --------------------------------------------------
+def _confirmed_last(index, n, k):
+    # newest fractal bar already confirmed at each bar (confirmation is k bars later)
+    last = np.full(n, -1, dtype=np.int64)
+    confirm = index + k
+    ok = confirm < n
+
+    last[confirm[ok]] = index[ok]
+
+    return np.maximum.accumulate(last)
+
+
+def compute_signals(bars, params=DEFAULT_PARAMS, allow_short=True):
+    """
+    Per-bar replay of StrategyEngine.compute: fractal-anchored VWAP,
+    MACD trend and Fibonacci levels from the last confirmed high / low,
+    using only data available at each bar's close.
+
+    target is +1 (long) when MACD is bullish, close is above the
+    anchored VWAP and holds the deepest retracement (0.618); -1 (short)
+    for the mirror case below the shallowest level (0.382); 0 otherwise.
+    """
+    high = bars["high"]
+    low = bars["low"]
+    close = bars["close"]
+    n = len(close)
+    width = params.fractal_width
+    k = width // 2
+
+    fr = detect_fractals_np(high, low, width)
+
+    anchor = _confirmed_last(fr.index, n, k)
+    last_high_idx = _confirmed_last(fr.index[fr.kind == HIGH], n, k)
+    last_low_idx = _confirmed_last(fr.index[fr.kind == LOW], n, k)
+
+    vwap = anchored_vwap_series_np(close, bars["volume"], anchor)
+    macd_line, signal = macd_series_np(close, params.macd_fast, params.macd_slow, params.macd_signal)
+
+    last_high = np.where(last_high_idx >= 0, high[last_high_idx], np.nan)
+    last_low = np.where(last_low_idx >= 0, low[last_low_idx], np.nan)
+    fibs = fib_levels(last_high, last_low, params.fib_ratios)
+
+    valid = (np.arange(n) >= MIN_BARS - 1) & ~np.isnan(last_high) & ~np.isnan(last_low) & ~np.isnan(vwap)
+    bullish = macd_line > signal
+
+    with np.errstate(invalid="ignore"):
+        long = valid & bullish & (close > vwap) & (close >= fibs[params.long_ratio])
+        short = valid & ~bullish & (close < vwap) & (close <= fibs[params.short_ratio])
+
+    target = long.astype(np.int8)
+
+    if allow_short:
+        target -= short.astype(np.int8)
+
+    return {
+        "anchor_vwap": vwap,
+        "macd": macd_line,
+        "signal": signal,
+        **{f"fib_{ratio}": level for ratio, level in fibs.items()},
+        "target": target,
+    }
+
+
+# --------------------------------------------------
+# Fills / equity
+# --------------------------------------------------
+def simulate(bars, target, capital=100_000.0, costs=None):
+    """
+    The target decided at a bar's close is filled at the next bar's
+    open; every position is sized to `capital` at its entry price.
+
+    Returns (position in shares per bar, equity curve, pnl per trade).
+    """
+    costs = costs or CostModel()
+    open_ = bars["open"]
+    close = bars["close"]
+    n = len(close)
+
+    if n == 0:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+
+    side = np.zeros(n, dtype=np.int8)
+    side[1:] = target[:-1]
+
+    change = np.empty(n, dtype=bool)
+    change[0] = side[0] != 0
+    change[1:] = side[1:] != side[:-1]
+
+    seg = np.cumsum(change)
+    starts = np.flatnonzero(change)
+
+    seg_shares = np.zeros(len(starts) + 1)
+    seg_shares[1:] = np.floor(capital / open_[starts])
+    held = side * seg_shares[seg]
+
+    prev_held = np.concatenate([[0.0], held[:-1]])
+    prev_close = np.concatenate([[open_[0]], close[:-1]])
+    prev_seg = np.concatenate([[0], seg[:-1]])
+
+    gap_pnl = prev_held * (open_ - prev_close)
+    bar_pnl = held * (close - open_)
+
+    slip = costs.slippage_bps / 1e4
+    exit_shares = np.where(change, np.abs(prev_held), 0.0)
+    entry_shares = np.where(change, np.abs(held), 0.0)
+    exit_cost = costs.commission(exit_shares) + exit_shares * open_ * slip
+    entry_cost = costs.commission(entry_shares) + entry_shares * open_ * slip
+
+    equity = capital + np.cumsum(gap_pnl + bar_pnl - exit_cost - entry_cost)
+
+    n_seg = len(starts) + 1
+    per_seg = (
+        np.bincount(prev_seg, gap_pnl - exit_cost, n_seg)
+        + np.bincount(seg, bar_pnl - entry_cost, n_seg)
+    )
+    trade_pnl = per_seg[1:][side[starts] != 0]
+
+    return held, equity, trade_pnl
+
+
+def infer_bars_per_year(time):
+    """
+    Annualization factor from the bar timestamps: 252 for daily bars, 52
+    weekly, 12 monthly; intraday, 252 times the median number of bars per
+    trading day, so RTH-only and extended-hours sessions both come out right.
+    """
+    if len(time) < 2:
+        return TRADING_DAYS_PER_YEAR
+
+    step = np.median(np.diff(time))
+
+    if step >= 20 * DAY:
+        return 12
+    if step >= 5 * DAY:
+        return 52
+    if step >= DAY - 3600:
+        return TRADING_DAYS_PER_YEAR
+
+    _, per_day = np.unique(np.asarray(time) // DAY, return_counts=True)
+
+    return TRADING_DAYS_PER_YEAR * float(np.median(per_day))
+
+
+def summarize(time, equity, trade_pnl, capital, bars_per_year=None):
+    if bars_per_year is None:
+        bars_per_year = infer_bars_per_year(time)
+
+    # positions are sized to capital, so returns are measured against it
+    returns = np.diff(equity) / capital
+    std = returns.std() if len(returns) else 0.0
+
+    peak = np.maximum.accumulate(equity) if len(equity) else equity
+    drawdown = 1 - equity / peak if len(equity) else np.zeros(0)
+
+    return {
+        "bars": int(len(equity)),
+        "final_equity": float(equity[-1]) if len(equity) else capital,
+        "total_return": float(equity[-1] / capital - 1) if len(equity) else 0.0,
+        "sharpe": float(returns.mean() / std * np.sqrt(bars_per_year)) if std > 0 else 0.0,
+        "max_drawdown": float(drawdown.max()) if len(drawdown) else 0.0,
+        "trades": int(len(trade_pnl)),
+        "hit_rate": float((trade_pnl > 0).mean()) if len(trade_pnl) else None,
+    }
+
+
+def run_backtest(bars, symbol="", capital=100_000.0, costs=None, allow_short=True, bars_per_year=None, params=DEFAULT_PARAMS):
+    signals = compute_signals(bars, params, allow_short)
+    held, equity, trade_pnl = simulate(bars, signals["target"], capital, costs)
+
+    return BacktestResult(
+        symbol=symbol,
+        time=bars["time"],
+        signals=signals,
+        position=held,
+        equity=equity,
+        trade_pnl=trade_pnl,
+        stats=summarize(bars["time"], equity, trade_pnl, capital, bars_per_year),
+    )
@@ -0,0 +1,250 @@
+# backend/backtest/optimize.py
+#
+#   cd backend && python -m backtest.optimize AAPL MSFT \
+#       --grid macd_fast=8,12,16 macd_slow=21,26,34 fractal_width=5,7 \
+#       --out results/sweep.csv
+#
+#   ... --random 500 --grid macd_fast=5:20 macd_slow=20:40 macd_signal=5:12
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.candle_buffer import COLUMNS
+from backtest.data import load_bars, find_bars
+from backtest.engine import CostModel, run_backtest
+from strategy_params import StrategyParams
+
+
+# --------------------------------------------------
+# Shared bar data
+# --------------------------------------------------
+class SharedBars:
+    """
+    One shared-memory block per symbol holding its OHLCV columns
+    back to back as float64; workers attach once and get zero-copy
+    NumPy views, so tasks only carry parameters.
+    """
+
+    def __init__(self, bars_by_symbol):
+        self.blocks = []
+        self.specs = []
+
+        for symbol, bars in bars_by_symbol.items():
+            n = len(bars["time"])
+            shm = shared_memory.SharedMemory(create=True, size=max(1, n * len(COLUMNS) * 8))
+            view = np.ndarray((len(COLUMNS), n), dtype=np.float64, buffer=shm.buf)
+
+            for i, name in enumerate(COLUMNS):
+                view[i] = bars[name]
+
+            self.blocks.append(shm)
+            self.specs.append((symbol, shm.name, n))
+
+    def close(self):
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+
+
+_worker_bars = {}
+_worker_blocks = []
+
+
+def _attach(specs):
+    for symbol, name, n in specs:
+        # pool workers share the parent's resource tracker; the parent unlinks
+        shm = shared_memory.SharedMemory(name=name)
+        view = np.ndarray((len(COLUMNS), n), dtype=np.float64, buffer=shm.buf)
+        bars = {name: view[i] for i, name in enumerate(COLUMNS)}
+        bars["time"] = view[0].astype(np.int64)
+
+        _worker_blocks.append(shm)
+        _worker_bars[symbol] = bars
+
+
+def _evaluate(task):
+    params, capital, costs, allow_short = task
+    results = [
+        run_backtest(bars, symbol, capital, costs, allow_short, params=params).stats
+        for symbol, bars in _worker_bars.items()
+    ]
+
+    # equal-weight aggregate across symbols
+    return params, {
+        "sharpe": float(np.mean([r["sharpe"] for r in results])),
+        "total_return": float(np.mean([r["total_return"] for r in results])),
+        "max_drawdown": float(np.max([r["max_drawdown"] for r in results])),
+        "trades": int(np.sum([r["trades"] for r in results])),
+        "hit_rate": float(np.mean([r["hit_rate"] for r in results if r["hit_rate"] is not None] or [0.0])),
+    }
+
+
+# --------------------------------------------------
+# Search space
+# --------------------------------------------------
+def _parse_value(text):
+    return float(text) if "." in text else int(text)
+
+
+def parse_space(items):
+    """
+    ["macd_fast=8,12,16", "macd_slow=20:40"] -> {"macd_fast": [8, 12, 16], "macd_slow": range(20, 41)}
+
+    fib_ratios takes ';'-separated ratio sets: fib_ratios=0.382/0.5/0.618;0.236/0.5/0.786
+    """
+    space = {}
+
+    for item in items:
+        key, _, values = item.partition("=")
+
+        if key not in StrategyParams.field_names():
+            raise ValueError(f"unknown parameter: {key}")
+
+        if key == "fib_ratios":
+            space[key] = [tuple(float(r) for r in s.split("/")) for s in values.split(";")]
+        elif ":" in values:
+            lo, hi = values.split(":")
+            space[key] = list(range(int(lo), int(hi) + 1))
+        else:
+            space[key] = [_parse_value(v) for v in values.split(",")]
+
+    return space
+
+
+def _valid(params):
+    try:
+        params.validate()
+        return True
+    except ValueError:
+        return False
+
+
+def grid(space):
+    keys = list(space)
+
+    for combo in itertools.product(*(space[k] for k in keys)):
+        params = StrategyParams(**dict(zip(keys, combo)))
+
+        if _valid(params):
+            yield params
+
+
+def random_search(space, n, seed=None):
+    rng = random.Random(seed)
+    seen = set()
+    attempts = 0
+
+    while len(seen) < n and attempts < n * 20:
+        attempts += 1
+        params = StrategyParams(**{k: rng.choice(v) for k, v in space.items()})
+
+        if params not in seen and _valid(params):
+            seen.add(params)
+            yield params
+
+
+# --------------------------------------------------
+# Sweep
+# --------------------------------------------------
+def sweep(bars_by_symbol, candidates, capital=100_000.0, costs=None, allow_short=True, workers=None, metric="sharpe"):
+    """
+    Backtest every candidate over all symbols on a process pool.
+
+    Returns (rows ranked by metric, backtests per second).
+    """
+    costs = costs or CostModel()
+    candidates = list(candidates)
+    shared = SharedBars(bars_by_symbol)
+    workers = workers or os.cpu_count()
+
+    try:
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shared.specs,)) as pool:
+            tasks = [(p, capital, costs, allow_short) for p in candidates]
+            chunk = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_evaluate, tasks, chunksize=chunk))
+
+        elapsed = time.perf_counter() - started
+
+    finally:
+        shared.close()
+
+    rows = [{**params.to_dict(), **stats} for params, stats in results]
+    # drawdown ranks ascending, everything else descending
+    rows.sort(key=lambda r: r[metric], reverse=metric != "max_drawdown")
+
+    throughput = len(candidates) * len(bars_by_symbol) / elapsed if elapsed else 0.0
+
+    return rows, throughput
+
+
+def write_results(path, rows):
+    if not rows:
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=["rank", *rows[0]])
+        w.writeheader()
+
+        for rank, row in enumerate(rows, 1):
+            w.writerow({"rank": rank, **row, "fib_ratios": "/".join(f"{r:g}" for r in row["fib_ratios"])})
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Parallel parameter sweep for the backtest strategy")
+    p.add_argument("inputs", nargs="+", help="bar files or symbols")
+    p.add_argument("--grid", nargs="+", default=["macd_fast=8,12,16", "macd_slow=21,26,34", "macd_signal=7,9,12", "fractal_width=5,7,9"],
+                   help="parameter=values (comma list or lo:hi range)")
+    p.add_argument("--random", type=int, default=0, help="sample N random combinations instead of the full grid")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--metric", default="sharpe", choices=["sharpe", "total_return", "max_drawdown", "hit_rate"])
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--data-dir", default=None)
+    p.add_argument("--capital", type=float, default=100_000.0)
+    p.add_argument("--long-only", action="store_true")
+    p.add_argument("--out", default="optimize_results.csv")
+    p.add_argument("--top", type=int, default=10)
+    args = p.parse_args(argv)
+
+    bars_by_symbol = {}
+
+    for arg in args.inputs:
+        if os.path.exists(arg):
+            symbol, path = os.path.splitext(os.path.basename(arg))[0].upper(), arg
+        else:
+            symbol, path = arg.upper(), find_bars(arg, args.data_dir)
+
+        bars_by_symbol[symbol] = load_bars(path)
+
+    space = parse_space(args.grid)
+    candidates = list(random_search(space, args.random, args.seed) if args.random else grid(space))
+
+    print(f"[optimize.py] {len(candidates)} parameter sets x {len(bars_by_symbol)} symbols")
+
+    rows, throughput = sweep(
+        bars_by_symbol, candidates, args.capital,
+        allow_short=not args.long_only, workers=args.workers, metric=args.metric,
+    )
+
+    write_results(args.out, rows)
+
+    print(f"[optimize.py] {throughput:.1f} backtests/sec -> {args.out}")
+
+    for rank, row in enumerate(rows[:args.top], 1):
+        params = ", ".join(f"{k}={row[k]}" for k in StrategyParams.field_names())
+        print(f"{rank:>3}. {args.metric}={row[args.metric]:.3f} | {params}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_archive.py
+#
+# Arrow archive vs the JSON list-of-dicts /api/history returns, for a
+# year of 1-minute bars: write, memory-mapped range reads, and the
+# indicator kernels running straight on the mapped columns.
+#
+#   cd backend && python -m benchmarks.bench_archive
+
+import json
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from backtest.archive import write_bars, read_bars, export_parquet, import_file
+from indicators.macd import macd_series_np
+
+DAYS = 365
+START = 1_704_067_200  # 2024-01-01 UTC
+
+
+def year_of_bars():
+    n = DAYS * 1440
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 5e-4, n)))
+
+    return {
+        "time": START + 60 * np.arange(n, dtype=np.int64),
+        "open": close, "high": close * 1.001, "low": close * 0.999, "close": close,
+        "volume": rng.integers(100, 10_000, n).astype(np.float64),
+    }
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+
+    return out, best * 1000
+
+
+def main():
+    root = tempfile.mkdtemp()
+    bars = year_of_bars()
+    n = len(bars["time"])
+
+    _, ms = timed(lambda: write_bars("SYM", "1 min", bars, root), repeat=1)
+    print(f"write {n:,} bars into {DAYS} day files: {ms:8.1f} ms")
+
+    for label, start, end in [
+        ("day", START + 86400 * 100, START + 86400 * 101),
+        ("month", START + 86400 * 100, START + 86400 * 130),
+        ("year", None, None),
+    ]:
+        cols, ms = timed(lambda: read_bars("SYM", "1 min", start, end, root))
+        print(f"read {label:<5} ({len(cols['time']):>7,} bars): {ms:8.2f} ms  zero-copy={not cols['close'].flags.owndata}")
+
+    cols, _ = timed(lambda: read_bars("SYM", "1 min", None, None, root), repeat=1)
+    _, ms = timed(lambda: macd_series_np(cols["close"], 12, 26, 9))
+    print(f"MACD over the mapped year             : {ms:8.2f} ms")
+
+    rows = [
+        {"time": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(*(bars[k][: 30 * 1440].tolist() for k in ("time", "open", "high", "low", "close", "volume")))
+    ]
+    text, ms = timed(lambda: json.dumps(rows), repeat=1)
+    _, ms_load = timed(lambda: json.loads(text), repeat=1)
+    print(f"JSON month for comparison             : dump {ms:.1f} ms, load {ms_load:.1f} ms, {len(text) / 1e6:.1f} MB")
+
+    parquet = f"{root}/sym.parquet"
+    _, ms = timed(lambda: export_parquet("SYM", "1 min", parquet, root=root), repeat=1)
+    print(f"export year to parquet                : {ms:8.1f} ms")
+
+    _, ms = timed(lambda: import_file(parquet, "SYM2", root=root), repeat=1)
+    print(f"import parquet as SYM2                : {ms:8.1f} ms, equal={np.array_equal(read_bars('SYM2', '1 min', root=root)['close'], bars['close'])}")
+
+    shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
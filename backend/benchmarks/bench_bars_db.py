@@ -0,0 +1,91 @@
+# backend/benchmarks/bench_bars_db.py
+#
+# bars table on SQLite (aiosqlite): bulk upsert of a month of 1-minute
+# bars for a few symbols, then range reads of one symbol's month / day.
+#
+#   cd backend && python -m benchmarks.bench_bars_db
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.database import Base
+from db.bars import init_timeseries, upsert_bars, read_bars, to_columns
+
+SYMBOLS = 5
+MINUTES = 30 * 24 * 60
+START = 1_700_000_000 // 60 * 60
+
+
+def month_of_bars(seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 5e-4, MINUTES)))
+    ts = START + 60 * np.arange(MINUTES)
+
+    return [
+        (int(t), float(c), float(c * 1.001), float(c * 0.999), float(c), float(v))
+        for t, c, v in zip(ts, close, rng.integers(100, 10_000, MINUTES))
+    ]
+
+
+def best_ms(times):
+    return min(times) * 1000
+
+
+async def main():
+    path = os.path.join(tempfile.mkdtemp(), "bars.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await init_timeseries(conn)
+
+    started = time.perf_counter()
+
+    for i in range(SYMBOLS):
+        async with engine.begin() as conn:
+            await upsert_bars(conn, 1000 + i, f"SYM{i}", "1 min", month_of_bars(i))
+
+    elapsed = time.perf_counter() - started
+    print(f"upsert: {SYMBOLS * MINUTES:,} bars in {elapsed:.2f}s ({SYMBOLS * MINUTES / elapsed:,.0f} bars/s)")
+
+    # second upsert of the same month overwrites in place
+    async with engine.begin() as conn:
+        await upsert_bars(conn, 1000, "SYM0", "1 min", month_of_bars(0)[:1000])
+
+    for label, start, end in [("month", START, START + MINUTES * 60), ("day", START + 86400 * 10, START + 86400 * 11)]:
+        for key in ({"con_id": 1002}, {"symbol": "SYM2"}):
+            times = []
+
+            async with engine.connect() as conn:
+                for _ in range(5):
+                    t = time.perf_counter()
+                    rows = await read_bars(conn, "1 min", start, end, **key)
+                    cols = to_columns(rows)
+                    times.append(time.perf_counter() - t)
+
+            print(f"read {label:<5} by {list(key)[0]:<7}: {len(cols['time']):>6} bars in {best_ms(times):7.2f} ms")
+
+    # floor: the same month through the plain sqlite3 driver
+    raw = sqlite3.connect(path)
+    times = []
+
+    for _ in range(5):
+        t = time.perf_counter()
+        raw.execute(
+            "SELECT ts, open, high, low, close, volume FROM bars WHERE con_id = 1002 AND bar_size = '1 min' ORDER BY ts"
+        ).fetchall()
+        times.append(time.perf_counter() - t)
+
+    print(f"raw sqlite3 month         : {best_ms(times):7.2f} ms")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
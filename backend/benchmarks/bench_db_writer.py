@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_db_writer.py
+#
+# Per-row session inserts vs BatchWriter, on SQLite (aiosqlite) as a
+# local stand-in for Postgres. Also reports what write() costs the
+# caller, i.e. what the strategy loop / a request handler pays.
+#
+#   cd backend && python -m benchmarks.bench_db_writer
+
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from db.database import Base
+from db.models import QuoteSnapshot
+from db.writer import BatchWriter
+
+PER_ROW = 2_000
+BATCHED = 100_000
+
+
+def quote(i):
+    return {"symbol": f"SYM{i % 50}", "bid": 100.0 + i * 1e-4, "ask": 100.01 + i * 1e-4, "last": 100.0, "volume": float(i)}
+
+
+async def main():
+    path = os.path.join(tempfile.mkdtemp(), "bench.sqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # one session + commit per row
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    started = time.perf_counter()
+
+    for i in range(PER_ROW):
+        async with Session() as session:
+            session.add(QuoteSnapshot(**quote(i)))
+            await session.commit()
+
+    per_row = PER_ROW / (time.perf_counter() - started)
+
+    # write-behind
+    writer = BatchWriter(engine, batch_size=1000, interval_ms=50, max_queue=BATCHED)
+    runner = asyncio.create_task(writer.run())
+    started = time.perf_counter()
+    write_cost = 0.0
+
+    for i in range(BATCHED):
+        t = time.perf_counter()
+        writer.write(QuoteSnapshot, quote(i))
+        write_cost += time.perf_counter() - t
+
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+
+    await writer.close()
+    batched = BATCHED / (time.perf_counter() - started)
+    runner.cancel()
+
+    async with engine.connect() as conn:
+        total = (await conn.execute(select(func.count()).select_from(QuoteSnapshot.__table__))).scalar()
+
+    print(f"per-row commit : {per_row:>10,.0f} rows/s ({PER_ROW} rows)")
+    print(f"BatchWriter    : {batched:>10,.0f} rows/s ({BATCHED} rows), write() {write_cost / BATCHED * 1e6:.2f} us/call")
+    print(f"rows in table  : {total} (expected {PER_ROW + BATCHED}); {writer.status()}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+# backend/benchmarks/bench_encoding.py
+#
+# /api/history response encoding, 10k and 100k bars:
+#   before    dict per bar + isoformat + jsonable_encoder + JSONResponse
+#   rows      same dicts, rendered by FastJSONResponse (orjson)
+#   columnar  {"time": [...], "open": [...]} from one numpy matrix
+#   binary    column-major float64 bytes
+#
+#   cd backend && python -m benchmarks.bench_encoding
+
+import time
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.serialize import FastJSONResponse, bar_binary_response, bar_columns
+from services.bar_cache import bar_time
+
+SIZES = [10_000, 100_000]
+
+
+def make_rows(n):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 5e-4, n)))
+    ts = 1_700_000_000 + 60 * np.arange(n)
+
+    return [
+        (int(t), float(c), float(c * 1.001), float(c * 0.999), float(c), float(v))
+        for t, c, v in zip(ts, close, rng.integers(100, 10_000, n))
+    ]
+
+
+def dict_rows(rows):
+    return [
+        {"time": bar_time(ts, False), "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for ts, o, h, l, c, v in rows
+    ]
+
+
+def payload(bars, n):
+    return {"symbol": "AAPL", "barCount": n, "source": "cache", "bars": bars}
+
+
+ENCODERS = {
+    "before": lambda rows: JSONResponse(jsonable_encoder(payload(dict_rows(rows), len(rows)))).body,
+    "rows": lambda rows: FastJSONResponse(payload(dict_rows(rows), len(rows))).body,
+    "columnar": lambda rows: FastJSONResponse(payload(bar_columns(rows), len(rows))).body,
+    "binary": lambda rows: bar_binary_response(rows).body,
+}
+
+
+def main():
+    for n in SIZES:
+        rows = make_rows(n)
+        base = None
+
+        print(f"{n:,} bars")
+
+        for name, encode in ENCODERS.items():
+            best = float("inf")
+
+            for _ in range(3):
+                t = time.perf_counter()
+                body = encode(rows)
+                best = min(best, time.perf_counter() - t)
+
+            base = base or best
+            print(f"  {name:<9} {best * 1000:9.1f} ms  {len(body) / 1e6:6.2f} MB  x{base / best:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
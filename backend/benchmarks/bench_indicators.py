@@ -0,0 +1,86 @@
+# backend/benchmarks/bench_indicators.py
+#
+# List-of-dict indicators vs. the vectorized CandleBuffer versions.
+#
+#   cd backend && python -m benchmarks.bench_indicators
+
+import random
+import time
+
+import numpy as np
+
+from core.candle_buffer import CandleBuffer
+from indicators.fractals import detect_fractals, detect_fractals_np
+from indicators.vwap import anchored_vwap, anchored_vwap_np
+from indicators.macd import macd, macd_np
+
+BARS = 500
+REPEAT = 200
+
+
+def make_candles(n):
+    candles = []
+    price = 100.0
+
+    for i in range(n):
+        price += random.gauss(0, 1)
+        close = price + random.gauss(0, 0.3)
+
+        candles.append({
+            "time": i * 60,
+            "open": price,
+            "high": max(price, close) + random.random(),
+            "low": min(price, close) - random.random(),
+            "close": close,
+            "volume": random.randint(100, 10_000),
+        })
+
+    return candles
+
+
+def timeit(fn):
+    fn()
+    started = time.perf_counter()
+
+    for _ in range(REPEAT):
+        fn()
+
+    return (time.perf_counter() - started) / REPEAT * 1e6
+
+
+def main():
+    random.seed(7)
+
+    candles = make_candles(BARS)
+    buf = CandleBuffer(BARS)
+
+    for c in candles:
+        buf.append(c)
+
+    anchor = candles[BARS // 2]["time"]
+
+    rows = [
+        ("detect_fractals",
+         lambda: detect_fractals(candles),
+         lambda: detect_fractals_np(buf.high, buf.low)),
+        ("anchored_vwap",
+         lambda: anchored_vwap(candles, anchor),
+         lambda: anchored_vwap_np(buf.time, buf.close, buf.volume, anchor)),
+        ("macd",
+         lambda: macd([c["close"] for c in candles]),
+         lambda: macd_np(buf.close)),
+    ]
+
+    print(f"{BARS} bars, CandleBuffer {buf.nbytes / 1024:.1f} KiB")
+    print(f"{'indicator':<16} {'list us':>10} {'numpy us':>10} {'speedup':>8}")
+
+    for name, slow, fast in rows:
+        a = timeit(slow)
+        b = timeit(fast)
+        print(f"{name:<16} {a:>10.1f} {b:>10.1f} {a / b:>7.1f}x")
+
+    assert np.isclose(macd_np(buf.close)[0], macd([c["close"] for c in candles])[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_loop_lag.py
+#
+# Event loop responsiveness while the strategy scheduler is busy.
+# A probe coroutine sleeps 1 ms in a loop; its overshoot is the delay
+# any HTTP handler (e.g. /api/positions) would see before running.
+#
+#   cd backend && python -m benchmarks.bench_loop_lag
+
+import asyncio
+import random
+import time
+
+from strategy_engine import StrategyEngine
+from services.bar_aggregator import BarAggregator
+from services.strategy_runner import StrategyRunner
+
+SYMBOL_COUNTS = [0, 10, 100, 500]
+DURATION = 3.0
+TICKS_PER_SECOND = 5000
+
+
+async def noop_broadcast(result):
+    pass
+
+
+async def probe(samples, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        samples.append((time.perf_counter() - started - 0.001) * 1000)
+
+
+async def feed(aggregator, symbols, stop):
+    prices = {s: 100.0 for s in symbols}
+    ts = 1_700_000_000.0
+    batch = max(1, TICKS_PER_SECOND // 100)
+
+    while not stop.is_set():
+        for _ in range(batch):
+            symbol = random.choice(symbols)
+            prices[symbol] += random.gauss(0, 0.05)
+            ts += 1.0  # fast clock so bars keep closing
+            aggregator.on_tick(symbol, ts, prices[symbol], random.randint(1, 300))
+
+        await asyncio.sleep(0.01)
+
+
+async def measure(n_symbols):
+    engine = StrategyEngine()
+    runner = StrategyRunner(engine, noop_broadcast)
+    aggregator = BarAggregator(engine)
+    symbols = [f"SYM{i}" for i in range(n_symbols)]
+
+    stop = asyncio.Event()
+    samples = []
+    tasks = [asyncio.create_task(probe(samples, stop)), asyncio.create_task(runner.run())]
+
+    if symbols:
+        tasks.append(asyncio.create_task(feed(aggregator, symbols, stop)))
+
+    await asyncio.sleep(DURATION)
+    stop.set()
+
+    for t in tasks:
+        t.cancel()
+
+    runner.shutdown()
+    samples.sort()
+
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+async def main():
+    random.seed(7)
+
+    print(f"{'symbols':>8} {'p50 lag ms':>11} {'p99 lag ms':>11}")
+
+    for n in SYMBOL_COUNTS:
+        p50, p99 = await measure(n)
+        print(f"{n:>8} {p50:>11.2f} {p99:>11.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_metrics.py
+#
+# Hot-path cost of core.metrics: histogram observe / timer / counter inc
+# on one thread and from 4 threads at once (per-thread shards, no lock),
+# and the cost of rendering /metrics.
+#
+#   cd backend && python -m benchmarks.bench_metrics
+
+import threading
+import time
+
+from core.metrics import Counter, Histogram, registry
+
+N = 1_000_000
+THREADS = 4
+
+hist = Histogram("bench_observe_seconds", "benchmark", ("kind",))
+counter = Counter("bench_total", "benchmark", ("kind",))
+
+
+def per_op(fn, n=N):
+    started = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - started) / n * 1e9
+
+
+def observe(n):
+    child = hist.labels("observe")
+    for i in range(n):
+        child.observe(0.003)
+
+
+def timed(n):
+    child = hist.labels("timer")
+    for i in range(n):
+        with child.time():
+            pass
+
+
+def inc(n):
+    child = counter.labels("inc")
+    for i in range(n):
+        child.inc()
+
+
+def baseline(n):
+    for i in range(n):
+        pass
+
+
+def threaded(n):
+    threads = [threading.Thread(target=observe, args=(n // THREADS,)) for _ in range(THREADS)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def main():
+    loop = per_op(baseline)
+
+    print(f"empty loop           {loop:6.0f} ns/op")
+    print(f"histogram observe    {per_op(observe) - loop:6.0f} ns/op")
+    print(f"histogram timer      {per_op(timed) - loop:6.0f} ns/op")
+    print(f"counter inc          {per_op(inc) - loop:6.0f} ns/op")
+    print(f"observe, {THREADS} threads   {per_op(threaded) - loop:6.0f} ns/op")
+
+    total = sum(hist.labels("observe").total()[:-1])
+    print(f"observations counted {total:,} (expected {2 * N:,})")
+
+    started = time.perf_counter()
+    body = registry.render()
+    print(f"render               {(time.perf_counter() - started) * 1000:6.2f} ms, {len(body.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
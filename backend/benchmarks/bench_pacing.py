@@ -0,0 +1,82 @@
+# backend/benchmarks/bench_pacing.py
+#
+# IBScheduler against a fake IB: a chart burst of historical requests
+# plus a stream of orders. Limits are scaled down (x60) so the run takes
+# seconds; the check is that no sliding window exceeds the historical
+# limit and that orders are not queued behind the burst.
+#
+#   cd backend && python -m benchmarks.bench_pacing
+
+import asyncio
+import time
+
+from core.pacing import IBScheduler, PRIORITY_HIGH, PRIORITY_NORMAL
+
+SCALE = 60
+HIST_LIMIT, HIST_WINDOW, HIST_BURST = 60, 600 / SCALE, 10
+HISTORY_REQUESTS = 120
+ORDERS = 20
+
+
+class FakeIB:
+    def __init__(self):
+        self.history_times = []
+
+    async def reqHistoricalDataAsync(self, *args, **kwargs):
+        self.history_times.append(time.monotonic())
+        await asyncio.sleep(0.05)
+        return []
+
+    def placeOrder(self, contract, order):
+        return order
+
+
+def max_in_window(times, window):
+    best = 0
+    j = 0
+
+    for i, t in enumerate(times):
+        while times[j] <= t - window:
+            j += 1
+        best = max(best, i - j + 1)
+
+    return best
+
+
+async def main():
+    ib = FakeIB()
+    pacer = IBScheduler(lanes={
+        "historical": ((HIST_LIMIT - HIST_BURST) / HIST_WINDOW, HIST_BURST, PRIORITY_NORMAL, 0.0),
+        "orders": (20.0, 20, PRIORITY_HIGH, 0.0),
+    }, msg_rate=45)
+
+    order_waits = []
+
+    async def chart(i):
+        await pacer.acquire("historical")
+        await ib.reqHistoricalDataAsync(i)
+
+    async def order(i):
+        started = time.perf_counter()
+        await pacer.acquire("orders")
+        ib.placeOrder(None, i)
+        order_waits.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    charts = [asyncio.create_task(chart(i)) for i in range(HISTORY_REQUESTS)]
+
+    for i in range(ORDERS):
+        await order(i)
+        await asyncio.sleep(0.1)
+
+    await asyncio.gather(*charts)
+    elapsed = time.perf_counter() - started
+
+    print(f"historical: {HISTORY_REQUESTS} requests in {elapsed:.1f}s, "
+          f"max {max_in_window(ib.history_times, HIST_WINDOW)} per {HIST_WINDOW:.0f}s window (limit {HIST_LIMIT})")
+    print(f"orders:     {ORDERS} placed during the burst, wait max {max(order_waits):.2f} ms")
+    print(pacer.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+# backend/benchmarks/bench_portfolio.py
+#
+# /api/positions with 200 positions, dashboards polling once a second:
+# the old handler (list rebuilt from ib.positions(), FastAPI encoding)
+# against Portfolio.view() + ETag (cached bytes, or 304 when unchanged),
+# through the ASGI stack with an in-process client.
+#
+#   cd backend && python -m benchmarks.bench_portfolio
+
+import asyncio
+import time
+
+import httpx
+from eventkit import Event
+from fastapi import FastAPI, Request
+from ib_insync import Stock
+from ib_insync.objects import PnLSingle, Position
+
+from core.serialize import etag_response
+from services.portfolio import Portfolio
+
+POSITIONS = 200
+REQUESTS = 2000
+
+
+class FakeIB:
+    def __init__(self):
+        for name in ("connectedEvent", "positionEvent", "pnlEvent", "pnlSingleEvent", "accountValueEvent",
+                     "accountSummaryEvent", "execDetailsEvent", "orderStatusEvent"):
+            setattr(self, name, Event())
+
+        self.held = [Position("U1", Stock(f"S{i}", conId=i + 1), 100 + i, 50.0 + i) for i in range(POSITIONS)]
+
+    def isConnected(self):
+        return True
+
+    def positions(self):
+        return self.held
+
+    def accountValues(self):
+        return []
+
+    def reqPnLSingle(self, *args):
+        pass
+
+
+def make_app(ib, portfolio):
+    app = FastAPI()
+
+    @app.get("/before")
+    async def before():
+        return [
+            {"account": p.account, "symbol": p.contract.symbol, "conId": p.contract.conId,
+             "position": p.position, "avgCost": p.avgCost}
+            for p in ib.positions()
+        ]
+
+    @app.get("/after")
+    async def after(request: Request):
+        return etag_response(request, *portfolio.view("positions"))
+
+    return app
+
+
+async def poll(client, path, etag=False, every=None, update=None):
+    headers = {}
+    started = time.perf_counter()
+    not_modified = 0
+
+    for i in range(REQUESTS):
+        if every and i % every == 0:
+            update()
+
+        r = await client.get(path, headers=headers)
+        not_modified += r.status_code == 304
+
+        if etag:
+            headers = {"If-None-Match": r.headers["etag"]}
+
+    return (time.perf_counter() - started) / REQUESTS * 1e6, not_modified
+
+
+async def main():
+    ib = FakeIB()
+    portfolio = Portfolio(ib)
+
+    # one PnL update for one position between polls
+    def update():
+        ib.pnlSingleEvent.emit(PnLSingle("U1", "", 1, 1.0, 2.0, 0.0, 100, 5000.0))
+
+    transport = httpx.ASGITransport(app=make_app(ib, portfolio))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, path, etag, every in (
+            ("rebuild per request", "/before", False, None),
+            ("cached bytes", "/after", False, None),
+            ("etag, unchanged", "/after", True, None),
+            ("etag, change every 10", "/after", True, 10),
+        ):
+            us, not_modified = await poll(client, path, etag, every, update)
+            print(f"{label:<22} {us:8.1f} us/request  304s {not_modified}/{REQUESTS}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
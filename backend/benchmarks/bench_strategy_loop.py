@@ -0,0 +1,91 @@
+# backend/benchmarks/bench_strategy_loop.py
+#
+# Strategy loop latency vs. number of tracked symbols.
+#
+#   cd backend && python -m benchmarks.bench_strategy_loop
+
+import asyncio
+import random
+import statistics
+import time
+
+from strategy_engine import StrategyEngine, TIMEFRAMES
+from services.strategy_runner import StrategyRunner
+
+SYMBOL_COUNTS = [1, 10, 50, 100, 200, 500]
+WARMUP_BARS = 300
+CYCLES = 20
+
+
+def make_candle(t, price):
+    close = price + random.gauss(0, 0.3)
+
+    return {
+        "time": t,
+        "open": price,
+        "high": max(price, close) + random.random(),
+        "low": min(price, close) - random.random(),
+        "close": close,
+        "volume": random.randint(100, 10_000),
+    }
+
+
+def build_engine(n_symbols):
+    engine = StrategyEngine()
+    prices = {}
+
+    for i in range(n_symbols):
+        symbol = f"SYM{i}"
+        prices[symbol] = 100.0
+
+        for tf in TIMEFRAMES:
+            for t in range(WARMUP_BARS):
+                prices[symbol] += random.gauss(0, 1)
+                engine.update_candle(symbol, tf, make_candle(t, prices[symbol]))
+
+    return engine, prices
+
+
+async def noop_broadcast(result):
+    pass
+
+
+async def measure(n_symbols):
+    engine, prices = build_engine(n_symbols)
+    runner = StrategyRunner(engine, noop_broadcast)
+    samples = []
+
+    for cycle in range(CYCLES):
+        # one fresh bar per (symbol, timeframe) so nothing is served from cache
+        for symbol in engine.symbols():
+            for tf in TIMEFRAMES:
+                prices[symbol] += random.gauss(0, 1)
+                engine.update_candle(symbol, tf, make_candle(WARMUP_BARS + cycle, prices[symbol]))
+
+        started = time.perf_counter()
+        await asyncio.gather(*runner.dispatch())
+        samples.append((time.perf_counter() - started) * 1000)
+
+    runner.shutdown()
+    samples.sort()
+
+    return {
+        "symbols": n_symbols,
+        "median_ms": statistics.median(samples),
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "per_symbol_us": statistics.median(samples) * 1000 / n_symbols,
+    }
+
+
+async def main():
+    random.seed(7)
+
+    print(f"{'symbols':>8} {'median ms':>10} {'p99 ms':>10} {'us/symbol':>10}")
+
+    for n in SYMBOL_COUNTS:
+        r = await measure(n)
+        print(f"{r['symbols']:>8} {r['median_ms']:>10.2f} {r['p99_ms']:>10.2f} {r['per_symbol_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
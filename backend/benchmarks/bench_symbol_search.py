@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_symbol_search.py
+#
+# SymbolIndex over a synthetic 20k-symbol master: every prefix of a few
+# symbols as typed in the TopBar autocomplete (first time and repeated),
+# name-word and misspelled queries.
+#
+#   cd backend && python -m benchmarks.bench_symbol_search
+
+import random
+import string
+import time
+
+from core.symbols import SymbolIndex
+
+SYMBOLS = 20_000
+WORDS = ["Apple", "Micro", "Systems", "Energy", "Holdings", "Capital", "Bio", "Pharma",
+         "Global", "Tech", "Networks", "Motors", "Foods", "Bank", "Trust", "Semiconductor"]
+TYPED = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+
+
+def make_master(n, seed=1):
+    rnd = random.Random(seed)
+    items = {s: "" for s in TYPED}
+
+    while len(items) < n:
+        items["".join(rnd.choices(string.ascii_uppercase, k=rnd.randint(1, 5)))] = ""
+
+    return [
+        {"symbol": s, "name": " ".join(rnd.sample(WORDS, 3)) + " Inc", "exchange": "NASDAQ"}
+        for s in items
+    ]
+
+
+def timed(index, queries, repeat=1):
+    samples = []
+
+    for _ in range(repeat):
+        for q in queries:
+            t = time.perf_counter()
+            index.search(q)
+            samples.append((time.perf_counter() - t) * 1e6)
+
+    samples.sort()
+    return f"p50 {samples[len(samples) // 2]:7.1f} us  max {samples[-1]:8.1f} us  ({len(samples)} queries)"
+
+
+def main():
+    master = make_master(SYMBOLS)
+    index = SymbolIndex()
+
+    t = time.perf_counter()
+    index.add(master)
+    print(f"build {len(index):,} symbols: {(time.perf_counter() - t) * 1000:.0f} ms")
+
+    prefixes = [s[:i] for s in TYPED for i in range(1, len(s) + 1)]
+
+    print(f"prefix, first  {timed(index, prefixes)}")
+    print(f"prefix, cached {timed(index, prefixes, repeat=20)}")
+
+    index.cache.clear()
+    print(f"name word      {timed(index, ['SEMI', 'PHARMA', 'NETW', 'CAPITAL'])}")
+    print(f"fuzzy          {timed(index, ['SEMICONDUCTR', 'PHRAMA', 'NETWROKS'])}")
+    print(index.search("SEMICONDUCTR", 3))
+    print(index.status())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# backend/benchmarks/bench_ws_fanout.py
+#
+# ConnectionManager fan-out to many sockets, a few of them stalled.
+# Fake websockets stand in for browsers: most take ~1 ms per send, the
+# stalled ones never return. Reports how long publish() holds the
+# caller (the strategy loop) and what the healthy clients receive.
+#
+#   cd backend && python -m benchmarks.bench_ws_fanout
+
+import asyncio
+import random
+import time
+
+from ws.manager import ConnectionManager
+
+CLIENTS = 1000
+STALLED = 10
+SYMBOLS = [f"SYM{i}" for i in range(50)]
+PUBLISHES = 500
+
+
+class FakeSocket:
+    def __init__(self, delay):
+        self.delay = delay
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def send_bytes(self, data):
+        await self.send_text(data)
+
+    async def close(self, code=1000):
+        pass
+
+
+async def main():
+    manager = ConnectionManager(send_timeout=1.0, max_lag=2.0)
+    sockets = [FakeSocket(3600 if i < STALLED else 0) for i in range(CLIENTS)]
+
+    for ws in sockets:
+        await manager.connect(ws)
+
+    publish_ms = []
+    started = time.perf_counter()
+
+    for i in range(PUBLISHES):
+        t = time.perf_counter()
+        await manager.broadcast({"symbol": random.choice(SYMBOLS), "timeframe": "1m", "macd": i})
+        publish_ms.append((time.perf_counter() - t) * 1000)
+        await asyncio.sleep(0.001)
+
+    await asyncio.sleep(1.5)
+    elapsed = time.perf_counter() - started
+
+    publish_ms.sort()
+    healthy = [ws.received for ws in sockets[STALLED:]]
+
+    print(f"{CLIENTS} clients ({STALLED} stalled), {PUBLISHES} publishes in {elapsed:.1f}s")
+    print(f"publish(): avg {sum(publish_ms) / len(publish_ms):.3f} ms, p99 {publish_ms[int(len(publish_ms) * 0.99)]:.3f} ms")
+    print(f"healthy clients received {min(healthy)}..{max(healthy)} messages (rest conflated)")
+    print(manager.stats())
+
+    for client in list(manager.clients.values()):
+        manager.disconnect(client.websocket)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,451 @@
+# backend/benchmarks/suite.py
+#
+# Indicator / engine micro-benchmarks with baseline comparison. Synthetic
+# OHLCV (seeded, so every run sees the same bars) at 500, 10k and 1M
+# bars; the pure-Python list versions only run up to REFERENCE_MAX_BARS.
+#
+#   cd backend && python -m benchmarks.suite
+#   cd backend && python -m benchmarks.suite --sizes 500 10000 --out before.json
+#   cd backend && python -m benchmarks.suite --baseline before.json --threshold 0.25
+#   cd backend && python -m benchmarks.suite --filter macd
+#
+# Timing only: the same implementations are checked against their
+# references in tests/ (python -m pytest -q tests). Each case reports
+# best and median of --repeat samples, each sample looping the case for
+# at least --min-time seconds. Exit status is 1 when a case fails to run
+# or is slower than the baseline by more than --threshold (best time).
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from core.candle_buffer import COLUMNS
+from indicators.fibonacci import fib_levels
+from indicators.fractals import StreamingFractals, detect_fractals, detect_fractals_np
+from indicators.macd import ema, ema_np, macd, macd_np
+from indicators.vwap import anchored_vwap, anchored_vwap_np, anchored_vwap_series_np
+from strategy_engine import StrategyEngine
+from ws.manager import ConnectionManager
+
+SIZES = (500, 10_000, 1_000_000)
+# list-of-dict implementations are O(n) Python loops: skip them above this
+REFERENCE_MAX_BARS = 10_000
+CLIENT_COUNTS = (10, 100, 1000)
+SEED = 7
+
+
+# --------------------------------------------------
+# Synthetic data
+# --------------------------------------------------
+def make_ohlcv(n, seed=SEED):
+    """Random-walk OHLCV columns, one bar a minute."""
+    rng = np.random.default_rng(seed)
+    open_ = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    close = open_ + rng.normal(0, 0.3, n)
+
+    return {
+        "time": np.arange(n, dtype=np.int64) * 60,
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(n),
+        "low": np.minimum(open_, close) - rng.random(n),
+        "close": close,
+        "volume": rng.integers(100, 10_000, n).astype(np.float64),
+    }
+
+
+def to_candles(cols):
+    return [
+        {"time": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(*(cols[name].tolist() for name in COLUMNS))
+    ]
+
+
+# --------------------------------------------------
+# Cases: setup(size) -> run or (run, close)
+# --------------------------------------------------
+class Case:
+    def __init__(self, name, setup, sizes, unit="bars"):
+        self.name = name
+        self.setup = setup
+        self.sizes = sizes
+        self.unit = unit
+
+
+_data = {}
+
+
+def data_for(size):
+    """(columns, candle dicts or None past REFERENCE_MAX_BARS), built once per size."""
+    if size not in _data:
+        cols = make_ohlcv(size)
+        _data[size] = (cols, to_candles(cols) if size <= REFERENCE_MAX_BARS else None)
+
+    return _data[size]
+
+
+def fractals_list(size):
+    _, candles = data_for(size)
+    return lambda: detect_fractals(candles)
+
+
+def fractals_np(size):
+    cols, _ = data_for(size)
+    return lambda: detect_fractals_np(cols["high"], cols["low"])
+
+
+def fractals_streaming(size):
+    _, candles = data_for(size)
+
+    def run():
+        sf = StreamingFractals()
+        for c in candles:
+            sf.update(c)
+        return sf
+
+    return run
+
+
+def vwap_list(size):
+    cols, candles = data_for(size)
+    anchor = int(cols["time"][size // 2])
+
+    return lambda: anchored_vwap(candles, anchor)
+
+
+def vwap_np(size):
+    cols, _ = data_for(size)
+    anchor = int(cols["time"][size // 2])
+
+    return lambda: anchored_vwap_np(cols["time"], cols["close"], cols["volume"], anchor)
+
+
+def vwap_series_np(size):
+    cols, _ = data_for(size)
+    anchor_idx = np.where(np.arange(size) >= size // 2, size // 2, -1)
+
+    return lambda: anchored_vwap_series_np(cols["close"], cols["volume"], anchor_idx)
+
+
+def ema_list(size):
+    cols, _ = data_for(size)
+    closes = cols["close"].tolist()
+
+    return lambda: ema(closes, 26)
+
+
+def ema_vectorized(size):
+    cols, _ = data_for(size)
+    return lambda: ema_np(cols["close"], 26)
+
+
+def macd_list(size):
+    cols, _ = data_for(size)
+    closes = cols["close"].tolist()
+
+    return lambda: macd(closes)
+
+
+def macd_vectorized(size):
+    cols, _ = data_for(size)
+    return lambda: macd_np(cols["close"])
+
+
+def fib(size):
+    return lambda: fib_levels(110.0, 100.0)
+
+
+# --------------------------------------------------
+# Engine
+# --------------------------------------------------
+def loaded_engine(size):
+    cols, _ = data_for(size)
+    engine = StrategyEngine()
+    engine.load_history("BENCH", "1m", cols)
+
+    return engine, cols
+
+
+def engine_load(size):
+    cols, _ = data_for(size)
+
+    def run():
+        engine = StrategyEngine()
+        engine.load_history("BENCH", "1m", cols)
+        return engine.compute("BENCH", "1m")
+
+    return run
+
+
+def engine_step(size):
+    """One closed bar streamed in, then compute (nothing served from cache)."""
+    engine, cols = loaded_engine(size)
+    extra = to_candles(make_ohlcv(20_000, seed=SEED + 1))
+    offset = int(cols["time"][-1]) + 60
+    step = [0]
+
+    def run():
+        c = dict(extra[step[0] % len(extra)])
+        c["time"] = offset + step[0] * 60
+        step[0] += 1
+        engine.update_candle("BENCH", "1m", c)
+        return engine.compute("BENCH", "1m")
+
+    return run
+
+
+def engine_cached(size):
+    engine, _ = loaded_engine(size)
+    engine.compute("BENCH", "1m")
+
+    return lambda: engine.compute("BENCH", "1m")
+
+
+# --------------------------------------------------
+# Websocket fan-out
+# --------------------------------------------------
+class FakeSocket:
+    def __init__(self):
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.received += 1
+
+    async def send_bytes(self, data):
+        self.received += 1
+
+    async def close(self, code=1000):
+        pass
+
+
+def ws_broadcast(clients):
+    """broadcast() of one strategy result plus delivery to every socket."""
+    loop = asyncio.new_event_loop()
+    manager = ConnectionManager(channel="bench")
+    sockets = [FakeSocket() for _ in range(clients)]
+    engine, _ = loaded_engine(500)
+    result = dict(engine.compute("BENCH", "1m"))
+    seq = [0]
+
+    for ws in sockets:
+        loop.run_until_complete(manager.connect(ws))
+
+    async def publish():
+        seq[0] += 1
+        await manager.broadcast({**result, "price": result["price"] + seq[0]})
+
+        while any(c.queue for c in manager.clients.values()):
+            await asyncio.sleep(0)
+
+    def run():
+        loop.run_until_complete(publish())
+
+    async def disconnect():
+        tasks = [c.task for c in manager.clients.values()]
+
+        for ws in sockets:
+            manager.disconnect(ws)
+
+        await asyncio.wait(tasks)
+
+    def close():
+        loop.run_until_complete(disconnect())
+        loop.close()
+
+    return run, close
+
+
+CASES = [
+    Case("fractals.detect_fractals", fractals_list, "ref"),
+    Case("fractals.detect_fractals_np", fractals_np, "all"),
+    Case("fractals.streaming", fractals_streaming, "ref"),
+    Case("vwap.anchored_vwap", vwap_list, "ref"),
+    Case("vwap.anchored_vwap_np", vwap_np, "all"),
+    Case("vwap.anchored_vwap_series_np", vwap_series_np, "all"),
+    Case("macd.ema", ema_list, "ref"),
+    Case("macd.ema_np", ema_vectorized, "all"),
+    Case("macd.macd", macd_list, "ref"),
+    Case("macd.macd_np", macd_vectorized, "all"),
+    Case("fibonacci.fib_levels", fib, "one", unit="-"),
+    Case("engine.load_history+compute", engine_load, "all"),
+    Case("engine.update+compute", engine_step, "one", unit="-"),
+    Case("engine.compute_cached", engine_cached, "one", unit="-"),
+    Case("ws.broadcast", ws_broadcast, "clients", unit="clients"),
+]
+
+
+def case_sizes(case, sizes):
+    if case.sizes == "one":
+        return [500]
+    if case.sizes == "clients":
+        return list(CLIENT_COUNTS)
+    if case.sizes == "ref":
+        return [s for s in sizes if s <= REFERENCE_MAX_BARS]
+
+    return list(sizes)
+
+
+# --------------------------------------------------
+# Timing
+# --------------------------------------------------
+def measure(fn, repeat, min_time):
+    """(best, median) seconds per call; each sample loops for >= min_time."""
+    fn()
+    number = 1
+
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+
+        if elapsed >= min_time:
+            break
+
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+
+    samples = [elapsed / number]
+
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+
+    return min(samples), statistics.median(samples), number
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(sizes, repeat, min_time, only=None):
+    results = []
+
+    for case in CASES:
+        if only and only not in case.name:
+            continue
+
+        for size in case_sizes(case, sizes):
+            label = f"{case.name}[{size:,} {case.unit}]" if case.unit != "-" else case.name
+            entry = {"name": case.name, "size": size, "unit": case.unit}
+
+            close, error = None, None
+
+            try:
+                fn = case.setup(size)
+
+                if isinstance(fn, tuple):
+                    fn, close = fn
+
+                best, median, number = measure(fn, repeat, min_time)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            entry["ok"] = error is None
+            entry["error"] = error
+
+            if error is None:
+                entry.update(best_us=best * 1e6, median_us=median * 1e6, loops=number)
+                print(f"  {label:<48} {best * 1e6:14.2f} us  (median {median * 1e6:.2f}, x{number})")
+            else:
+                print(f"  {label:<48} FAILED: {error}")
+
+            if close:
+                close()
+
+            results.append(entry)
+
+    return results
+
+
+def key(entry):
+    return f"{entry['name']}@{entry['size']}"
+
+
+def compare(results, baseline, threshold):
+    """Print ratios against the baseline; returns the regressed keys."""
+    base = {key(e): e for e in baseline["results"] if e.get("best_us")}
+    regressed = []
+
+    for e in results:
+        b = base.get(key(e))
+
+        if b is None or not e.get("best_us"):
+            continue
+
+        ratio = e["best_us"] / b["best_us"]
+        flag = "REGRESSION" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else ""
+        print(f"  {key(e):<48} {b['best_us']:12.2f} -> {e['best_us']:12.2f} us  x{ratio:5.2f}  {flag}")
+
+        if flag == "REGRESSION":
+            regressed.append(key(e))
+
+    return regressed
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="indicator / engine benchmark suite")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="bar counts (default 500 10000 1000000)")
+    p.add_argument("--repeat", type=int, default=5, help="timed samples per case")
+    p.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    p.add_argument("--filter", default=None, help="only cases whose name contains this")
+    p.add_argument("--out", default=None, help="write results as JSON (use as a later --baseline)")
+    p.add_argument("--baseline", default=None, help="JSON from an earlier --out to compare against")
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = p.parse_args(argv)
+
+    print(f"[suite.py] sizes {args.sizes}, {args.repeat} x {args.min_time}s samples")
+    results = run_suite(args.sizes, args.repeat, args.min_time, args.filter)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+        "results": results,
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[suite.py] results written to {args.out}")
+
+    failed = [key(e) for e in results if not e["ok"]]
+    regressed = []
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        print(f"[suite.py] against {args.baseline} (commit {baseline.get('commit')}, {baseline.get('created')})")
+
+        if (baseline.get("python"), baseline.get("numpy"), baseline.get("machine")) != (report["python"], report["numpy"], report["machine"]):
+            print("[suite.py] warning: baseline was recorded with a different Python / NumPy / machine")
+
+        regressed = compare(results, baseline, args.threshold)
+
+    if failed:
+        print(f"[suite.py] {len(failed)} case(s) failed to run: {', '.join(failed)}")
+    if regressed:
+        print(f"[suite.py] {len(regressed)} case(s) slower than baseline by > {args.threshold:.0%}: {', '.join(regressed)}")
+
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# backend/core/candle_buffer.py
+
+import numpy as np
+
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+
+class CandleBuffer:
+    """
+    Fixed-capacity, column-oriented OHLCV ring buffer.
+
+    Each column is allocated at twice the capacity and every row is
+    written twice (at i and i + capacity), so the most recent rows are
+    always one contiguous slice and window views never copy.
+
+    Views returned by the column properties are only valid until the
+    next append / extend.
+    """
+
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self.size = 0
+        self._pos = 0
+        self._cols = {
+            name: np.zeros(2 * capacity, dtype=np.int64 if name == "time" else np.float64)
+            for name in COLUMNS
+        }
+
+    def __len__(self):
+        return self.size
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def append(self, candle):
+        p = self._pos
+        upper = p + self.capacity
+
+        for name, col in self._cols.items():
+            col[p] = col[upper] = candle[name]
+
+        self._pos = (p + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def replace_last(self, candle):
+        if not self.size:
+            self.append(candle)
+            return
+
+        p = (self._pos - 1) % self.capacity
+
+        for name, col in self._cols.items():
+            col[p] = col[p + self.capacity] = candle[name]
+
+    def extend(self, columns):
+        """
+        Bulk write; columns maps each name in COLUMNS to an array.
+        """
+        merged = {
+            name: np.concatenate([self.column(name), np.asarray(columns[name])])[-self.capacity:]
+            for name in COLUMNS
+        }
+
+        m = len(merged["time"])
+
+        for name, col in self._cols.items():
+            col[:m] = merged[name]
+            col[self.capacity:self.capacity + m] = merged[name]
+
+        self.size = m
+        self._pos = m % self.capacity
+
+    # --------------------------------------------------
+    # Zero-copy reads
+    # --------------------------------------------------
+    def column(self, name, n=None):
+        n = self.size if n is None else min(n, self.size)
+        end = (self._pos - 1) % self.capacity + self.capacity + 1
+
+        return self._cols[name][end - n:end]
+
+    @property
+    def time(self):
+        return self.column("time")
+
+    @property
+    def open(self):
+        return self.column("open")
+
+    @property
+    def high(self):
+        return self.column("high")
+
+    @property
+    def low(self):
+        return self.column("low")
+
+    @property
+    def close(self):
+        return self.column("close")
+
+    @property
+    def volume(self):
+        return self.column("volume")
+
+    def row(self, i):
+        return {name: self.column(name)[i].item() for name in COLUMNS}
+
+    def last(self):
+        return self.row(-1) if self.size else None
+
+    @property
+    def nbytes(self):
+        return sum(col.nbytes for col in self._cols.values())
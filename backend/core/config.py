@@ -7,4 +7,58 @@ IB_HOST = os.getenv("IB_HOST", "127.0.0.1")
 IB_PORT = int(os.getenv("IB_PORT", "4002"))
 IB_CLIENT_ID = int(os.getenv("IB_CLIENT_ID", "17"))
 
-CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",")]
\ No newline at end of file
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",")]
+
+# local OHLCV files (<SYMBOL>.csv / <SYMBOL>.npz) used by the backtester
+BACKTEST_DATA_DIR = os.getenv("BACKTEST_DATA_DIR", "data/bars")
+
+# on-disk historical bar cache behind /api/history
+BAR_CACHE_PATH = os.getenv("BAR_CACHE_PATH", "cache/bars.sqlite")
+
+# qualified contracts: in-memory LRU size and SQLite store ("" = memory only)
+CONTRACT_CACHE_SIZE = int(os.getenv("CONTRACT_CACHE_SIZE", "1024"))
+CONTRACT_CACHE_PATH = os.getenv("CONTRACT_CACHE_PATH", "cache/contracts.sqlite")
+
+# /api/search symbol index store ("" = memory only) and an optional symbol
+# master file (CSV / pipe-delimited listing) loaded at startup
+SYMBOL_INDEX_PATH = os.getenv("SYMBOL_INDEX_PATH", "cache/symbols.sqlite")
+SYMBOL_MASTER_PATH = os.getenv("SYMBOL_MASTER_PATH", "")
+
+# streaming market data: concurrent line limit and idle unsubscribe delay (s)
+IB_MAX_MKT_LINES = int(os.getenv("IB_MAX_MKT_LINES", "100"))
+MKT_DATA_IDLE_TTL = float(os.getenv("MKT_DATA_IDLE_TTL", "60"))
+
+# batch endpoints: IBKR requests in flight at once (historical data allows
+# ~50 open requests, keep well under it so single calls aren't starved)
+BATCH_MAX_INFLIGHT = int(os.getenv("BATCH_MAX_INFLIGHT", "8"))
+
+# IBKR pacing: API messages per second and historical requests per 10 minutes
+IB_MAX_MSG_RATE = float(os.getenv("IB_MAX_MSG_RATE", "45"))
+IB_HIST_PER_10MIN = int(os.getenv("IB_HIST_PER_10MIN", "60"))
+
+# websocket fan-out: pending messages per client, and how long a client may
+# block a send or lag behind before it is disconnected (s)
+WS_QUEUE_MAX = int(os.getenv("WS_QUEUE_MAX", "256"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+WS_MAX_LAG = float(os.getenv("WS_MAX_LAG", "10"))
+
+# live tick websocket: max pushes per symbol per second
+TICK_RATE_HZ = float(os.getenv("TICK_RATE_HZ", "10"))
+
+# portfolio cache: websocket push coalescing (ms) and how often positions /
+# account values are sampled into the positions / account_snapshots tables
+# (s, 0 = off; unchanged state is not sampled again)
+PORTFOLIO_PUSH_MS = int(os.getenv("PORTFOLIO_PUSH_MS", "250"))
+PORTFOLIO_SAMPLE_SEC = float(os.getenv("PORTFOLIO_SAMPLE_SEC", "60"))
+
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:password@db:5432/algo_db")
+DB_ECHO = os.getenv("DB_ECHO", "0") == "1"
+
+# write-behind inserts: flush every DB_WRITER_BATCH rows or DB_WRITER_INTERVAL_MS,
+# rows beyond DB_WRITER_MAX_QUEUE are dropped rather than blocking callers
+DB_WRITER_BATCH = int(os.getenv("DB_WRITER_BATCH", "500"))
+DB_WRITER_INTERVAL_MS = int(os.getenv("DB_WRITER_INTERVAL_MS", "250"))
+DB_WRITER_MAX_QUEUE = int(os.getenv("DB_WRITER_MAX_QUEUE", "100000"))
+
+# Arrow bar archive (<dir>/<SYMBOL>/<bar size>/<series>/<date>.arrow), see backtest/archive.py
+BAR_ARCHIVE_DIR = os.getenv("BAR_ARCHIVE_DIR", "data/archive")
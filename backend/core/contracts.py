@@ -0,0 +1,160 @@
+# backend/core/contracts.py
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from ib_insync import Contract
+
+from core.config import CONTRACT_CACHE_PATH, CONTRACT_CACHE_SIZE
+from core.ibkr import ib
+from core.metrics import ib_request_seconds
+from core.pacing import pacer
+
+# fields needed to rebuild a qualified contract
+CONTRACT_FIELDS = (
+    "secType", "conId", "symbol", "lastTradeDateOrContractMonth", "strike", "right",
+    "multiplier", "exchange", "primaryExchange", "currency", "localSymbol", "tradingClass",
+)
+
+
+def contract_key(c):
+    # derivatives also need expiry / strike / right to be unique
+    return "|".join(str(x) for x in (
+        c.symbol.upper(), c.secType, c.exchange, c.currency,
+        c.lastTradeDateOrContractMonth, c.strike, c.right,
+    ))
+
+
+class ContractResolver:
+    """
+    Qualified-contract cache shared by every route.
+
+    (symbol, secType, exchange, currency) -> contract fields with conId,
+    held in an in-memory LRU and optionally persisted to SQLite so a
+    restart does not re-qualify the watchlist. Concurrent async
+    requests for the same key share a single qualifyContractsAsync.
+    """
+
+    def __init__(self, ib, maxsize=1024, path=None):
+        self.ib = ib
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.db = None
+        self.stats = {"hits": 0, "misses": 0}
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+
+            with self.db:
+                self.db.execute("CREATE TABLE IF NOT EXISTS contracts (key TEXT PRIMARY KEY, data TEXT)")
+
+    # --------------------------------------------------
+    # Cache
+    # --------------------------------------------------
+    def _get(self, key):
+        with self.lock:
+            fields = self.cache.get(key)
+
+            if fields is not None:
+                self.cache.move_to_end(key)
+                return fields
+
+            if self.db is None:
+                return None
+
+            row = self.db.execute("SELECT data FROM contracts WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        fields = json.loads(row[0])
+        self._put(key, fields, persist=False)
+
+        return fields
+
+    def _put(self, key, fields, persist=True):
+        with self.lock:
+            self.cache[key] = fields
+            self.cache.move_to_end(key)
+
+            while len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+
+            if persist and self.db is not None:
+                with self.db:
+                    self.db.execute("INSERT OR REPLACE INTO contracts VALUES (?, ?)", (key, json.dumps(fields)))
+
+    @staticmethod
+    def _fields(contract):
+        return {f: getattr(contract, f) for f in CONTRACT_FIELDS}
+
+    def _hit(self, key):
+        fields = self._get(key)
+
+        if fields is None:
+            return None
+
+        self.stats["hits"] += 1
+        # fresh object per caller: ib_insync may mutate contracts it is given
+        return Contract.create(**fields)
+
+    def _store(self, key, contract):
+        if not contract.conId:
+            raise HTTPException(404, f"Unknown contract: {contract.symbol}")
+
+        self.stats["misses"] += 1
+        self._put(key, self._fields(contract))
+
+        return Contract.create(**self._fields(contract))
+
+    # --------------------------------------------------
+    # Resolve
+    # --------------------------------------------------
+    async def resolve(self, contract):
+        key = contract_key(contract)
+        cached = self._hit(key)
+
+        if cached is not None:
+            return cached
+
+        task = self.in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._qualify(key, contract))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+
+        # shield: one caller going away must not cancel the shared lookup
+        return Contract.create(**self._fields(await asyncio.shield(task)))
+
+    async def _qualify(self, key, contract):
+        await pacer.acquire("market")
+
+        with ib_request_seconds.labels("qualify").time():
+            await self.ib.qualifyContractsAsync(contract)
+
+        return self._store(key, contract)
+
+    def resolve_sync(self, contract, ib=None):
+        """
+        Blocking variant for code running its own IB instance (IBKRClient).
+        """
+        key = contract_key(contract)
+        cached = self._hit(key)
+
+        if cached is not None:
+            return cached
+
+        (ib or self.ib).qualifyContracts(contract)
+        return self._store(key, contract)
+
+
+contract_resolver = ContractResolver(ib, CONTRACT_CACHE_SIZE, CONTRACT_CACHE_PATH)
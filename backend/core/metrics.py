@@ -0,0 +1,316 @@
+# backend/core/metrics.py
+#
+# In-process metrics in Prometheus text format, served at GET /metrics.
+#
+# Counters and histograms keep one shard per writing thread (event loop,
+# strategy workers, to_thread calls). A shard is only ever written by its
+# own thread, so observe() / inc() are a dict lookup plus list updates with
+# no lock; the lock is taken only when a thread or label set is seen for
+# the first time, and by the scrape that sums the shards.
+
+import threading
+import time
+from bisect import bisect_left
+
+# seconds: 100 us .. 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 5, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _fmt(v):
+    if v == float("inf"):
+        return "+Inf"
+
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Sharded:
+    """Per-thread value lists, summed on collect."""
+
+    def __init__(self, size):
+        self.size = size
+        self.shards = {}
+        self.lock = threading.Lock()
+
+    def shard(self):
+        ident = threading.get_ident()
+        shard = self.shards.get(ident)
+
+        if shard is None:
+            with self.lock:
+                shard = self.shards.setdefault(ident, [0] * self.size)
+
+        return shard
+
+    def total(self):
+        with self.lock:
+            shards = list(self.shards.values())
+
+        return [sum(column) for column in zip(*shards)] if shards else [0] * self.size
+
+
+class _CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, n=1):
+        self.shard()[0] += n
+
+
+class _HistogramChild(_Sharded):
+    # shard layout: one count per bucket, +Inf count, sum
+    def __init__(self, buckets):
+        super().__init__(len(buckets) + 2)
+        self.buckets = buckets
+
+    def observe(self, value):
+        shard = self.shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("child", "started")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.children = {}
+        self.lock = threading.Lock()
+        registry.register(self)
+
+    def labels(self, *values):
+        child = self.children.get(values)
+
+        if child is None:
+            with self.lock:
+                child = self.children.get(values)
+
+                if child is None:
+                    child = self.children[values] = self._child()
+
+        return child
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _child(self):
+        return _CounterChild()
+
+    def inc(self, n=1):
+        self.labels().inc(n)
+
+    def collect(self):
+        lines = self.header()
+
+        for values, child in list(self.children.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, values)} {_fmt(child.total()[0])}")
+
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, help, labels)
+
+    def _child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def collect(self):
+        lines = self.header()
+
+        for values, child in list(self.children.items()):
+            total = child.total()
+            cumulative = 0
+
+            for le, count in zip(self.buckets + (float("inf"),), total[:-1]):
+                cumulative += count
+                labels = _labels(self.label_names + ("le",), values + (_fmt(le),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = _labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{labels} {_fmt(float(total[-1]))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Read at scrape time from fn(): a number, or {label values tuple: number}.
+    Queue depths and similar state already kept elsewhere cost nothing
+    between scrapes.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=(), fn=None, kind="gauge"):
+        # kind="counter" for running totals another object already keeps
+        self.fn = fn
+        self.kind = kind
+        super().__init__(name, help, labels)
+
+    def collect(self):
+        lines = self.header()
+
+        try:
+            value = self.fn()
+        except Exception as e:
+            print(f"[metrics.py] gauge {self.name} failed: {e}")
+            return lines
+
+        items = value.items() if isinstance(value, dict) else [((), value)]
+
+        for values, v in items:
+            lines.append(f"{self.name}{_labels(self.label_names, values)} {_fmt(v)}")
+
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} registered twice")
+
+        self.metrics[metric.name] = metric
+
+    def render(self):
+        lines = []
+
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.collect())
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+# --------------------------------------------------
+# HTTP
+# --------------------------------------------------
+http_request_seconds = Histogram(
+    "http_request_seconds", "REST request latency by route template", ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing HTTP requests (websockets pass through)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # template ("/api/orders/{orderId}"), never the raw path: bounded label set
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            http_request_seconds.labels(scope["method"], path, str(status[0])).observe(time.perf_counter() - started)
+
+
+# --------------------------------------------------
+# IBKR
+# --------------------------------------------------
+ib_request_seconds = Histogram(
+    "ib_request_seconds", "IBKR round trip (qualify, historical, mktData first tick, placeOrder ack)", ("call",),
+)
+ib_pacing_wait_seconds = Histogram(
+    "ib_pacing_wait_seconds", "time spent waiting for an IBKR pacing slot", ("lane",),
+)
+
+# --------------------------------------------------
+# Strategy engine
+# --------------------------------------------------
+indicator_update_seconds = Histogram(
+    "indicator_update_seconds", "streaming indicator update per closed bar", ("indicator",),
+)
+strategy_compute_seconds = Histogram(
+    "strategy_compute_seconds", "StrategyEngine.compute per symbol / timeframe", ("timeframe",),
+)
+strategy_cycle_seconds = Histogram(
+    "strategy_cycle_seconds", "one symbol's compute + broadcast in the strategy runner",
+)
+strategy_lag_seconds = Histogram(
+    "strategy_lag_seconds", "first pending change to its result being broadcast",
+)
+
+# --------------------------------------------------
+# Websockets
+# --------------------------------------------------
+ws_send_seconds = Histogram(
+    "ws_send_seconds", "queued-to-sent latency per websocket message", ("channel",),
+)
+ws_messages_total = Counter(
+    "ws_messages_total", "websocket messages by outcome (sent, conflated, dropped)", ("channel", "outcome"),
+)
+ws_disconnects_total = Counter(
+    "ws_slow_disconnects_total", "clients disconnected for blocking or lagging", ("channel",),
+)
+
+# --------------------------------------------------
+# Database writer
+# --------------------------------------------------
+db_batch_rows = Histogram(
+    "db_writer_batch_rows", "rows per write-behind flush", buckets=SIZE_BUCKETS,
+)
+db_flush_seconds = Histogram(
+    "db_writer_flush_seconds", "write-behind flush (one transaction)",
+)
@@ -0,0 +1,208 @@
+# backend/core/pacing.py
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from core.config import IB_MAX_MSG_RATE, IB_HIST_PER_10MIN
+from core.metrics import Gauge, ib_pacing_wait_seconds
+
+# lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+
+class TokenBucket:
+    """
+    rate tokens per second, at most burst stored.
+
+    Over any window W at most burst + rate * W requests get through, so
+    a "N per window" limit is met with rate = (N - burst) / W.
+    """
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now):
+        """Seconds until one token is available (0 = now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class Lane:
+    def __init__(self, name, rate, burst, priority=PRIORITY_NORMAL, same_key_gap=0.0, clock=time.monotonic):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.priority = priority
+        # IBKR rejects identical historical requests repeated within 15s
+        self.same_key_gap = same_key_gap
+        self.last_key = {}
+        # one request per key between the gap check and its grant
+        self.key_locks = {}
+        self.waiting = []
+
+        self.granted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def stats(self):
+        return {
+            "queued": len(self.waiting),
+            "granted": self.granted,
+            "avgWaitMs": round(self.wait_total / self.granted * 1000, 2) if self.granted else 0.0,
+            "maxWaitMs": round(self.wait_max * 1000, 2),
+            "tokens": round(self.bucket.tokens, 2),
+        }
+
+
+# name -> (rate/s, burst, priority, same_key_gap)
+DEFAULT_LANES = {
+    # 60 per 10 minutes (IB_HIST_PER_10MIN), 10 of them allowed back to back
+    "historical": ((IB_HIST_PER_10MIN - 10) / 600, 10, PRIORITY_NORMAL, 15.0),
+    # reqMktData, contract details, symbol search
+    "market": (20.0, 20, PRIORITY_NORMAL, 0.0),
+    "orders": (20.0, 20, PRIORITY_HIGH, 0.0),
+    "account": (2.0, 5, PRIORITY_NORMAL, 0.0),
+}
+
+
+class IBScheduler:
+    """
+    Central pacing gate for requests sent to IBKR.
+
+    Every request class has its own token bucket; a request also needs a
+    token from the global bucket (the API's messages-per-second limit).
+    Waiters are granted in (priority, arrival) order across classes, and
+    a class that is out of tokens never blocks the others, so orders go
+    out immediately even while a chart burst is queued on "historical".
+
+    Callers await acquire(cls) right before the IB call. The scheduler
+    never touches IB itself, so it can be driven with any fake.
+    """
+
+    def __init__(self, lanes=None, msg_rate=IB_MAX_MSG_RATE, clock=time.monotonic):
+        self.clock = clock
+        self.lanes = {
+            name: Lane(name, rate, burst, priority, gap, clock)
+            for name, (rate, burst, priority, gap) in (lanes or DEFAULT_LANES).items()
+        }
+        self.global_bucket = TokenBucket(msg_rate, msg_rate, clock)
+        self._seq = itertools.count()
+        self._timer = None
+
+    async def acquire(self, cls, key=None, priority=None):
+        lane = self.lanes[cls]
+        enqueued = self.clock()
+
+        if key is None or not lane.same_key_gap:
+            await self._acquire(lane, priority, enqueued)
+            return
+
+        # held until the grant is recorded, so a second identical request
+        # can't pass the gap check while the first is still queued
+        lock = lane.key_locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            last = lane.last_key.get(key)
+
+            if last is not None:
+                wait = lane.same_key_gap - (self.clock() - last)
+
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            now = await self._acquire(lane, priority, enqueued)
+            lane.last_key[key] = now
+
+        if len(lane.last_key) > 1000:
+            cutoff = now - lane.same_key_gap
+            lane.last_key = {k: t for k, t in lane.last_key.items() if t >= cutoff}
+            lane.key_locks = {k: l for k, l in lane.key_locks.items() if k in lane.last_key or l.locked()}
+
+    async def _acquire(self, lane, priority, enqueued):
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(lane.waiting, (lane.priority if priority is None else priority, next(self._seq), fut))
+        self._pump()
+
+        await fut
+
+        now = self.clock()
+        wait = now - enqueued
+        ib_pacing_wait_seconds.labels(lane.name).observe(wait)
+        lane.granted += 1
+        lane.wait_total += wait
+        lane.wait_max = max(lane.wait_max, wait)
+
+        return now
+
+    async def call(self, cls, fn, *args, **kwargs):
+        await self.acquire(cls)
+        return await fn(*args, **kwargs)
+
+    def _pump(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while True:
+            now = self.clock()
+            best = None
+            retry = None
+
+            for lane in self.lanes.values():
+                # drop waiters whose caller went away
+                while lane.waiting and lane.waiting[0][2].done():
+                    heapq.heappop(lane.waiting)
+
+                if not lane.waiting:
+                    continue
+
+                delay = lane.bucket.delay(now)
+
+                if delay > 0:
+                    retry = delay if retry is None else min(retry, delay)
+                elif best is None or lane.waiting[0][:2] < best.waiting[0][:2]:
+                    best = lane
+
+            if best is None:
+                break
+
+            delay = self.global_bucket.delay(now)
+
+            if delay > 0:
+                retry = delay if retry is None else min(retry, delay)
+                break
+
+            best.bucket.take(now)
+            self.global_bucket.take(now)
+            heapq.heappop(best.waiting)[2].set_result(None)
+
+        if retry is not None:
+            self._timer = asyncio.get_running_loop().call_later(retry, self._pump)
+
+    def stats(self):
+        return {
+            "lanes": {name: lane.stats() for name, lane in self.lanes.items()},
+            "globalTokens": round(self.global_bucket.tokens, 2),
+        }
+
+
+pacer = IBScheduler()
+
+Gauge(
+    "ib_pacing_queued", "requests waiting for a pacing slot", ("lane",),
+    fn=lambda: {(name,): len(lane.waiting) for name, lane in pacer.lanes.items()},
+)
@@ -0,0 +1,75 @@
+# backend/core/serialize.py
+
+import json
+from itertools import chain
+
+import numpy as np
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+    ORJSONResponse = None
+
+from core.candle_buffer import COLUMNS
+
+# JSON response class for bar-heavy endpoints; returned directly so
+# FastAPI's jsonable_encoder pass over every bar is skipped too
+FastJSONResponse = ORJSONResponse or JSONResponse
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+# --------------------------------------------------
+# Bars: rows = (ts, open, high, low, close, volume) tuples
+# --------------------------------------------------
+def bar_matrix(rows):
+    """n x 6 float64 array without going through per-row Python objects."""
+    return np.fromiter(chain.from_iterable(rows), np.float64, len(rows) * len(COLUMNS)).reshape(-1, len(COLUMNS))
+
+
+def bar_columns(rows):
+    """{"time": [epoch ints], "open": [...], ...}"""
+    data = bar_matrix(rows)
+    cols = {
+        name: data[:, i].astype(np.int64) if name == "time" else np.ascontiguousarray(data[:, i])
+        for i, name in enumerate(COLUMNS)
+    }
+
+    # orjson writes numpy arrays natively, the stdlib encoder needs lists
+    return cols if orjson is not None else {k: v.tolist() for k, v in cols.items()}
+
+
+def bar_binary_response(rows, headers=None):
+    """
+    Column-major little-endian float64: n times, then n opens, ... n volumes.
+    A chart reads it with one Float64Array and subarray() per column.
+    """
+    body = np.ascontiguousarray(bar_matrix(rows).T, dtype="<f8").tobytes()
+
+    return Response(
+        body,
+        media_type="application/octet-stream",
+        headers={
+            **(headers or {}),
+            "X-Bar-Count": str(len(rows)),
+            "X-Bar-Columns": ",".join(COLUMNS),
+        },
+    )
+
+
+def etag_response(request, body: bytes, etag: str):
+    """Pre-encoded JSON, or 304 when the client already holds this version."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,372 @@
+# backend/core/symbols.py
+#
+# Local symbol index behind /api/search. Filled from IBKR matching-symbol
+# results as they come in, and optionally from a symbol master file:
+#
+#   cd backend && python -m core.symbols import nasdaqlisted.txt
+#   cd backend && python -m core.symbols search appl
+#
+# The file is CSV or pipe-delimited with a header; a symbol column
+# ("symbol", "ACT Symbol", ...) is required, name / secType / exchange
+# columns are optional.
+
+import argparse
+import asyncio
+import bisect
+import csv
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from core.config import SYMBOL_INDEX_PATH, SYMBOL_MASTER_PATH
+from core.ibkr import ib
+from core.pacing import pacer
+
+# header aliases in common listing files
+COLUMN_ALIASES = {
+    "symbol": ("symbol", "act symbol", "ticker", "nasdaq symbol"),
+    "name": ("name", "security name", "company name", "description"),
+    "secType": ("sectype", "security type", "type"),
+    "exchange": ("exchange", "primary exchange", "listing exchange"),
+}
+
+# ranking: exact symbol, symbol prefix, name word prefix, fuzzy
+EXACT, PREFIX, WORD, FUZZY = range(4)
+
+# IBKR queries that came back empty or failed are asked again after this (s)
+RETRY_EMPTY_SEC = 300
+
+
+def _grams(text, n):
+    padded = f"^{text}$"
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _words(name):
+    return [w for w in "".join(ch if ch.isalnum() else " " for ch in name.upper()).split() if w]
+
+
+class SymbolIndex:
+    """
+    symbol -> {"symbol", "name", "secType", "exchange"} with:
+
+    - prefix lookup on symbols and on name words, by bisect over sorted
+      keys (a flat trie: O(log n + k), no per-node objects)
+    - fuzzy fallback on symbol bigrams / name trigrams, ranked by the
+      share of the query's n-grams a candidate contains
+    - an LRU of recent answers, dropped whenever the index changes, so
+      repeated autocomplete prefixes are a dict lookup
+
+    Entries optionally persist to SQLite so a restart keeps them.
+    """
+
+    def __init__(self, path=None, cache_size=2048):
+        self.entries = {}
+        self.symbols = []
+        # (word, symbol) pairs, sorted
+        self.words = []
+        self.grams = {}
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        # query -> when IBKR may be asked again (inf once it answered with matches)
+        self.fetched = {}
+        self.in_flight = {}
+        self.db = None
+        self.stats = {"local": 0, "remote": 0, "cached": 0}
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+
+            with self.db:
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS symbols "
+                    "(symbol TEXT PRIMARY KEY, name TEXT, sec_type TEXT, exchange TEXT)"
+                )
+
+            self.add(
+                [{"symbol": s, "name": n, "secType": t, "exchange": e}
+                 for s, n, t, e in self.db.execute("SELECT * FROM symbols")],
+                persist=False,
+            )
+
+    def __len__(self):
+        return len(self.entries)
+
+    # --------------------------------------------------
+    # Build
+    # --------------------------------------------------
+    def add(self, items, persist=True):
+        """Insert or update entries; returns how many were new or changed."""
+        changed = []
+        new_symbols, new_words = [], []
+
+        with self.lock:
+            for item in items:
+                symbol = item["symbol"].strip().upper()
+
+                if not symbol:
+                    continue
+
+                old = self.entries.get(symbol) or {}
+
+                # fields a source leaves out keep what another source gave
+                entry = {
+                    "symbol": symbol,
+                    "name": (item.get("name") or old.get("name") or symbol).strip(),
+                    "secType": item.get("secType") or old.get("secType") or "STK",
+                    "exchange": item.get("exchange") or old.get("exchange") or "",
+                }
+
+                if old == entry:
+                    continue
+
+                if not old:
+                    new_symbols.append(symbol)
+                    for g in _grams(symbol, 2):
+                        self.grams.setdefault(g, set()).add(symbol)
+                else:
+                    self._unindex_name(old)
+
+                self.entries[symbol] = entry
+                new_words.extend(self._index_name(entry))
+                changed.append(entry)
+
+            if changed:
+                # timsort merges the appended run: cheap for a few, no insort per row for a file
+                self.symbols.extend(new_symbols)
+                self.symbols.sort()
+                self.words.extend(new_words)
+                self.words.sort()
+                self.cache.clear()
+
+        if persist and changed and self.db is not None:
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO symbols VALUES (?, ?, ?, ?)",
+                    [(e["symbol"], e["name"], e["secType"], e["exchange"]) for e in changed],
+                )
+
+        return len(changed)
+
+    def _index_name(self, entry):
+        words = set(_words(entry["name"]))
+
+        for w in words:
+            for g in _grams(w, 3):
+                self.grams.setdefault(g, set()).add(entry["symbol"])
+
+        return [(w, entry["symbol"]) for w in words]
+
+    def _unindex_name(self, entry):
+        for w in set(_words(entry["name"])):
+            i = bisect.bisect_left(self.words, (w, entry["symbol"]))
+            if i < len(self.words) and self.words[i] == (w, entry["symbol"]):
+                del self.words[i]
+
+            # name trigrams only; symbol bigrams are two characters long
+            for g in _grams(w, 3):
+                self.grams.get(g, set()).discard(entry["symbol"])
+
+    def load_file(self, path):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            header = f.readline()
+            delimiter = "|" if header.count("|") > header.count(",") else ","
+            f.seek(0)
+            reader = csv.DictReader(f, delimiter=delimiter)
+
+            columns = {}
+            for field in reader.fieldnames or ():
+                for key, aliases in COLUMN_ALIASES.items():
+                    if field.strip().lower() in aliases:
+                        columns.setdefault(key, field)
+
+            if "symbol" not in columns:
+                raise ValueError(f"{path}: no symbol column in {reader.fieldnames}")
+
+            items = [
+                {key: (row.get(field) or "").strip() for key, field in columns.items()}
+                for row in reader
+                # nasdaqlisted.txt ends with a "File Creation Time" row
+                if row.get(columns["symbol"]) and not row[columns["symbol"]].startswith("File Creation")
+            ]
+
+        return self.add(items)
+
+    # --------------------------------------------------
+    # Lookup
+    # --------------------------------------------------
+    def _prefixed(self, keys, q, limit):
+        # words holds (word, symbol) tuples: (q,) sorts right before (q, ...)
+        i = bisect.bisect_left(keys, (q,) if keys is self.words else q)
+
+        while i < len(keys) and limit:
+            key = keys[i]
+            text = key[0] if isinstance(key, tuple) else key
+
+            if not text.startswith(q):
+                break
+
+            yield key
+            i += 1
+            limit -= 1
+
+    def _fuzzy(self, q):
+        query = _grams(q, 2) | _grams(q, 3)
+        counts = Counter()
+
+        for g in query:
+            counts.update(self.grams.get(g, ()))
+
+        # share of the query's grams found in the candidate's symbol / name
+        for symbol, n in counts.items():
+            if n >= len(query) / 2:
+                yield n / len(query), symbol
+
+    def search(self, q, limit=15):
+        return self._search(q.strip().upper(), limit)[0]
+
+    def _search(self, q, limit):
+        """(ranked entries, whether any matched other than fuzzily)"""
+        if not q:
+            return [], True
+
+        key = (q, limit)
+
+        with self.lock:
+            hit = self.cache.get(key)
+
+            if hit is not None:
+                self.cache.move_to_end(key)
+                self.stats["cached"] += 1
+                return hit
+
+            ranked = {}
+
+            if q in self.entries:
+                ranked[q] = (EXACT, 0, q)
+
+            # shorter symbols first: "A" before "AA..." for q="A"
+            for symbol in self._prefixed(self.symbols, q, limit * 4):
+                ranked.setdefault(symbol, (PREFIX, len(symbol), symbol))
+
+            for word, symbol in self._prefixed(self.words, q, limit * 4):
+                ranked.setdefault(symbol, (WORD, len(word), symbol))
+
+            if len(ranked) < limit and len(q) >= 2:
+                for score, symbol in self._fuzzy(q):
+                    ranked.setdefault(symbol, (FUZZY, -score, symbol))
+
+            order = sorted(ranked, key=ranked.get)[:limit]
+            out = [self.entries[s] for s in order], bool(order) and ranked[order[0]][0] < FUZZY
+
+            self.cache[key] = out
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+            self.stats["local"] += 1
+
+        return out
+
+    # --------------------------------------------------
+    # IBKR fallback
+    # --------------------------------------------------
+    def is_miss(self, q, limit=15):
+        """Nothing but fuzzy matches locally, and IBKR not asked (or due to be asked again)."""
+        q = q.strip().upper()
+
+        return self.fetched.get(q, 0) <= time.monotonic() and not self._search(q, limit)[1]
+
+    async def lookup(self, q, limit=15):
+        """Local results; IBKR reqMatchingSymbols first on a miss."""
+        q = q.strip().upper()
+
+        if not self.is_miss(q, limit):
+            return self.search(q, limit)
+
+        task = self.in_flight.get(q)
+
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(q))
+            self.in_flight[q] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(q, None))
+
+        await asyncio.shield(task)
+
+        return self.search(q, limit)
+
+    async def _fetch(self, q):
+        await pacer.acquire("market")
+
+        # timeout -> None, request error -> empty: try again later, not never
+        self.fetched[q] = time.monotonic() + RETRY_EMPTY_SEC
+
+        try:
+            matches = await ib.reqMatchingSymbolsAsync(q) or []
+        except Exception as e:
+            print(f"[symbols.py] reqMatchingSymbols {q!r} failed: {e}")
+            return
+
+        self.stats["remote"] += 1
+
+        if matches:
+            self.fetched[q] = float("inf")
+
+        self.add(
+            {
+                "symbol": m.contract.symbol,
+                "name": getattr(m.contract, "description", "") or m.contract.symbol,
+                "secType": m.contract.secType,
+                "exchange": m.contract.primaryExchange or m.contract.exchange,
+            }
+            for m in matches
+            if m.contract.secType == "STK"
+        )
+
+    def status(self):
+        return {**self.stats, "symbols": len(self.entries), "cachedQueries": len(self.cache)}
+
+
+_symbol_index = None
+
+
+def get_symbol_index():
+    # opened on first use: importing this module must not create the SQLite file
+    global _symbol_index
+
+    if _symbol_index is None:
+        _symbol_index = SymbolIndex(SYMBOL_INDEX_PATH)
+
+        if SYMBOL_MASTER_PATH and os.path.exists(SYMBOL_MASTER_PATH):
+            print(f"[symbols.py] {_symbol_index.load_file(SYMBOL_MASTER_PATH)} symbols from {SYMBOL_MASTER_PATH}")
+
+    return _symbol_index
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="local symbol index")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    i = sub.add_parser("import")
+    i.add_argument("path", help="CSV or pipe-delimited listing file")
+
+    s = sub.add_parser("search")
+    s.add_argument("q")
+
+    args = p.parse_args(argv)
+    symbol_index = get_symbol_index()
+
+    if args.cmd == "import":
+        n = symbol_index.load_file(args.path)
+        print(f"[symbols.py] {n} new or changed, {len(symbol_index)} symbols in {SYMBOL_INDEX_PATH}")
+    else:
+        for e in symbol_index.search(args.q):
+            print(f"{e['symbol']:<8} {e['exchange']:<8} {e['name']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
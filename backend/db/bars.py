@@ -0,0 +1,177 @@
+# backend/db/bars.py
+
+import asyncio
+from datetime import datetime, timezone
+from itertools import chain
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, ProgrammingError
+
+from core.candle_buffer import COLUMNS
+from db.database import engine
+from db.models import Bar, QuoteSnapshot, StrategySignal
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+# months (partition names) already known to exist in this process
+_partitions = set()
+_partition_lock = asyncio.Lock()
+
+
+# --------------------------------------------------
+# Partitions (Postgres only)
+# --------------------------------------------------
+def _month_start(ts):
+    d = datetime.fromtimestamp(ts, timezone.utc)
+    return datetime(d.year, d.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(d):
+    return datetime(d.year + d.month // 12, d.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+async def ensure_partitions(conn, start_ts, end_ts):
+    """
+    One bars_yYYYYmMM partition per calendar month covering [start_ts, end_ts].
+    Rows outside every partition land in bars_default.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+
+    missing = []
+    month = _month_start(start_ts)
+
+    while month.timestamp() <= end_ts:
+        following = _next_month(month)
+        name = f"bars_y{month.year}m{month.month:02d}"
+
+        if name not in _partitions:
+            missing.append((name, int(month.timestamp()), int(following.timestamp())))
+
+        month = following
+
+    if not missing:
+        return
+
+    # concurrent saves of the same month would both try to create it
+    async with _partition_lock:
+        for name, start, end in missing:
+            if name in _partitions:
+                continue
+
+            try:
+                # savepoint: losing a race with another process must not abort the upsert
+                async with conn.begin_nested():
+                    await conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF bars FOR VALUES FROM ({start}) TO ({end})"
+                    ))
+            except (IntegrityError, ProgrammingError) as e:
+                # duplicate table / type: created concurrently elsewhere
+                print(f"[bars.py] partition {name} already being created: {e.orig}")
+
+            _partitions.add(name)
+
+
+async def init_timeseries(conn):
+    """
+    Startup: default partition and the (symbol, time) indexes that
+    create_all skips on tables created before they were declared.
+    """
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS bars_default PARTITION OF bars DEFAULT"))
+
+    def create_indexes(sync_conn):
+        for model in (QuoteSnapshot, StrategySignal, Bar):
+            for index in model.__table__.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+    await conn.run_sync(create_indexes)
+
+
+# --------------------------------------------------
+# Write
+# --------------------------------------------------
+def _insert(conn):
+    if conn.dialect.name == "postgresql":
+        return postgresql.insert(Bar.__table__)
+
+    return sqlite.insert(Bar.__table__)
+
+
+async def upsert_bars(conn, con_id, symbol, bar_size, rows):
+    """
+    Insert or overwrite bars; rows are (ts, open, high, low, close, volume)
+    as returned by BarCache.get_bars.
+    """
+    if not rows:
+        return 0
+
+    await ensure_partitions(conn, min(r[0] for r in rows), max(r[0] for r in rows))
+
+    stmt = _insert(conn)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["con_id", "bar_size", "ts"],
+        set_={name: stmt.excluded[name] for name in OHLCV},
+    )
+
+    await conn.execute(stmt, [
+        {"con_id": con_id, "bar_size": bar_size, "ts": ts, "symbol": symbol,
+         "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for ts, o, h, l, c, v in rows
+    ])
+
+    return len(rows)
+
+
+async def save_bars(con_id, symbol, bar_size, rows):
+    """Background upsert of freshly fetched bars; failures are only logged."""
+    try:
+        async with engine.begin() as conn:
+            await upsert_bars(conn, con_id, symbol, bar_size, rows)
+    except Exception as e:
+        print(f"[bars.py] saving {len(rows)} {symbol} {bar_size} bars failed: {e}")
+
+
+# --------------------------------------------------
+# Read
+# --------------------------------------------------
+async def read_bars(conn, bar_size, start=None, end=None, con_id=None, symbol=None):
+    """
+    (ts, open, high, low, close, volume) rows with start <= ts < end,
+    oldest first, looked up by con_id (primary key) or symbol.
+    """
+    t = Bar.__table__
+    query = select(t.c.ts, *(t.c[name] for name in OHLCV)).where(t.c.bar_size == bar_size)
+
+    if con_id is not None:
+        query = query.where(t.c.con_id == con_id)
+    else:
+        query = query.where(t.c.symbol == symbol.upper())
+
+    if start is not None:
+        query = query.where(t.c.ts >= start)
+
+    if end is not None:
+        query = query.where(t.c.ts < end)
+
+    result = await conn.execute(query.order_by(t.c.ts))
+
+    return result.all()
+
+
+async def load_bars(bar_size, start=None, end=None, con_id=None, symbol=None):
+    async with engine.connect() as conn:
+        return await read_bars(conn, bar_size, start, end, con_id, symbol)
+
+
+def to_columns(rows):
+    """Rows -> backtester / CandleBuffer column arrays."""
+    # fromiter over the flattened rows: np.array() on Row objects is ~10x slower
+    data = np.fromiter(chain.from_iterable(rows), np.float64, len(rows) * len(COLUMNS)).reshape(-1, len(COLUMNS))
+
+    return {
+        name: data[:, i].astype(np.int64) if name == "time" else np.ascontiguousarray(data[:, i])
+        for i, name in enumerate(COLUMNS)
+    }
@@ -1,6 +1,6 @@
 # backend/app/db/models.py
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Text, ForeignKey, Index
 from datetime import datetime
 from .database import Base
 
@@ -76,7 +76,9 @@ class HistoricalRequestLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String, nullable=False)
     timeframe = Column(String, nullable=False)
+    duration = Column(String, nullable=True)
     bars_requested = Column(Integer, nullable=True)
+    source = Column(String, nullable=True)   # cache / partial / ibkr
     requested_at = Column(DateTime, default=datetime.utcnow)
 
 
@@ -86,6 +88,9 @@ class HistoricalRequestLog(Base):
 # =========================================================
 class QuoteSnapshot(Base):
     __tablename__ = "quote_snapshots"
+    __table_args__ = (
+        Index("ix_quote_snapshots_symbol_timestamp", "symbol", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String, nullable=False)
@@ -114,6 +119,9 @@ class Watchlist(Base):
 # =========================================================
 class StrategySignal(Base):
     __tablename__ = "strategy_signals"
+    __table_args__ = (
+        Index("ix_strategy_signals_symbol_created_at", "symbol", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String, nullable=False)
@@ -134,4 +142,32 @@ class AuditLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     event_type = Column(String, nullable=False)
     message = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# =========================================================
+# 10. BARS TABLE
+# OHLCV bars, one row per (contract, bar size, bar start)
+# one series per contract: TRADES (stocks) / MIDPOINT (forex), extended hours
+# Postgres: range-partitioned by month on ts (see db/bars.py)
+# =========================================================
+class Bar(Base):
+    __tablename__ = "bars"
+    __table_args__ = (
+        Index("ix_bars_symbol_bar_size_ts", "symbol", "bar_size", "ts"),
+        {
+            "postgresql_partition_by": "RANGE (ts)",
+            # SQLite: store rows clustered by the primary key
+            "sqlite_with_rowid": False,
+        },
+    )
+
+    con_id = Column(Integer, primary_key=True)
+    bar_size = Column(String, primary_key=True)     # IBKR barSizeSetting, e.g. "1 min"
+    ts = Column(BigInteger, primary_key=True)       # bar start, epoch seconds
+    symbol = Column(String, nullable=False)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
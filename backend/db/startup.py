@@ -1,5 +1,34 @@
 import asyncio
+from sqlalchemy import inspect, text
+
 from db.database import engine, Base
+from db.models import HistoricalRequestLog
+
+# columns added to tables that already existed; create_all never alters
+# an existing table, so they are added here on startup
+ADDED_COLUMNS = {
+    HistoricalRequestLog: ("duration", "source"),
+}
+
+
+async def add_columns(conn):
+    def existing(sync_conn, table):
+        return {c["name"] for c in inspect(sync_conn).get_columns(table)}
+
+    # IF NOT EXISTS: several workers may start at once (SQLite has no such clause)
+    clause = "IF NOT EXISTS " if conn.dialect.name == "postgresql" else ""
+
+    for model, names in ADDED_COLUMNS.items():
+        table = model.__table__
+        present = await conn.run_sync(existing, table.name)
+
+        for name in names:
+            if name in present:
+                continue
+
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            await conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {clause}{name} {column_type}"))
+            print(f"[DB] added column {table.name}.{name}")
 
 
 async def init_db():
@@ -7,6 +36,7 @@ async def init_db():
         try:
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await add_columns(conn)
 
             print("[DB] connected + tables created")
             return
@@ -15,4 +45,4 @@ async def init_db():
             print(f"[DB] retry {i}: {e}")
             await asyncio.sleep(2)
 
-    raise RuntimeError("DB init failed")
\ No newline at end of file
+    raise RuntimeError("DB init failed")
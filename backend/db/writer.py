@@ -0,0 +1,192 @@
+# backend/db/writer.py
+
+import asyncio
+import time
+from collections import deque
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+from core.config import DB_WRITER_BATCH, DB_WRITER_INTERVAL_MS, DB_WRITER_MAX_QUEUE
+from core.metrics import Gauge, db_batch_rows, db_flush_seconds
+from db.database import engine
+
+
+class BatchWriter:
+    """
+    Write-behind inserts for high-rate rows (signals, quotes, audit log).
+
+    write() only appends to an in-memory queue and never awaits, so the
+    strategy loop and request handlers are not held up by the database.
+    run() flushes every batch_size rows or interval_ms, whichever comes
+    first, as one executemany INSERT per table (SQLAlchemy batches it into
+    multi-row VALUES; rows of one model must carry the same keys). Each
+    table gets its own transaction, and a table whose insert fails is
+    retried row by row, so a bad row only loses itself.
+
+    The queue is bounded: past max_queue rows new rows are dropped and
+    counted. Python-side column defaults (created_at / timestamp) are
+    filled in at write() time so rows carry the event time, not the
+    flush time.
+    """
+
+    def __init__(self, engine, batch_size=500, interval_ms=250, max_queue=100_000):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.interval = interval_ms / 1000
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.defaults = {}
+        # tables whose duplicate keys are skipped instead of failing the batch
+        self.ignore_conflicts = set()
+        # table -> columns overwritten when the primary key already exists
+        self.update_on_conflict = {}
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+        self.stats = {"written": 0, "dropped": 0, "failed": 0, "flushes": 0, "lastFlushMs": 0.0}
+
+    def _defaults(self, table):
+        if table not in self.defaults:
+            self.defaults[table] = [
+                (c.name, c.default.arg)
+                for c in table.columns
+                if c.default is not None and c.default.is_callable
+            ]
+
+        return self.defaults[table]
+
+    def write(self, model, row: dict):
+        if len(self.queue) >= self.max_queue:
+            self.stats["dropped"] += 1
+            return False
+
+        table = model.__table__
+
+        for name, default in self._defaults(table):
+            if name not in row:
+                row[name] = default(None)
+
+        self.queue.append((table, row))
+
+        if len(self.queue) >= self.batch_size:
+            self._wakeup.set()
+
+        return True
+
+    # --------------------------------------------------
+    # Flushing
+    # --------------------------------------------------
+    async def flush(self):
+        async with self._lock:
+            while self.queue:
+                n = min(len(self.queue), self.batch_size)
+                batch = [self.queue.popleft() for _ in range(n)]
+
+                by_table = {}
+                for table, row in batch:
+                    by_table.setdefault(table, []).append(row)
+
+                started = time.perf_counter()
+                written = 0
+
+                # parents before children (foreign keys)
+                for table in sorted(by_table, key=lambda t: t.metadata.sorted_tables.index(t)):
+                    written += await self._flush_table(table, by_table[table])
+
+                elapsed = time.perf_counter() - started
+                self.stats["written"] += written
+                self.stats["failed"] += n - written
+                self.stats["flushes"] += 1
+                self.stats["lastFlushMs"] = round(elapsed * 1000, 2)
+                db_batch_rows.observe(n)
+                db_flush_seconds.observe(elapsed)
+
+    async def _flush_table(self, table, rows):
+        """Insert rows in one transaction; returns how many were written."""
+        merged = 0
+
+        if table in self.update_on_conflict:
+            # last row per key: one multi-row upsert can't touch a row twice
+            keys = [c.name for c in table.primary_key]
+            unique = list({tuple(r[k] for k in keys): r for r in rows}.values())
+            merged, rows = len(rows) - len(unique), unique
+
+        try:
+            await self._execute(table, rows)
+            return merged + len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                print(f"[writer.py] {table.name} row dropped: {e}")
+                return 0
+
+            print(f"[writer.py] flush of {len(rows)} {table.name} rows failed, retrying one by one: {e}")
+
+        written = 0
+        error = None
+
+        for row in rows:
+            try:
+                await self._execute(table, [row])
+                written += 1
+            except Exception as e:
+                error = e
+
+        if error is not None:
+            print(f"[writer.py] {len(rows) - written} {table.name} rows dropped: {error}")
+
+        return merged + written
+
+    async def _execute(self, table, rows):
+        async with self.engine.begin() as conn:
+            await conn.execute(self._insert(table), rows)
+
+    def _insert(self, table):
+        update = self.update_on_conflict.get(table)
+
+        if table not in self.ignore_conflicts and not update:
+            return insert(table)
+
+        dialect = self.engine.dialect.name
+
+        if dialect == "postgresql":
+            stmt = postgresql.insert(table)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(table)
+        else:
+            return insert(table)
+
+        if update:
+            return stmt.on_conflict_do_update(
+                index_elements=[c.name for c in table.primary_key],
+                set_={name: stmt.excluded[name] for name in update},
+            )
+
+        return stmt.on_conflict_do_nothing()
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush()
+
+    async def close(self):
+        """Flush whatever is still queued (shutdown)."""
+        await self.flush()
+
+        if self.queue:
+            print(f"[writer.py] {len(self.queue)} rows not written at shutdown")
+
+    def status(self):
+        return {**self.stats, "queued": len(self.queue)}
+
+
+db_writer = BatchWriter(engine, DB_WRITER_BATCH, DB_WRITER_INTERVAL_MS, DB_WRITER_MAX_QUEUE)
+
+Gauge("db_writer_queue_rows", "rows waiting for the next flush", fn=lambda: len(db_writer.queue))
+Gauge("db_writer_rows_total", "write-behind rows by outcome", ("outcome",), kind="counter",
+      fn=lambda: {(k,): db_writer.stats[k] for k in ("written", "dropped", "failed")})
@@ -1,6 +1,9 @@
 # backend/ibkr_client.py
 
 from ib_insync import IB, Stock, Forex
+from core.contracts import contract_resolver
+from services.bar_cache import bar_ts
+from backtest.archive import archive_rows
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 import math
@@ -24,6 +27,8 @@ class IBKRClient:
         self.host = host
         self.port = port
         self.client_id = client_id
+        # streaming tickers kept alive between snapshots
+        self.tickers = {}
 
     # --------------------------------------------------
     # Connection
@@ -41,6 +46,11 @@ class IBKRClient:
     def disconnect(self):
         if self.ib.isConnected():
             print("[ibkr_client] Disconnecting...")
+
+            for ticker in self.tickers.values():
+                self.ib.cancelMktData(ticker.contract)
+
+            self.tickers.clear()
             self.ib.disconnect()
 
     # --------------------------------------------------
@@ -66,13 +76,18 @@ class IBKRClient:
 
         self.connect()
 
-        contract = self.resolve_contract(symbol)
-        self.ib.qualifyContracts(contract)
+        ticker = self.tickers.get(symbol)
 
-        ticker = self.ib.reqMktData(contract)
+        if ticker is None:
+            contract = contract_resolver.resolve_sync(self.resolve_contract(symbol), self.ib)
+            ticker = self.ib.reqMktData(contract)
+            self.tickers[symbol] = ticker
 
-        # Wait for delayed data
-        self.ib.sleep(2)
+            # Wait for the first (delayed) tick, at most 2s
+            for _ in range(20):
+                if ticker.time:
+                    break
+                self.ib.sleep(0.1)
 
         def safe(v):
             return None if (v is None or isinstance(v, float) and math.isnan(v)) else v
@@ -87,10 +102,14 @@ class IBKRClient:
 
         print("[ibkr_client] Snapshot:", result)
 
-        self.ib.cancelMktData(contract)
-
         return result
 
+    def unsubscribe(self, symbol: str):
+        ticker = self.tickers.pop(symbol, None)
+
+        if ticker is not None:
+            self.ib.cancelMktData(ticker.contract)
+
     # --------------------------------------------------
     # Historical Data
     # --------------------------------------------------
@@ -100,12 +119,12 @@ class IBKRClient:
         duration: str = "1 D",
         bar_size: str = "5 mins",
         what_to_show: str = "TRADES",
+        archive: bool = True,
     ) -> List[Dict]:
 
         self.connect()
 
-        contract = self.resolve_contract(symbol)
-        self.ib.qualifyContracts(contract)
+        contract = contract_resolver.resolve_sync(self.resolve_contract(symbol), self.ib)
 
         bars = self.ib.reqHistoricalData(
             contract,
@@ -134,6 +153,12 @@ class IBKRClient:
 
         print(f"[ibkr_client] Retrieved {len(result)} bars")
 
+        if archive:
+            archive_rows(symbol, bar_size, [
+                (bar_ts(bar.date), bar.open, bar.high, bar.low, bar.close, bar.volume)
+                for bar in bars
+            ], what_to_show=what_to_show, use_rth=False)
+
         return result
 
 
@@ -1,10 +1,9 @@
 # backend/indicators/fibonacci.py
 
-def fib_levels(high, low):
+FIB_RATIOS = (0.382, 0.5, 0.618)
+
+
+def fib_levels(high, low, ratios=FIB_RATIOS):
     diff = high - low
 
-    return {
-        "0.382": high - diff * 0.382,
-        "0.5": high - diff * 0.5,
-        "0.618": high - diff * 0.618,
-    }
\ No newline at end of file
+    return {f"{r:g}": high - diff * r for r in ratios}
@@ -1,16 +1,23 @@
 # backend/indicators/fractals.py
 
-def detect_fractals(candles):
+from collections import deque, namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def detect_fractals(candles, width=5):
     fractals = []
+    k = width // 2
 
-    if len(candles) < 5:
+    if len(candles) < width:
         return fractals
 
-    for i in range(2, len(candles) - 2):
+    for i in range(k, len(candles) - k):
         c = candles[i]
 
-        highs = [candles[j]["high"] for j in range(i - 2, i + 3)]
-        lows = [candles[j]["low"] for j in range(i - 2, i + 3)]
+        highs = [candles[j]["high"] for j in range(i - k, i + k + 1)]
+        lows = [candles[j]["low"] for j in range(i - k, i + k + 1)]
 
         if c["high"] == max(highs):
             fractals.append({
@@ -26,4 +33,176 @@ def detect_fractals(candles):
                 "price": c["low"]
             })
 
-    return fractals
\ No newline at end of file
+    return fractals
+
+
+HIGH = 1
+LOW = -1
+
+# Compact detector output, ordered by bar (a high before a low on the same bar).
+# index: bar index, kind: HIGH / LOW, price: high or low of that bar.
+# last_high / last_low: position of the newest high / low in these arrays (-1 if none).
+Fractals = namedtuple("Fractals", ["index", "kind", "price", "last_high", "last_low"])
+
+
+def detect_fractals_np(high, low, width=5, since=0):
+    """
+    Vectorized detect_fractals over high / low arrays.
+
+    width is the (odd) number of bars in the window, 5 for the Bill
+    Williams fractal. With since > 0 only the bars whose window contains
+    a bar at index >= since are checked (incremental mode: pass the
+    index of the first new bar).
+    """
+    _check_width(width)
+
+    high = np.asarray(high)
+    low = np.asarray(low)
+    k = width // 2
+    start = max(k, since - k)
+    n = len(high)
+
+    if n - k <= start:
+        empty = np.empty(0, dtype=np.intp)
+        return Fractals(empty, empty.astype(np.int8), empty.astype(np.float64), -1, -1)
+
+    win_high = sliding_window_view(high[start - k:], width).max(axis=1)
+    win_low = sliding_window_view(low[start - k:], width).min(axis=1)
+
+    high_idx = np.flatnonzero(high[start:n - k] == win_high) + start
+    low_idx = np.flatnonzero(low[start:n - k] == win_low) + start
+
+    index = np.concatenate([high_idx, low_idx])
+    kind = np.concatenate([
+        np.full(len(high_idx), HIGH, dtype=np.int8),
+        np.full(len(low_idx), LOW, dtype=np.int8),
+    ])
+
+    order = np.lexsort((-kind, index))
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+
+    index = index[order]
+    kind = kind[order]
+    price = np.where(kind == HIGH, high[index], low[index]).astype(np.float64)
+
+    return Fractals(
+        index,
+        kind,
+        price,
+        int(position[len(high_idx) - 1]) if len(high_idx) else -1,
+        int(position[-1]) if len(low_idx) else -1,
+    )
+
+
+def _check_width(width):
+    if width < 3 or width % 2 == 0:
+        raise ValueError(f"fractal width must be an odd number >= 3, got {width}")
+
+
+class StreamingFractals:
+    """
+    Incremental fractal detector (5-bar Bill Williams by default).
+
+    Sliding window max / min are kept in monotonic deques, so each new
+    candle only checks the one bar it confirms (width // 2 bars back)
+    in amortized O(1), whatever the width. The newest high and low
+    fractals are kept as attributes for O(1) lookups.
+    """
+
+    def __init__(self, width=5, keep=10):
+        _check_width(width)
+
+        self.width = width
+        self.window = deque(maxlen=width)
+        self.recent = deque(maxlen=keep)
+        self.count = 0
+        self.last_high = None
+        self.last_low = None
+        self._seq = 0
+        self._max = deque()
+        self._min = deque()
+
+    def _push(self, candle):
+        seq = self._seq
+        self._seq += 1
+        self.window.append(candle)
+
+        # strict comparison keeps equal values, so ties still count as fractals
+        while self._max and self._max[-1][1] < candle["high"]:
+            self._max.pop()
+        self._max.append((seq, candle["high"]))
+
+        while self._min and self._min[-1][1] > candle["low"]:
+            self._min.pop()
+        self._min.append((seq, candle["low"]))
+
+        if self._max[0][0] <= seq - self.width:
+            self._max.popleft()
+
+        if self._min[0][0] <= seq - self.width:
+            self._min.popleft()
+
+    def update(self, candle):
+        self._push(candle)
+
+        if len(self.window) < self.width:
+            return []
+
+        c = self.window[self.width // 2]
+        found = []
+
+        if c["high"] == self._max[0][1]:
+            f = {"type": "high", "time": c["time"], "price": c["high"]}
+            self.last_high = f
+            found.append(f)
+
+        if c["low"] == self._min[0][1]:
+            f = {"type": "low", "time": c["time"], "price": c["low"]}
+            self.last_low = f
+            found.append(f)
+
+        self.recent.extend(found)
+        self.count += len(found)
+
+        return found
+
+    def seed(self, time, high, low, window):
+        """
+        Rebuild state from arrays (see detect_fractals_np);
+        window holds the last candles as dicts.
+        """
+        fr = detect_fractals_np(high, low, self.width)
+
+        self.window.clear()
+        self._max.clear()
+        self._min.clear()
+        self._seq = 0
+
+        for candle in window[-self.width:]:
+            self._push(candle)
+
+        self.recent.clear()
+        self.count = len(fr.index)
+
+        for i, kind, price in zip(
+            fr.index[-self.recent.maxlen:],
+            fr.kind[-self.recent.maxlen:],
+            fr.price[-self.recent.maxlen:],
+        ):
+            self.recent.append(_as_dict(time, i, kind, price))
+
+        self.last_high = _as_dict(time, fr.index[fr.last_high], HIGH, fr.price[fr.last_high]) if fr.last_high >= 0 else None
+        self.last_low = _as_dict(time, fr.index[fr.last_low], LOW, fr.price[fr.last_low]) if fr.last_low >= 0 else None
+
+    @property
+    def last(self):
+        return self.recent[-1] if self.recent else None
+
+
+def _as_dict(time, i, kind, price):
+    return {
+        "type": "high" if kind == HIGH else "low",
+        "time": int(time[i]),
+        "price": float(price),
+    }
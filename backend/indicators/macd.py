@@ -1,5 +1,13 @@
 # backend/indicators/macd.py
 
+from functools import lru_cache
+
+import numpy as np
+
+# above this window macd_np runs the blockwise EMAs instead of a cached dot product
+MACD_WEIGHTS_MAX_BARS = 1000
+
+
 def ema(values, period):
     alpha = 2 / (period + 1)
     ema_vals = [values[0]]
@@ -10,11 +18,144 @@ def ema(values, period):
     return ema_vals
 
 
-def macd(closes):
-    ema12 = ema(closes, 12)
-    ema26 = ema(closes, 26)
+def macd(closes, fast=12, slow=26, signal=9):
+    ema_fast = ema(closes, fast)
+    ema_slow = ema(closes, slow)
+
+    macd_line = [a - b for a, b in zip(ema_fast[-len(ema_slow):], ema_slow)]
+    signal_line = ema(macd_line, signal)
+
+    return macd_line[-1], signal_line[-1]
+
+
+class StreamingEMA:
+    """
+    Same recurrence as ema(), one value at a time.
+    """
+
+    def __init__(self, period):
+        self.alpha = 2 / (period + 1)
+        self.value = None
+
+    def update(self, v):
+        if self.value is None:
+            self.value = v
+        else:
+            self.value = self.alpha * v + (1 - self.alpha) * self.value
+
+        return self.value
+
+    def preview(self, v):
+        # value update() would produce, without committing it
+        if self.value is None:
+            return v
+
+        return self.alpha * v + (1 - self.alpha) * self.value
+
+
+class StreamingMACD:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.periods = (fast, slow, signal)
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    def seed(self, closes):
+        if not len(closes):
+            return
+
+        fast, slow, signal = self.periods
+
+        ema_fast = ema_np(closes, fast)
+        ema_slow = ema_np(closes, slow)
+        signal_line = ema_np(ema_fast - ema_slow, signal)
+
+        self.fast.value = float(ema_fast[-1])
+        self.slow.value = float(ema_slow[-1])
+        self.signal.value = float(signal_line[-1])
+
+    def update(self, close):
+        macd_val = self.fast.update(close) - self.slow.update(close)
+        signal_val = self.signal.update(macd_val)
+
+        return macd_val, signal_val
+
+    def preview(self, close):
+        macd_val = self.fast.preview(close) - self.slow.preview(close)
+
+        return macd_val, self.signal.preview(macd_val)
+
+    @property
+    def value(self):
+        if self.signal.value is None:
+            return None, None
+
+        return self.fast.value - self.slow.value, self.signal.value
+
+
+def ema_np(values, period):
+    """
+    Vectorized ema() along the last axis: same seed (values[0]) and
+    recurrence.
+
+    The recurrence is solved in blocks as a scaled cumulative sum;
+    the block length keeps decay ** -block below ~1e15 so the scaling
+    never costs precision.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(x)
+    n = x.shape[-1]
+
+    if not n:
+        return out
+
+    alpha = 2 / (period + 1)
+    decay = 1 - alpha
+
+    if decay <= 0:
+        out[...] = x
+        return out
+
+    block = max(1, int(-34.5 / np.log(decay)))
+    powers = decay ** np.arange(1, block + 1)
+
+    out[..., 0] = x[..., 0]
+    i = 1
+
+    while i < n:
+        m = min(block, n - i)
+        p = powers[:m]
+        prev = out[..., i - 1:i]
+
+        out[..., i:i + m] = p * (prev + alpha * np.cumsum(x[..., i:i + m] / p, axis=-1))
+        i += m
+
+    return out
+
+
+def macd_series_np(closes, fast=12, slow=26, signal=9):
+    macd_line = ema_np(closes, fast) - ema_np(closes, slow)
+    signal_line = ema_np(macd_line, signal)
+
+    return macd_line, signal_line
+
+
+@lru_cache(maxsize=8)
+def _macd_weights(n, fast, slow, signal):
+    # macd_line[-1] and signal[-1] are linear in the closes; their weights
+    # are the last column of the impulse responses to each close.
+    macd_line, signal_line = macd_series_np(np.eye(n), fast, slow, signal)
+
+    return np.ascontiguousarray(macd_line[:, -1]), np.ascontiguousarray(signal_line[:, -1])
+
+
+def macd_np(closes, fast=12, slow=26, signal=9):
+    closes = np.asarray(closes, dtype=np.float64)
+
+    if len(closes) > MACD_WEIGHTS_MAX_BARS:
+        macd_line, signal_line = macd_series_np(closes, fast, slow, signal)
+        return float(macd_line[-1]), float(signal_line[-1])
 
-    macd_line = [a - b for a, b in zip(ema12[-len(ema26):], ema26)]
-    signal = ema(macd_line, 9)
+    w_line, w_signal = _macd_weights(len(closes), fast, slow, signal)
 
-    return macd_line[-1], signal[-1]
\ No newline at end of file
+    return float(closes @ w_line), float(closes @ w_signal)
@@ -1,5 +1,8 @@
 # backend/indicators/vwap.py
 
+import numpy as np
+
+
 def anchored_vwap(candles, anchor_time):
     filtered = [c for c in candles if c["time"] >= anchor_time]
 
@@ -9,4 +12,96 @@ def anchored_vwap(candles, anchor_time):
     if vol == 0:
         return None
 
-    return pv / vol
\ No newline at end of file
+    return pv / vol
+
+
+class StreamingAnchoredVWAP:
+    """
+    Running PV / V sums since the current anchor.
+    """
+
+    def __init__(self):
+        self.anchor_time = None
+        self.pv = 0.0
+        self.vol = 0.0
+
+    def reanchor(self, anchor_time, candles):
+        # candles only needs to cover the bars from the anchor onwards
+        self.anchor_time = anchor_time
+        self.pv = 0.0
+        self.vol = 0.0
+
+        for c in candles:
+            if c["time"] >= anchor_time:
+                self.pv += c["close"] * c["volume"]
+                self.vol += c["volume"]
+
+    def seed(self, anchor_time, time, close, volume):
+        start = np.searchsorted(time, anchor_time, side="left")
+
+        self.anchor_time = anchor_time
+        self.pv = float(np.dot(close[start:], volume[start:]))
+        self.vol = float(volume[start:].sum())
+
+    def update(self, candle):
+        if self.anchor_time is None:
+            return
+
+        self.pv += candle["close"] * candle["volume"]
+        self.vol += candle["volume"]
+
+    def preview(self, candle):
+        # value including a not yet closed candle
+        if self.anchor_time is None:
+            return self.value
+
+        vol = self.vol + candle["volume"]
+
+        if vol == 0:
+            return None
+
+        return (self.pv + candle["close"] * candle["volume"]) / vol
+
+    @property
+    def value(self):
+        if self.vol == 0:
+            return None
+
+        return self.pv / self.vol
+
+
+def anchored_vwap_np(time, close, volume, anchor_time):
+    """
+    Vectorized anchored_vwap; time must be ascending.
+    """
+    start = np.searchsorted(time, anchor_time, side="left")
+    v = volume[start:]
+
+    vol = v.sum()
+
+    if vol == 0:
+        return None
+
+    return float(close[start:] @ v / vol)
+
+
+def anchored_vwap_series_np(close, volume, anchor_idx):
+    """
+    Anchored VWAP for every bar, anchor_idx[t] being the anchor bar in
+    force at t (-1: no anchor yet -> nan).
+    """
+    cum_pv = np.concatenate([[0.0], np.cumsum(close * volume)])
+    cum_v = np.concatenate([[0.0], np.cumsum(volume, dtype=np.float64)])
+
+    t = np.arange(len(close))
+    start = np.maximum(anchor_idx, 0)
+
+    pv = cum_pv[t + 1] - cum_pv[start]
+    vol = cum_v[t + 1] - cum_v[start]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = pv / vol
+
+    out[(anchor_idx < 0) | (vol == 0)] = np.nan
+
+    return out
@@ -2,19 +2,27 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
 import asyncio
+import time
 
 # ------------------------------
 # DATABASE
 # ------------------------------
-from db.database import engine, Base
+from db.database import engine, Base, AsyncSessionLocal
+from db.models import Watchlist, QuoteSnapshot, StrategySignal
+from db.writer import db_writer
+from db.bars import init_timeseries, to_columns
+from db.startup import add_columns
 
 # ------------------------------
 # API ROUTERS
 # ------------------------------
 from api.routes_trade import router as trade_router
-from api.routes_market import router as market_router
+from api.routes_market import router as market_router, fetch_history
 from api.routes_account import router as account_router
+from api.routes_backtest import router as backtest_router
 
 # ------------------------------
 # WEBSOCKET ROUTERS
@@ -24,11 +32,23 @@ from ws.indicators import (
     router as ws_indicator_router,
     broadcast_indicator,
 )
+from ws.tick_ws import router as ws_tick_router, manager as tick_manager
+from ws.orders_ws import router as ws_orders_router
+from ws.portfolio_ws import router as ws_portfolio_router
 
 # ------------------------------
 # STRATEGY ENGINE
 # ------------------------------
 from strategy_engine import StrategyEngine
+from services.strategy_runner import StrategyRunner
+from services.bar_aggregator import BarAggregator, TIMEFRAME_SECONDS
+from services.market_data import market_data
+from services.tick_feed import TickFeed
+from services.portfolio import portfolio
+from core.ibkr import ib, ensure_connected
+from core.serialize import FastJSONResponse
+from core.metrics import MetricsMiddleware, registry
+from schemas.trade import HistoryReq
 
 
 # =====================================================
@@ -37,7 +57,8 @@ from strategy_engine import StrategyEngine
 app = FastAPI(
     title="ALGO_V4 Strategy Backend",
     description="Real-time MTF Fractal VWAP + MACD + Fibonacci Trading Engine",
-    version="4.0.0"
+    version="4.0.0",
+    default_response_class=FastJSONResponse,
 )
 
 
@@ -47,6 +68,50 @@ app = FastAPI(
 strategy_engine = StrategyEngine()
 
 
+async def broadcast_result(result):
+    # per-result timing is in /metrics (strategy_cycle_seconds / strategy_lag_seconds)
+    await broadcast_indicator(result)
+
+    record_signal(result)
+
+
+def _fmt(v):
+    # anchored VWAP is None while the anchor has no volume (tick-built forex bars)
+    return "n/a" if v is None else f"{v:.4f}"
+
+
+# closed-bar trend flips -> strategy_signals (write-behind, never awaits the DB)
+def record_signal(result):
+    for cross in result["crosses"]:
+        db_writer.write(StrategySignal, {
+            "symbol": result["symbol"],
+            "timeframe": result["timeframe"],
+            "signal_type": "BUY" if cross["trend"] == "bullish" else "SELL",
+            "price": cross["price"],
+            "reason": f"MACD {_fmt(cross['macd'])} crossed signal {_fmt(cross['signal'])}, VWAP {_fmt(cross['anchor_vwap'])}",
+        })
+
+
+def record_quote(tick):
+    db_writer.write(QuoteSnapshot, {
+        "symbol": tick["symbol"],
+        "bid": tick["bid"],
+        "ask": tick["ask"],
+        "last": tick["last"],
+        "volume": tick["volume"],
+    })
+
+
+strategy_runner = StrategyRunner(strategy_engine, broadcast_result)
+
+# one tick stream -> 1m / 5m / 15m / 1h bars for the engine
+bar_aggregator = BarAggregator(strategy_engine)
+ib.pendingTickersEvent += bar_aggregator.on_pending_tickers
+
+# same streaming tickers -> /ws/stream and /ws/ticks clients
+tick_feed = TickFeed(market_data, tick_manager, record=record_quote)
+
+
 # =====================================================
 # CORS CONFIG
 # =====================================================
@@ -58,6 +123,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# REST latency per route template -> /metrics
+app.add_middleware(MetricsMiddleware)
+
 
 # =====================================================
 # REGISTER REST ROUTERS
@@ -65,6 +133,7 @@ app.add_middleware(
 app.include_router(trade_router)
 app.include_router(market_router)
 app.include_router(account_router)
+app.include_router(backtest_router)
 
 
 # =====================================================
@@ -72,37 +141,81 @@ app.include_router(account_router)
 # =====================================================
 app.include_router(ws_test_router)
 app.include_router(ws_indicator_router)
+app.include_router(ws_tick_router)
+app.include_router(ws_orders_router)
+app.include_router(ws_portfolio_router)
 
 
 # =====================================================
-# BACKGROUND STRATEGY LOOP
+# WATCHLIST -> ENGINE SYMBOLS
 # =====================================================
-async def strategy_loop():
-    """
-    Periodically computes indicator outputs
-    and broadcasts them to all ws clients.
-    """
-    print("[main.py] Strategy loop started")
+# history loaded per engine timeframe at startup: (barSize, durationStr),
+# enough to fill the 500-bar candle buffers
+WARMUP = {
+    "1m": ("1 min", "1 D"),
+    "5m": ("5 mins", "3 D"),
+    "15m": ("15 mins", "1 W"),
+    "1h": ("1 hour", "1 M"),
+}
+
+# symbols holding a market data subscription for the engine
+watched = []
+watchlist_task = None
+
+
+async def load_watchlist():
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(select(Watchlist.symbol))
+        symbols = rows.scalars().all()
+
+    for symbol in symbols:
+        strategy_engine.track(symbol)
+
+    print(f"[main.py] tracking {len(symbols)} watchlist symbols")
+    return symbols
 
-    while True:
-        try:
-            for tf in ["1m", "5m", "15m", "1h"]:
-                result = strategy_engine.compute(tf)
 
-                if result:
-                    print(
-                        f"[main.py_strategy_loop] broadcasting {tf} | "
-                        f"VWAP={result['anchor_vwap']} | "
-                        f"Trend={result['trend']}"
-                    )
+async def seed_history(symbol):
+    for tf, (bar_size, duration) in WARMUP.items():
+        rows, _, _ = await fetch_history(HistoryReq(symbol=symbol, barSize=bar_size, durationStr=duration))
 
-                    await broadcast_indicator(result)
+        # the last bar may still be forming: it seeds the aggregator, not the engine
+        now = time.time()
+        closed = [r for r in rows if r[0] + TIMEFRAME_SECONDS[tf] <= now]
 
-            await asyncio.sleep(1)
+        if closed:
+            strategy_engine.load_history(symbol, tf, to_columns(closed))
 
+        if len(closed) < len(rows):
+            ts, o, h, l, c, v = rows[-1]
+            bar_aggregator.seed(symbol, tf, {"time": ts, "open": o, "high": h, "low": l, "close": c, "volume": v})
+
+
+async def start_watchlist(symbols):
+    """Seed each watchlist symbol from history, then stream its ticks."""
+    while True:
+        try:
+            await ensure_connected()
+            break
+        except Exception as e:
+            print(f"[main.py] watchlist waiting for IBKR: {e}")
+            await asyncio.sleep(10)
+
+    async def start(symbol):
+        # history first: bars closed from ticks must not come before it
+        try:
+            await seed_history(symbol)
+        except Exception as e:
+            print(f"[main.py] history seed failed for {symbol}: {e}")
+
+        try:
+            await market_data.acquire(symbol)
+            watched.append(symbol)
         except Exception as e:
-            print(f"[main.py_strategy_loop ERROR] {e}")
-            await asyncio.sleep(1)
+            print(f"[main.py] market data for {symbol} failed: {e}")
+
+    await asyncio.gather(*(start(symbol) for symbol in symbols))
+    print(f"[main.py] streaming {len(watched)}/{len(symbols)} watchlist symbols")
 
 
 # =====================================================
@@ -110,6 +223,8 @@ async def strategy_loop():
 # =====================================================
 @app.on_event("startup")
 async def startup():
+    global watchlist_task
+
     print("[main.py] Startup initializing...")
 
     max_retries = 20
@@ -119,6 +234,8 @@ async def startup():
         try:
             async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await add_columns(conn)
+                await init_timeseries(conn)
 
             print("[DB] ready")
             break
@@ -132,7 +249,18 @@ async def startup():
     else:
         raise RuntimeError("Database failed to become ready.")
 
-    asyncio.create_task(strategy_loop())
+    try:
+        symbols = await load_watchlist()
+        watchlist_task = asyncio.create_task(start_watchlist(symbols))
+    except Exception as e:
+        print(f"[main.py] watchlist load failed: {e}")
+
+    asyncio.create_task(bar_aggregator.run())
+    asyncio.create_task(market_data.run())
+    asyncio.create_task(tick_feed.run())
+    asyncio.create_task(portfolio.run())
+    asyncio.create_task(db_writer.run())
+    asyncio.create_task(strategy_runner.run())
 
     print("[Strategy Engine] started")
 
@@ -142,6 +270,14 @@ async def startup():
 # =====================================================
 @app.on_event("shutdown")
 async def shutdown():
+    if watchlist_task:
+        watchlist_task.cancel()
+
+    for symbol in watched:
+        market_data.release(symbol)
+
+    strategy_runner.shutdown()
+    await db_writer.close()
     print("[main.py] Shutdown complete")
 
 
@@ -154,4 +290,12 @@ def root():
         "status": "ok",
         "service": "ALGO_V4 backend running",
         "engine": "MTF Fractal VWAP + MACD + Fibonacci active"
-    }
\ No newline at end of file
+    }
+
+
+# =====================================================
+# METRICS (Prometheus text format)
+# =====================================================
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
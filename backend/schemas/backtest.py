@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, List, Optional
+
+
+class StrategyParamsReq(BaseModel):
+    # StrategyParams fields; left out -> default. Strict: 7.0 or "7" is not a width
+    model_config = ConfigDict(extra="forbid", strict=True)
+
+    macd_fast: Optional[int] = Field(None, ge=1)
+    macd_slow: Optional[int] = Field(None, ge=1)
+    macd_signal: Optional[int] = Field(None, ge=1)
+    fractal_width: Optional[int] = Field(None, ge=3)
+    fib_ratios: Optional[List[Annotated[float, Field(allow_inf_nan=False)]]] = Field(None, min_length=1)
+
+
+class BacktestReq(BaseModel):
+    symbols: List[str] = Field(..., min_length=1)
+    capital: float = Field(100_000.0, gt=0)
+    commissionPerShare: float = 0.005
+    minCommission: float = 1.0
+    slippageBps: float = 1.0
+    allowShort: bool = True
+    barsPerYear: Optional[float] = None
+    equityPoints: int = Field(500, ge=2)
+    # e.g. {"macd_fast": 8, "fractal_width": 7}
+    params: StrategyParamsReq = StrategyParamsReq()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 class ContractReq(BaseModel):
@@ -16,6 +16,9 @@ class OrderReq(BaseModel):
     orderType: str = Field("MKT", pattern="^(MKT|LMT|STP|STP LMT)$")
     lmtPrice: Optional[float] = None
     auxPrice: Optional[float] = None
+    # return once the order reaches this status (default: acknowledged)
+    waitFor: Optional[str] = None
+    timeout: float = Field(2.0, ge=0, le=60)
 
 
 class CancelReq(BaseModel):
@@ -28,4 +31,20 @@ class HistoryReq(BaseModel):
     barSize: str = "5 mins"
     whatToShow: str = "TRADES"
     useRTH: bool = False
-    endDateTime: Optional[str] = ""
\ No newline at end of file
+    endDateTime: Optional[str] = ""
+    # rows: [{time, open, ...}] | columnar: {time: [...], open: [...]} | binary: float64 columns
+    format: str = Field("rows", pattern="^(rows|columnar|binary)$")
+
+
+class BatchHistoryReq(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=200)
+    durationStr: str = "1 D"
+    barSize: str = "5 mins"
+    whatToShow: str = "TRADES"
+    useRTH: bool = False
+    endDateTime: Optional[str] = ""
+    format: str = Field("rows", pattern="^(rows|columnar)$")
+
+
+class BatchSnapshotReq(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=200)
@@ -0,0 +1,194 @@
+# backend/services/bar_aggregator.py
+
+import asyncio
+import csv
+import math
+import sys
+import time
+from datetime import datetime
+
+from strategy_engine import TIMEFRAMES
+
+TIMEFRAME_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+}
+
+# ib_insync tick types carrying a trade price + size (live / delayed)
+LAST_TICK_TYPES = (4, 68)
+
+
+def symbol_of(contract):
+    # same convention as the REST API: forex pairs are "EUR.USD"
+    if contract.secType == "CASH":
+        return f"{contract.symbol}.{contract.currency}"
+
+    return contract.symbol
+
+
+class BarAggregator:
+    """
+    Streams ticks into 1m bars and their 5m / 15m / 1h rollups.
+
+    Every tick updates the forming bar of each timeframe in the same
+    pass. A bar is closed (StrategyEngine.update_candle) when a tick for
+    a later period arrives or when the clock passes its end (run());
+    every tick also pushes the forming bars (StrategyEngine.update_forming).
+    """
+
+    def __init__(self, engine, timeframes=TIMEFRAMES):
+        self.engine = engine
+        self.periods = [(tf, TIMEFRAME_SECONDS[tf]) for tf in timeframes]
+        self.forming = {}
+        self.closed_until = {}
+
+    # --------------------------------------------------
+    # Input
+    # --------------------------------------------------
+    def on_tick(self, symbol, ts, price, size=0):
+        self.on_bar(symbol, ts, price, price, price, price, size)
+
+    def on_bar(self, symbol, ts, o, h, l, c, volume=0):
+        """
+        Merge an OHLCV sample starting at ts (a tick, a 5s realtime
+        bar or a 1m bar) into every timeframe.
+        """
+        symbol = symbol.upper()
+
+        for tf, seconds in self.periods:
+            key = (symbol, tf)
+            start = int(ts) // seconds * seconds
+
+            if start <= self.closed_until.get(key, -1):
+                continue  # late sample for a bar that already closed
+
+            bar = self.forming.get(key)
+
+            if bar and start > bar["time"]:
+                self._close(key, bar)
+                bar = None
+
+            if bar is None:
+                bar = {"time": start, "open": o, "high": h, "low": l, "close": c, "volume": volume}
+                self.forming[key] = bar
+            else:
+                bar["high"] = max(bar["high"], h)
+                bar["low"] = min(bar["low"], l)
+                bar["close"] = c
+                bar["volume"] += volume
+
+            self.engine.update_forming(symbol, tf, dict(bar))
+
+    def seed(self, symbol, tf, bar):
+        """
+        Start the forming bar of a timeframe from history (the part of
+        the bar before the tick subscription); ticks merge into it.
+        """
+        key = (symbol.upper(), tf)
+
+        # ticks got there first: they own the forming bar
+        if key in self.forming:
+            return
+
+        self.forming[key] = dict(bar)
+        self.closed_until[key] = bar["time"] - 1
+        self.engine.update_forming(key[0], tf, dict(bar))
+
+    def on_pending_tickers(self, tickers):
+        """
+        ib.pendingTickersEvent handler (reqMktData / reqTickByTickData).
+        """
+        for t in tickers:
+            symbol = symbol_of(t.contract)
+
+            if t.tickByTicks:
+                for tick in t.tickByTicks:
+                    if hasattr(tick, "price"):
+                        self.on_tick(symbol, tick.time.timestamp(), tick.price, tick.size)
+                continue
+
+            for tick in t.ticks:
+                if tick.tickType in LAST_TICK_TYPES and not math.isnan(tick.price):
+                    self.on_tick(symbol, tick.time.timestamp(), tick.price, tick.size or 0)
+
+    # --------------------------------------------------
+    # Closing
+    # --------------------------------------------------
+    def _close(self, key, bar):
+        del self.forming[key]
+        self.closed_until[key] = bar["time"]
+        self.engine.update_candle(key[0], key[1], bar)
+
+    def close_expired(self, now=None):
+        now = time.time() if now is None else now
+        seconds = dict(self.periods)
+
+        for key, bar in list(self.forming.items()):
+            if now >= bar["time"] + seconds[key[1]]:
+                self._close(key, bar)
+
+    async def run(self, interval=1.0):
+        # closes bars of symbols that stopped ticking
+        while True:
+            try:
+                self.close_expired()
+            except Exception as e:
+                print(f"[bar_aggregator.py ERROR] {e}")
+
+            await asyncio.sleep(interval)
+
+
+# --------------------------------------------------
+# Replay
+# --------------------------------------------------
+def _parse_time(value):
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def replay_ticks(path, aggregator):
+    """
+    Feed a CSV of ticks (columns: time, symbol, price, size; time as
+    epoch seconds or ISO-8601) through the aggregator.
+    """
+    count = 0
+    last_ts = None
+
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            last_ts = _parse_time(row["time"])
+            aggregator.on_tick(row["symbol"], last_ts, float(row["price"]), float(row.get("size") or 0))
+            count += 1
+
+    if last_ts is not None:
+        aggregator.close_expired(last_ts + max(s for _, s in aggregator.periods))
+
+    return count
+
+
+if __name__ == "__main__":
+    from strategy_engine import StrategyEngine
+
+    if len(sys.argv) != 2:
+        print("usage: python -m services.bar_aggregator ticks.csv")
+        sys.exit(1)
+
+    engine = StrategyEngine()
+    aggregator = BarAggregator(engine)
+
+    started = time.perf_counter()
+    n = replay_ticks(sys.argv[1], aggregator)
+    elapsed = time.perf_counter() - started
+
+    print(f"[bar_aggregator.py] replayed {n} ticks in {elapsed:.3f}s")
+
+    for symbol in engine.symbols():
+        for tf in TIMEFRAMES:
+            result = engine.compute(symbol, tf)
+            bars = len(engine.data[symbol][tf].bars)
+            trend = result["trend"] if result else "-"
+            print(f"  {symbol:<8} {tf:>4} bars={bars:<5} trend={trend}")
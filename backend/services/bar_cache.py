@@ -0,0 +1,299 @@
+# backend/services/bar_cache.py
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timezone
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover
+    ZoneInfo = None
+
+BAR_UNITS = {
+    "sec": 1, "secs": 1,
+    "min": 60, "mins": 60,
+    "hour": 3600, "hours": 3600,
+    "day": 86400, "days": 86400,
+    "week": 7 * 86400, "weeks": 7 * 86400,
+    "month": 30 * 86400, "months": 30 * 86400,
+}
+
+DURATION_UNITS = {
+    "S": 1,
+    "D": 86400,
+    "W": 7 * 86400,
+    "M": 30 * 86400,
+    "Y": 365 * 86400,
+}
+
+# IBKR durations above one day must be whole days / years
+MAX_SECONDS_DURATION = 86400
+MAX_DAYS_DURATION = 365
+
+
+def bar_seconds(bar_size):
+    n, unit = bar_size.split()
+    return int(n) * BAR_UNITS[unit]
+
+
+def duration_seconds(duration):
+    n, unit = duration.split()
+    return int(n) * DURATION_UNITS[unit.upper()]
+
+
+def to_duration(seconds):
+    seconds = max(1, int(math.ceil(seconds)))
+
+    if seconds <= MAX_SECONDS_DURATION:
+        return f"{seconds} S"
+
+    days = math.ceil(seconds / 86400)
+
+    if days <= MAX_DAYS_DURATION:
+        return f"{days} D"
+
+    return f"{math.ceil(days / 365)} Y"
+
+
+def parse_end(end_date_time):
+    """
+    IBKR endDateTime -> epoch seconds ("" = now).
+    Accepts "YYYYMMDD HH:MM:SS [tz]" and "YYYYMMDD-HH:MM:SS" (UTC).
+    """
+    if not end_date_time:
+        return time.time()
+
+    text = end_date_time.strip()
+
+    if "-" in text[:9]:
+        return datetime.strptime(text, "%Y%m%d-%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+
+    parts = text.split()
+    dt = datetime.strptime(" ".join(parts[:2]), "%Y%m%d %H:%M:%S")
+
+    if len(parts) > 2 and ZoneInfo:
+        dt = dt.replace(tzinfo=ZoneInfo(parts[2]))
+
+    return dt.timestamp()
+
+
+def format_end(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d-%H:%M:%S")
+
+
+def bar_ts(d):
+    if isinstance(d, datetime):
+        return int(d.timestamp())
+
+    if isinstance(d, date):
+        return int(datetime(d.year, d.month, d.day, tzinfo=timezone.utc).timestamp())
+
+    return int(d)
+
+
+def _rows(bars):
+    return [(bar_ts(b.date), b.open, b.high, b.low, b.close, b.volume) for b in bars]
+
+
+def bar_time(ts, daily):
+    dt = datetime.fromtimestamp(ts, timezone.utc)
+    return dt.date().isoformat() if daily else dt.isoformat()
+
+
+class BarCache:
+    """
+    Persistent historical bar cache (SQLite) keyed by
+    (conId, barSize, whatToShow, useRTH).
+
+    Bars are stored once per key and timestamp, next to the time ranges
+    already covered. A request is turned into a time range; only the
+    uncovered gaps are fetched from IBKR. Concurrent requests for the
+    same key are serialized, so overlapping requests share the fetched
+    ranges instead of hitting IBKR twice.
+
+    IBKR's day-based durations (D/W/M/Y) follow trading sessions, so the
+    first time such a (durationStr, endDateTime) pair is seen it is
+    fetched as-is and the start IBKR actually returned is remembered for
+    repeats. Relative ("" = now) requests re-learn it once per UTC day;
+    their forming bar is fetched with every request and never stored.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db_lock = threading.Lock()
+        self.key_locks = {}
+        self.stats = {"cache": 0, "partial": 0, "ibkr": 0}
+
+        with self.db_lock, self.db:
+            self.db.executescript("""
+                PRAGMA journal_mode = WAL;
+                CREATE TABLE IF NOT EXISTS bars (
+                    key TEXT, ts INTEGER,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (key, ts)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS ranges (
+                    key TEXT, start INTEGER, "end" INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS ix_ranges_key ON ranges (key, start);
+                CREATE TABLE IF NOT EXISTS aliases (
+                    key TEXT, duration TEXT, end_spec TEXT, start INTEGER, day TEXT,
+                    PRIMARY KEY (key, duration, end_spec)
+                );
+            """)
+
+    @staticmethod
+    def make_key(con_id, bar_size, what_to_show, use_rth):
+        return f"{con_id}|{bar_size}|{what_to_show}|{int(bool(use_rth))}"
+
+    # --------------------------------------------------
+    # SQLite (called from worker threads)
+    # --------------------------------------------------
+    def _read(self, key, start, end):
+        with self.db_lock:
+            return self.db.execute(
+                "SELECT ts, open, high, low, close, volume FROM bars "
+                "WHERE key = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (key, start, end),
+            ).fetchall()
+
+    def _write(self, key, rows, covered):
+        with self.db_lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(key, *r) for r in rows],
+            )
+
+            if covered:
+                self._add_range(key, *covered)
+
+    def _add_range(self, key, start, end):
+        # merge with every overlapping / touching range
+        rows = self.db.execute(
+            'SELECT start, "end" FROM ranges WHERE key = ? AND start <= ? AND "end" >= ?',
+            (key, end, start),
+        ).fetchall()
+
+        for s, e in rows:
+            start, end = min(start, s), max(end, e)
+
+        self.db.execute('DELETE FROM ranges WHERE key = ? AND start <= ? AND "end" >= ?', (key, end, start))
+        self.db.execute('INSERT INTO ranges VALUES (?, ?, ?)', (key, start, end))
+
+    def _gaps(self, key, start, end):
+        with self.db_lock:
+            ranges = self.db.execute(
+                'SELECT start, "end" FROM ranges WHERE key = ? AND "end" > ? AND start < ? ORDER BY start',
+                (key, start, end),
+            ).fetchall()
+
+        gaps = []
+        cursor = start
+
+        for s, e in ranges:
+            if s > cursor:
+                gaps.append((cursor, s))
+            cursor = max(cursor, e)
+
+        if cursor < end:
+            gaps.append((cursor, end))
+
+        return gaps
+
+    def _get_alias(self, key, duration, end_spec):
+        with self.db_lock:
+            return self.db.execute(
+                "SELECT start, day FROM aliases WHERE key = ? AND duration = ? AND end_spec = ?",
+                (key, duration, end_spec),
+            ).fetchone()
+
+    def _set_alias(self, key, duration, end_spec, start, day):
+        with self.db_lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO aliases VALUES (?, ?, ?, ?, ?)",
+                (key, duration, end_spec, start, day),
+            )
+
+    # --------------------------------------------------
+    # Requests
+    # --------------------------------------------------
+    async def get_bars(self, key, bar_size, duration, end_spec, fetch):
+        """
+        Bars as (ts, open, high, low, close, volume) rows plus the source
+        ("cache", "partial" or "ibkr").
+
+        fetch(endDateTime, durationStr) is a coroutine returning ib_insync bars.
+        """
+        lock = self.key_locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            rows, source = await self._get_bars(key, bar_size, duration, end_spec or "", fetch)
+
+        self.stats[source] += 1
+        return rows, source
+
+    async def _get_bars(self, key, bar_size, duration, end_spec, fetch):
+        step = bar_seconds(bar_size)
+        relative = not end_spec
+        end = parse_end(end_spec)
+        today = datetime.now(timezone.utc).date().isoformat()
+
+        # a relative request's last bar may still be forming: it is fetched
+        # fresh every time and never stored or marked covered
+        covered_end = math.floor(end / step) * step if relative else int(end)
+
+        if duration.split()[1].upper() == "S":
+            # plain seconds: the range is exact, nothing to learn
+            alias = (int(end - duration_seconds(duration)), today)
+        else:
+            alias = await asyncio.to_thread(self._get_alias, key, duration, end_spec)
+
+        if alias is None or (relative and alias[1] != today):
+            rows = _rows(await fetch(end_spec, duration))
+            start = rows[0][0] if rows else int(end - duration_seconds(duration))
+
+            await asyncio.to_thread(self._write, key, [r for r in rows if r[0] < covered_end], (start, covered_end))
+            await asyncio.to_thread(self._set_alias, key, duration, end_spec, start, today)
+
+            return rows, "ibkr"
+
+        start = alias[0]
+        gaps = await asyncio.to_thread(self._gaps, key, start, covered_end)
+
+        for gap_start, gap_end in gaps:
+            rows = _rows(await fetch(format_end(gap_end), to_duration(gap_end - gap_start)))
+            await asyncio.to_thread(self._write, key, rows, (gap_start, gap_end))
+
+        rows = await asyncio.to_thread(self._read, key, start, covered_end if relative else int(end) + 1)
+
+        if relative:
+            tail = _rows(await fetch("", to_duration(end - covered_end)))
+            rows += [r for r in tail if r[0] >= covered_end]
+
+        if gaps == [(start, covered_end)]:
+            return rows, "ibkr"
+
+        return rows, "partial" if gaps else "cache"
+
+    def hit_rate(self):
+        total = sum(self.stats.values())
+        return {**self.stats, "hitRate": self.stats["cache"] / total if total else None}
+
+
+_bar_cache = None
+
+
+def get_bar_cache():
+    global _bar_cache
+
+    if _bar_cache is None:
+        from core.config import BAR_CACHE_PATH
+        _bar_cache = BarCache(BAR_CACHE_PATH)
+
+    return _bar_cache
@@ -0,0 +1,198 @@
+# backend/services/market_data.py
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from ib_insync import Stock, Forex
+
+from core.config import IB_MAX_MKT_LINES, MKT_DATA_IDLE_TTL
+from core.contracts import contract_resolver
+from core.ibkr import ib
+from core.metrics import Gauge, ib_request_seconds
+from core.pacing import pacer
+
+
+def make_contract(symbol):
+    # same convention as /api/history: "EUR.USD" is a forex pair
+    if "." in symbol:
+        base, quote = symbol.split(".")
+        return Forex(base + quote)
+
+    return Stock(symbol, "SMART", "USD")
+
+
+def _num(v, cast=float):
+    return cast(0) if v is None or (isinstance(v, float) and math.isnan(v)) else cast(v)
+
+
+def ticker_snapshot(symbol, t):
+    return {
+        "symbol": symbol,
+        "last": _num(t.last),
+        "bid": _num(t.bid),
+        "ask": _num(t.ask),
+        "volume": _num(t.volume, int),
+        "time": t.time.timestamp() if t.time else time.time(),
+    }
+
+
+class Subscription:
+    def __init__(self, symbol, contract, ticker):
+        self.symbol = symbol
+        self.contract = contract
+        self.ticker = ticker
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.requested = time.perf_counter()
+        self.first_tick = asyncio.get_running_loop().create_future()
+
+
+class MarketDataManager:
+    """
+    Reference-counted reqMktData subscriptions.
+
+    Tickers stay subscribed while anyone holds them (acquire / release)
+    and for idle_ttl seconds after the last use, so snapshots are read
+    straight from the streaming ticker. At most max_lines are open at
+    once (IBKR's market data line limit); the least recently used
+    unreferenced subscription is evicted to make room.
+    """
+
+    def __init__(self, ib, max_lines=100, idle_ttl=60.0, first_tick_timeout=2.0, resolve=None):
+        self.ib = ib
+        self.resolve = resolve or contract_resolver.resolve
+        self.max_lines = max_lines
+        self.idle_ttl = idle_ttl
+        self.first_tick_timeout = first_tick_timeout
+        self.subs = OrderedDict()
+        self.by_con_id = {}
+        # symbol -> subscribe task, shared by concurrent first requests
+        self.in_flight = {}
+
+        ib.pendingTickersEvent += self.on_pending_tickers
+
+    # --------------------------------------------------
+    # Subscriptions
+    # --------------------------------------------------
+    async def _subscription(self, symbol):
+        symbol = symbol.upper()
+        sub = self.subs.get(symbol)
+
+        if sub is None:
+            task = self.in_flight.get(symbol)
+
+            if task is None:
+                task = asyncio.ensure_future(self._subscribe(symbol))
+                self.in_flight[symbol] = task
+                task.add_done_callback(lambda _: self.in_flight.pop(symbol, None))
+
+            # shield: one caller going away must not cancel the shared subscribe
+            sub = await asyncio.shield(task)
+
+        sub.last_used = time.monotonic()
+        self.subs.move_to_end(symbol)
+
+        return sub
+
+    async def _subscribe(self, symbol):
+        contract = await self.resolve(make_contract(symbol))
+        await pacer.acquire("market")
+
+        # no await from here on: concurrent subscribes can't overshoot max_lines
+        if len(self.subs) >= self.max_lines:
+            self._evict_one()
+
+        ticker = self.ib.reqMktData(contract, "", False, False)
+        sub = Subscription(symbol, contract, ticker)
+
+        self.subs[symbol] = sub
+        self.by_con_id[contract.conId] = sub
+
+        print(f"[market_data.py] subscribed {symbol} ({len(self.subs)}/{self.max_lines} lines)")
+        return sub
+
+    def _evict_one(self):
+        for symbol, sub in self.subs.items():
+            if sub.refs == 0:
+                self._cancel(sub)
+                return
+
+        raise HTTPException(429, f"market data line limit reached ({self.max_lines})")
+
+    def _cancel(self, sub):
+        self.subs.pop(sub.symbol, None)
+        self.by_con_id.pop(sub.contract.conId, None)
+
+        try:
+            self.ib.cancelMktData(sub.contract)
+        except Exception as e:
+            print(f"[market_data.py] cancel {sub.symbol} failed: {e}")
+
+        if not sub.first_tick.done():
+            sub.first_tick.cancel()
+
+    async def acquire(self, symbol):
+        sub = await self._subscription(symbol)
+        sub.refs += 1
+
+        return sub.ticker
+
+    def release(self, symbol):
+        sub = self.subs.get(symbol.upper())
+
+        if sub and sub.refs > 0:
+            sub.refs -= 1
+            sub.last_used = time.monotonic()
+
+    # --------------------------------------------------
+    # Reads
+    # --------------------------------------------------
+    async def snapshot(self, symbol):
+        sub = await self._subscription(symbol)
+
+        if not sub.first_tick.done():
+            # asyncio.wait neither cancels the shared future on timeout nor
+            # raises if eviction cancels it; our own cancellation propagates
+            await asyncio.wait([sub.first_tick], timeout=self.first_tick_timeout)
+
+            # quiet symbol: wait once, then serve whatever the ticker has
+            if not sub.first_tick.done():
+                sub.first_tick.set_result(False)
+
+        return ticker_snapshot(sub.symbol, sub.ticker)
+
+    def on_pending_tickers(self, tickers):
+        for t in tickers:
+            sub = self.by_con_id.get(t.contract.conId)
+
+            if sub and not sub.first_tick.done():
+                sub.first_tick.set_result(True)
+                ib_request_seconds.labels("mktData").observe(time.perf_counter() - sub.requested)
+
+    # --------------------------------------------------
+    # Idle eviction
+    # --------------------------------------------------
+    def evict_idle(self):
+        cutoff = time.monotonic() - self.idle_ttl
+
+        for sub in list(self.subs.values()):
+            if sub.refs == 0 and sub.last_used < cutoff:
+                print(f"[market_data.py] idle, unsubscribing {sub.symbol}")
+                self._cancel(sub)
+
+    async def run(self, interval=5.0):
+        while True:
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"[market_data.py ERROR] {e}")
+
+            await asyncio.sleep(interval)
+
+
+market_data = MarketDataManager(ib, IB_MAX_MKT_LINES, MKT_DATA_IDLE_TTL)
+
+Gauge("ib_market_data_lines", "open reqMktData subscriptions", fn=lambda: len(market_data.subs))
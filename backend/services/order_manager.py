@@ -0,0 +1,271 @@
+# backend/services/order_manager.py
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+
+from core.ibkr import ib
+from core.metrics import ib_request_seconds
+from db.models import Order, OrderEvent
+from db.writer import db_writer
+from ws.orders_ws import publish_order
+
+# ib_insync OrderStatus values
+PENDING = ("PendingSubmit", "ApiPending")
+DONE = ("Filled", "Cancelled", "ApiCancelled", "Inactive")
+
+
+class OrderNotFound(LookupError):
+    pass
+
+
+def order_key(order):
+    """
+    Same key as ib_insync's own trade map: (clientId, orderId), or permId
+    for orders without an orderId (placed manually in TWS).
+    """
+    return (order.clientId, order.orderId) if order.orderId > 0 else order.permId
+
+
+def trade_state(trade):
+    s = trade.orderStatus
+
+    return {
+        "orderId": trade.order.orderId,
+        "permId": trade.order.permId,
+        "symbol": trade.contract.symbol,
+        "action": trade.order.action,
+        "quantity": trade.order.totalQuantity,
+        "orderType": trade.order.orderType,
+        "status": s.status,
+        "filled": s.filled,
+        "remaining": s.remaining,
+        "avgFillPrice": s.avgFillPrice,
+    }
+
+
+def _ms(samples):
+    ordered = sorted(samples)
+
+    if not ordered:
+        return {"count": 0}
+
+    return {
+        "count": len(ordered),
+        "p50": round(ordered[len(ordered) // 2] * 1000, 2),
+        "p99": round(ordered[int(len(ordered) * 0.99)] * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+class OrderManager:
+    """
+    Trades by order_key(), kept current from orderStatusEvent / execDetailsEvent.
+
+    place() returns as soon as the order is sent; callers that need a
+    state await wait() (e.g. until "Submitted" or "Filled") instead of
+    polling. Every status change and fill is published (publish(state))
+    and written as an OrderEvent row through the batch writer.
+
+    In the database an order is its permId (orders.id), which unlike
+    orderId is never reused. TWS assigns it on receipt, so events seen
+    before that are held back and written with the first one that has it.
+
+    Latencies measured from placeOrder: acknowledgement (first status
+    past PendingSubmit) and first fill.
+    """
+
+    def __init__(self, ib, writer=None, publish=None):
+        self.ib = ib
+        self.writer = writer
+        self.publish = publish
+        self.trades = {}
+        # events of orders without a permId yet: key -> [(status, message, time)]
+        self.held = {}
+        # placeOrder time, until first fill / unacknowledged orders
+        self.sent_at = {}
+        self.unacked = set()
+        self.waiters = {}
+        self.ack_latency = deque(maxlen=1000)
+        self.fill_latency = deque(maxlen=1000)
+
+        if writer:
+            # one row per permId, rewritten with the latest status
+            writer.update_on_conflict[Order.__table__] = ("status",)
+
+        ib.orderStatusEvent += self.on_status
+        ib.execDetailsEvent += self.on_exec
+
+    # --------------------------------------------------
+    # Lookup
+    # --------------------------------------------------
+    def get(self, order_id):
+        """Trade placed by this client with order_id."""
+        key = (self.ib.client.clientId, order_id)
+        trade = self.trades.get(key)
+
+        if trade is None:
+            # orders placed before this process (or by TWS): index once
+            for t in self.ib.trades():
+                self.trades.setdefault(order_key(t.order), t)
+
+            trade = self.trades.get(key)
+
+        if trade is None:
+            raise OrderNotFound(order_id)
+
+        return trade
+
+    def open_trades(self):
+        if not self.trades:
+            for t in self.ib.openTrades():
+                self.trades.setdefault(order_key(t.order), t)
+
+        return [t for t in self.trades.values() if t.orderStatus.status not in DONE]
+
+    # --------------------------------------------------
+    # Actions
+    # --------------------------------------------------
+    def place(self, contract, order):
+        sent = time.perf_counter()
+        trade = self.ib.placeOrder(contract, order)
+        key = order_key(trade.order)
+
+        self.trades[key] = trade
+        self.sent_at[key] = sent
+        self.unacked.add(key)
+
+        return trade
+
+    def cancel(self, order_id):
+        trade = self.get(order_id)
+        self.ib.cancelOrder(trade.order)
+
+        return trade
+
+    async def wait(self, order_id, statuses=None, timeout=5.0):
+        """
+        Until the order reaches one of statuses (default: acknowledged,
+        i.e. any status past PendingSubmit) or is done. Returns
+        (trade, reached).
+        """
+        trade = self.get(order_id)
+        key = order_key(trade.order)
+
+        if self._reached(trade, statuses):
+            return trade, True
+
+        fut = asyncio.get_running_loop().create_future()
+        entry = (statuses, fut)
+        self.waiters.setdefault(key, []).append(entry)
+
+        try:
+            await asyncio.wait_for(fut, timeout)
+            return trade, True
+        except asyncio.TimeoutError:
+            return trade, False
+        finally:
+            waiting = self.waiters.get(key, [])
+
+            if entry in waiting:
+                waiting.remove(entry)
+
+            if not waiting:
+                self.waiters.pop(key, None)
+
+    @staticmethod
+    def _reached(trade, statuses):
+        status = trade.orderStatus.status
+
+        if status in DONE:
+            return True
+
+        return status in statuses if statuses else status not in PENDING
+
+    # --------------------------------------------------
+    # IB events
+    # --------------------------------------------------
+    def on_status(self, trade):
+        key = order_key(trade.order)
+        self.trades[key] = trade
+        status = trade.orderStatus.status
+
+        if key in self.unacked and status not in PENDING:
+            latency = time.perf_counter() - self.sent_at[key]
+            self.ack_latency.append(latency)
+            ib_request_seconds.labels("placeOrder").observe(latency)
+            self.unacked.discard(key)
+
+        if status in DONE and status != "Filled":
+            self.sent_at.pop(key, None)
+
+        for statuses, fut in self.waiters.get(key, []):
+            if not fut.done() and self._reached(trade, statuses):
+                fut.set_result(status)
+
+        self._record(trade, status, trade.log[-1].message if trade.log else None)
+
+    def on_exec(self, trade, fill):
+        key = order_key(trade.order)
+        self.trades[key] = trade
+
+        sent = self.sent_at.pop(key, None)
+
+        # first fill of an order placed here
+        if sent is not None:
+            self.fill_latency.append(time.perf_counter() - sent)
+
+        self._record(trade, "Fill", f"{fill.execution.shares}@{fill.execution.price} {fill.execution.exchange}")
+
+    def _persist(self, trade, status, message):
+        key = order_key(trade.order)
+        perm_id = trade.order.permId
+        events = self.held.pop(key, [])
+        events.append((status, message, datetime.utcnow()))
+
+        if not perm_id:
+            if trade.orderStatus.status not in DONE:
+                self.held[key] = events
+            else:
+                print(f"[order_manager.py] order {key} ended without a permId, {len(events)} events not stored")
+            return
+
+        # upsert: the row follows the order's current status
+        self.writer.write(Order, {
+            "id": perm_id,
+            "symbol": trade.contract.symbol,
+            "side": trade.order.action,
+            "quantity": trade.order.totalQuantity,
+            "order_type": trade.order.orderType,
+            "status": trade.orderStatus.status,
+            "ibkr_order_id": str(trade.order.orderId),
+        })
+
+        for status, message, at in events:
+            # order_events.order_id references orders.id
+            self.writer.write(OrderEvent, {
+                "order_id": perm_id,
+                "status": status,
+                "message": message,
+                "timestamp": at,
+            })
+
+    def _record(self, trade, status, message):
+        if self.writer:
+            self._persist(trade, status, message)
+
+        if self.publish:
+            state = trade_state(trade)
+            asyncio.ensure_future(self.publish(state))
+
+    def stats(self):
+        return {
+            "tracked": len(self.trades),
+            "open": len(self.open_trades()),
+            "ackLatencyMs": _ms(self.ack_latency),
+            "fillLatencyMs": _ms(self.fill_latency),
+        }
+
+
+order_manager = OrderManager(ib, db_writer, publish_order)
@@ -0,0 +1,338 @@
+# backend/services/portfolio.py
+
+import asyncio
+import math
+import time
+import uuid
+
+from core.config import PORTFOLIO_PUSH_MS, PORTFOLIO_SAMPLE_SEC
+from core.ibkr import ib
+from core.pacing import pacer
+from core.serialize import dumps
+from db.models import AccountSnapshot, Position
+from db.writer import db_writer
+from services.order_manager import order_manager, trade_state
+from ws.portfolio_ws import manager as portfolio_manager
+
+# websocket topic symbol for account values and account PnL
+ACCOUNT = "ACCOUNT"
+
+# account_snapshots columns <- account value tags
+SNAPSHOT_TAGS = {
+    "net_liquidation": "NetLiquidation",
+    "cash_balance": "TotalCashValue",
+    "buying_power": "BuyingPower",
+    "excess_liquidity": "ExcessLiquidity",
+}
+
+
+def _num(v):
+    # IB reports "no value" as NaN or UNSET_DOUBLE (max float)
+    if v is None or math.isnan(v) or abs(v) > 1e300:
+        return None
+
+    return v
+
+
+def _float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+class Portfolio:
+    """
+    Positions, account values, PnL and open orders kept current from IB
+    events instead of rebuilt from ib.positions() / accountSummary() on
+    every request.
+
+    Each section ("positions", "account", "pnl", "orders") has a version
+    bumped on change and is encoded at most once per version, so polling
+    clients get the cached bytes or a 304. Changed rows are pushed every
+    push_ms on the websocket manager (topic (symbol, "position") and
+    (ACCOUNT, account)), and sampled into the positions / account_snapshots
+    tables every sample_sec when something changed.
+    """
+
+    SECTIONS = ("positions", "account", "pnl", "orders")
+
+    def __init__(self, ib, orders=None, publish=None, writer=None, push_ms=250, sample_sec=60):
+        self.ib = ib
+        self.orders = orders
+        self.publish = publish
+        self.writer = writer
+        self.push_interval = push_ms / 1000
+        self.sample_interval = sample_sec
+
+        # (account, conId) -> row / (account, tag, currency) -> value / account -> PnL
+        self.positions = {}
+        self.values = {}
+        self.pnl = {}
+        # reqPnLSingle subscriptions, (account, conId)
+        self.pnl_subs = set()
+        self.pnl_accounts = set()
+
+        # etags stay unique across restarts
+        self.boot = uuid.uuid4().hex[:8]
+        self.versions = dict.fromkeys(self.SECTIONS, 0)
+        self.encoded = {}
+        self.dirty = set()
+        self.sampled = {}
+
+        ib.connectedEvent += self.on_connected
+        ib.positionEvent += self.on_position
+        ib.pnlEvent += self.on_pnl
+        ib.pnlSingleEvent += self.on_pnl_single
+        ib.accountValueEvent += self.on_account_value
+        ib.accountSummaryEvent += self.on_account_value
+        ib.execDetailsEvent += self.on_exec
+        ib.orderStatusEvent += self.on_order_status
+
+        if ib.isConnected():
+            self.on_connected()
+
+    # --------------------------------------------------
+    # Versioned snapshots
+    # --------------------------------------------------
+    def _touch(self, section, topic=None):
+        self.versions[section] += 1
+        self.encoded.pop(section, None)
+
+        if topic is not None:
+            self.dirty.add(topic)
+
+    def view(self, section):
+        """(encoded JSON, etag) for the current version of a section."""
+        version = self.versions[section]
+        cached = self.encoded.get(section)
+
+        if cached is None or cached[0] != version:
+            cached = (version, dumps(getattr(self, f"_{section}")()), f'"{self.boot}-{section}-{version}"')
+            self.encoded[section] = cached
+
+        return cached[1], cached[2]
+
+    def _positions(self):
+        return list(self.positions.values())
+
+    def _account(self):
+        return [
+            {"tag": tag, "value": value, "currency": currency, "account": account}
+            for (account, tag, currency), value in self.values.items()
+        ]
+
+    def _pnl(self):
+        return list(self.pnl.values())
+
+    def _orders(self):
+        return [trade_state(t) for t in self.orders.open_trades()] if self.orders else []
+
+    # --------------------------------------------------
+    # IB events
+    # --------------------------------------------------
+    def on_connected(self):
+        # PnL subscriptions do not survive a reconnect
+        self.pnl_subs.clear()
+        self.pnl_accounts.clear()
+
+        # start over from what IB replays: anything closed or dropped while
+        # disconnected would otherwise stay in the snapshots for good
+        closed = self.positions
+        self.positions, self.values, self.pnl = {}, {}, {}
+
+        for p in self.ib.positions():
+            self.on_position(p)
+
+        for v in self.ib.accountValues():
+            self.on_account_value(v)
+
+        for key, row in closed.items():
+            if key not in self.positions:
+                self.dirty.add((row["symbol"], "position", key))
+
+        for section in self.SECTIONS:
+            self._touch(section)
+
+        # ib_insync only keeps account values updated for a single account
+        # or up to MaxSyncedSubAccounts; the rest come from the summary
+        synced = {account for account, _, _ in self.values}
+
+        if set(self.ib.managedAccounts()) - synced:
+            self._paced(self.ib.reqAccountSummaryAsync)
+
+    def on_position(self, p):
+        key = (p.account, p.contract.conId)
+
+        if not p.position:
+            if self.positions.pop(key, None) is not None:
+                self._unsubscribe_pnl(key)
+                self._touch("positions", (p.contract.symbol, "position", key))
+            return
+
+        row = self.positions.get(key) or {
+            "account": p.account,
+            "symbol": p.contract.symbol,
+            "conId": p.contract.conId,
+            "marketPrice": None,
+            "marketValue": None,
+            "dailyPnL": None,
+            "unrealizedPnL": None,
+            "realizedPnL": None,
+        }
+
+        row.update(position=p.position, avgCost=p.avgCost)
+        self.positions[key] = row
+        self._subscribe_pnl(key)
+        self._touch("positions", (row["symbol"], "position", key))
+
+    def on_pnl_single(self, v):
+        key = (v.account, v.conId)
+        row = self.positions.get(key)
+
+        if row is None:
+            return
+
+        value = _num(v.value)
+        row.update(
+            dailyPnL=_num(v.dailyPnL),
+            unrealizedPnL=_num(v.unrealizedPnL),
+            realizedPnL=_num(v.realizedPnL),
+            marketValue=value,
+            marketPrice=value / row["position"] if value is not None and row["position"] else None,
+        )
+        self._touch("positions", (row["symbol"], "position", key))
+
+    def on_pnl(self, v):
+        self.pnl[v.account] = {
+            "account": v.account,
+            "dailyPnL": _num(v.dailyPnL),
+            "unrealizedPnL": _num(v.unrealizedPnL),
+            "realizedPnL": _num(v.realizedPnL),
+        }
+        self._touch("pnl", (ACCOUNT, "pnl", v.account))
+
+    def on_account_value(self, v):
+        key = (v.account, v.tag, v.currency)
+
+        if self.values.get(key) == v.value:
+            return
+
+        self.values[key] = v.value
+        self._touch("account", (ACCOUNT, "account", v.account))
+
+        if v.account not in self.pnl_accounts and v.account != "All":
+            self.pnl_accounts.add(v.account)
+            self._paced(self.ib.reqPnL, v.account)
+
+    def on_exec(self, trade, fill):
+        # the position / PnL updates follow as their own events
+        self._touch("orders")
+
+    def on_order_status(self, trade):
+        self._touch("orders")
+
+    def _subscribe_pnl(self, key):
+        if key in self.pnl_subs:
+            return
+
+        self.pnl_subs.add(key)
+        # skipped if the position closed again while waiting for pacing
+        self._paced(self.ib.reqPnLSingle, key[0], "", key[1], still=lambda: key in self.pnl_subs)
+
+    def _paced(self, request, *args, still=None):
+        async def send():
+            await pacer.acquire("account")
+
+            if still is None or still():
+                request(*args)
+
+        asyncio.ensure_future(send())
+
+    def _unsubscribe_pnl(self, key):
+        if key in self.pnl_subs:
+            self.pnl_subs.discard(key)
+            self.ib.cancelPnLSingle(key[0], "", key[1])
+
+    # --------------------------------------------------
+    # Push / sampling
+    # --------------------------------------------------
+    async def push(self):
+        dirty, self.dirty = self.dirty, set()
+
+        for symbol, kind, key in dirty:
+            if kind == "position":
+                row = self.positions.get(key)
+                # closed position: one last update with position 0
+                data = row or {"account": key[0], "symbol": symbol, "conId": key[1], "position": 0}
+                await self.publish(symbol, "position", {"type": "position", **data})
+
+            elif kind == "account":
+                values = {
+                    f"{tag}:{currency}" if currency else tag: value
+                    for (account, tag, currency), value in self.values.items()
+                    if account == key
+                }
+                await self.publish(ACCOUNT, key, {"type": "account", "account": key, **values})
+
+            elif key in self.pnl:
+                await self.publish(ACCOUNT, f"pnl:{key}", {"type": "pnl", **self.pnl[key]})
+
+    def sample(self):
+        """Write positions / account values that changed since the last sample."""
+        if self.sampled.get("positions") != self.versions["positions"]:
+            self.sampled["positions"] = self.versions["positions"]
+
+            for row in self.positions.values():
+                self.writer.write(Position, {
+                    "symbol": row["symbol"],
+                    "quantity": row["position"],
+                    "avg_cost": row["avgCost"],
+                    "market_price": row["marketPrice"],
+                })
+
+        if self.sampled.get("account") != self.versions["account"]:
+            self.sampled["account"] = self.versions["account"]
+
+            for account in {a for a, _, _ in self.values}:
+                tags = {
+                    tag: _float(value)
+                    for (a, tag, currency), value in self.values.items()
+                    if a == account and currency != "BASE"
+                }
+                row = {column: tags.get(tag) for column, tag in SNAPSHOT_TAGS.items()}
+
+                # non-null columns: skip accounts without a full summary yet
+                if row["net_liquidation"] is not None and row["cash_balance"] is not None:
+                    self.writer.write(AccountSnapshot, row)
+
+    async def run(self):
+        last_sample = time.monotonic()
+
+        while True:
+            await asyncio.sleep(self.push_interval)
+
+            if self.publish and self.dirty:
+                try:
+                    await self.push()
+                except Exception as e:
+                    print(f"[portfolio.py] push failed: {e}")
+            else:
+                self.dirty.clear()
+
+            if self.writer and self.sample_interval and time.monotonic() - last_sample >= self.sample_interval:
+                last_sample = time.monotonic()
+                self.sample()
+
+    def stats(self):
+        return {
+            "positions": len(self.positions),
+            "accountValues": len(self.values),
+            "pnlSubscriptions": len(self.pnl_subs),
+            "versions": self.versions,
+        }
+
+
+portfolio = Portfolio(
+    ib, order_manager, portfolio_manager.publish, db_writer, PORTFOLIO_PUSH_MS, PORTFOLIO_SAMPLE_SEC
+)
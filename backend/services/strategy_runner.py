@@ -0,0 +1,138 @@
+# backend/services/strategy_runner.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.metrics import strategy_compute_seconds, strategy_cycle_seconds, strategy_lag_seconds
+from strategy_engine import TIMEFRAMES
+
+
+class StrategyRunner:
+    """
+    Change-driven scheduler for StrategyEngine.compute.
+
+    The engine reports every (symbol, timeframe) that received data.
+    Keys are coalesced in a pending set and a short debounce window lets
+    a burst of ticks collapse into one compute per key. Compute runs on
+    a worker thread so the event loop keeps serving HTTP / websockets.
+
+    A symbol that is still being computed is not started twice: its new
+    keys stay pending and are picked up as soon as it finishes, so one
+    slow symbol never holds up the others.
+    """
+
+    def __init__(self, engine, broadcast, debounce=0.05, workers=4):
+        self.engine = engine
+        self.broadcast = broadcast
+        self.debounce = debounce
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="strategy")
+        self.pending = {}
+        # symbol -> when its oldest pending change arrived
+        self.since = {}
+        self.running = set()
+        self.tasks = set()
+        self._wakeup = asyncio.Event()
+
+        engine.listeners.append(self.notify)
+
+    def notify(self, symbol, tf):
+        self.pending.setdefault(symbol, set()).add(tf)
+        self.since.setdefault(symbol, time.perf_counter())
+        self._wakeup.set()
+
+    # --------------------------------------------------
+    # Worker thread
+    # --------------------------------------------------
+    def _compute(self, symbol, timeframes):
+        results = []
+
+        for tf in TIMEFRAMES:
+            if tf not in timeframes:
+                continue
+
+            try:
+                previous = self.engine.data[symbol][tf].result
+
+                with strategy_compute_seconds.labels(tf).time():
+                    result = self.engine.compute(symbol, tf)
+            except Exception as e:
+                print(f"[strategy_runner.py] compute failed {symbol} {tf}: {e}")
+                continue
+
+            # cached result -> nothing new to send
+            if result and result is not previous:
+                results.append(result)
+
+        return results
+
+    # --------------------------------------------------
+    # Event loop
+    # --------------------------------------------------
+    async def _run_symbol(self, symbol, timeframes, since):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        try:
+            results = await loop.run_in_executor(self.executor, self._compute, symbol, timeframes)
+
+            for result in results:
+                await self.broadcast(result)
+
+            done = time.perf_counter()
+            strategy_cycle_seconds.observe(done - started)
+
+            if results:
+                strategy_lag_seconds.observe(done - since)
+
+        except Exception as e:
+            print(f"[strategy_runner.py ERROR] {symbol}: {e}")
+
+        finally:
+            self.running.discard(symbol)
+
+            if symbol in self.pending:
+                self._wakeup.set()
+
+    def dispatch(self):
+        started = []
+
+        for symbol in list(self.pending):
+            if symbol in self.running:
+                continue
+
+            timeframes = self.pending.pop(symbol)
+            since = self.since.pop(symbol, time.perf_counter())
+
+            if symbol not in self.engine.data:
+                continue
+
+            self.running.add(symbol)
+
+            task = asyncio.create_task(self._run_symbol(symbol, timeframes, since))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            started.append(task)
+
+        return started
+
+    async def run(self):
+        print("[strategy_runner.py] Strategy scheduler started")
+
+        while True:
+            await self._wakeup.wait()
+
+            # fixed window from the first change: bursts coalesce, latency stays bounded
+            await asyncio.sleep(self.debounce)
+            self._wakeup.clear()
+
+            try:
+                self.dispatch()
+            except Exception as e:
+                print(f"[strategy_runner.py ERROR] {e}")
+
+    def shutdown(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,116 @@
+# backend/services/synthetic_ticks.py
+
+import asyncio
+import itertools
+import random
+import sys
+from datetime import datetime, timezone
+
+from eventkit import Event
+from ib_insync import Ticker, TickData
+
+
+class SyntheticIB:
+    """
+    Stand-in for the parts of ib_insync.IB the streaming path uses:
+    reqMktData / cancelMktData and pendingTickersEvent.
+
+    run() random-walks every subscribed ticker and emits rate ticks per
+    second in total, the same way IB delivers them (a set of Tickers
+    whose .ticks hold the new last trades).
+    """
+
+    def __init__(self, rate=200, seed=None):
+        self.rate = rate
+        self.random = random.Random(seed)
+        self.pendingTickersEvent = Event("pendingTickersEvent")
+        self.tickers = {}
+        self._con_ids = itertools.count(1)
+
+    async def resolve(self, contract):
+        contract.conId = contract.conId or next(self._con_ids)
+        return contract
+
+    def reqMktData(self, contract, *args, **kwargs):
+        ticker = Ticker(contract=contract)
+        ticker.last = ticker.bid = ticker.ask = 100.0
+        ticker.volume = 0
+        self.tickers[contract.conId] = ticker
+        return ticker
+
+    def cancelMktData(self, contract):
+        self.tickers.pop(contract.conId, None)
+
+    def step(self):
+        if not self.tickers:
+            return
+
+        t = self.random.choice(list(self.tickers.values()))
+        now = datetime.now(timezone.utc)
+        price = round(t.last * (1 + self.random.gauss(0, 0.0005)), 4)
+        size = self.random.randint(1, 500)
+
+        t.last, t.bid, t.ask = price, round(price - 0.01, 4), round(price + 0.01, 4)
+        t.volume += size
+        t.time = now
+        t.ticks = [TickData(now, 4, price, size)]
+
+        self.pendingTickersEvent.emit({t})
+
+    async def run(self):
+        while True:
+            self.step()
+            await asyncio.sleep(1 / self.rate)
+
+
+if __name__ == "__main__":
+    # python -m services.synthetic_ticks [seconds]
+    # synthetic IB -> MarketDataManager -> TickFeed -> one fake websocket
+    import json
+    import time
+
+    from services.market_data import MarketDataManager
+    from services.tick_feed import TickFeed
+    from ws.manager import ConnectionManager
+
+    class PrintSocket:
+        def __init__(self):
+            self.counts = {}
+
+        async def accept(self):
+            pass
+
+        async def send_text(self, text):
+            tick = json.loads(text)["data"][0]
+            self.counts[tick["symbol"]] = self.counts.get(tick["symbol"], 0) + 1
+
+    async def main(seconds):
+        ib = SyntheticIB(rate=1000, seed=1)
+        market_data = MarketDataManager(ib, resolve=ib.resolve)
+        manager = ConnectionManager()
+        feed = TickFeed(market_data, manager)
+
+        ws = PrintSocket()
+        await manager.connect(ws)
+
+        for symbol in ("AAPL", "MSFT", "NVDA"):
+            await manager.handle(ws, json.dumps({"op": "subscribe", "symbol": symbol}))
+
+        tasks = [asyncio.create_task(ib.run()), asyncio.create_task(feed.run())]
+        started = time.perf_counter()
+        await asyncio.sleep(seconds)
+        elapsed = time.perf_counter() - started
+
+        for task in tasks:
+            task.cancel()
+
+        print(f"[synthetic_ticks.py] {feed.stats['ticks']} ticks in, {feed.stats['published']} pushed in {elapsed:.1f}s")
+
+        for symbol, n in sorted(ws.counts.items()):
+            print(f"  {symbol:<6} {n / elapsed:5.1f} msg/s")
+
+        manager.disconnect(ws)
+        await asyncio.sleep(0)
+        print(f"  lines open after disconnect: {sum(s.refs for s in market_data.subs.values())} refs")
+
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 3.0))
@@ -0,0 +1,95 @@
+# backend/services/tick_feed.py
+
+import asyncio
+
+from core.config import TICK_RATE_HZ
+from services.market_data import ticker_snapshot
+
+
+class TickFeed:
+    """
+    Streaming tickers -> websocket clients, at most rate pushes per symbol.
+
+    pendingTickersEvent only marks a symbol dirty; every 1/rate seconds
+    the latest state of each dirty symbol is published as
+        {"type": "tick", "data": [{symbol, last, bid, ask, volume, time}]}
+    on topic (symbol, "tick"), so a burst of ticks becomes one message.
+
+    The tickers are MarketDataManager's: a websocket subscription to a
+    symbol holds a reference on its line (acquire / release), the same
+    line that REST snapshots read from.
+    """
+
+    def __init__(self, market_data, manager, rate=TICK_RATE_HZ, record=None):
+        self.market_data = market_data
+        self.manager = manager
+        # optional record(tick) for every pushed tick (quote persistence)
+        self.record = record
+        self.interval = 1.0 / rate
+        self.pending = {}
+        self.holds = {}
+        self.stats = {"ticks": 0, "published": 0}
+
+        market_data.ib.pendingTickersEvent += self.on_pending_tickers
+        manager.topic_listeners.append(self.on_topic)
+
+    def on_pending_tickers(self, tickers):
+        for t in tickers:
+            sub = self.market_data.by_con_id.get(t.contract.conId)
+
+            if sub is not None:
+                self.pending[sub.symbol] = t
+                self.stats["ticks"] += 1
+
+    # --------------------------------------------------
+    # Websocket subscriptions -> market data lines
+    # --------------------------------------------------
+    def on_topic(self, symbol, added):
+        if added:
+            self.holds.setdefault(symbol, []).append(asyncio.ensure_future(self._acquire(symbol)))
+            return
+
+        holds = self.holds.get(symbol)
+
+        if holds:
+            asyncio.ensure_future(self._release(symbol, holds.pop()))
+
+            if not holds:
+                del self.holds[symbol]
+
+    async def _acquire(self, symbol):
+        try:
+            await self.market_data.acquire(symbol)
+            return True
+        except Exception as e:
+            print(f"[tick_feed.py] subscribe {symbol} failed: {getattr(e, 'detail', e)}")
+            return False
+
+    async def _release(self, symbol, hold):
+        # release only after the matching acquire has gone through
+        if await hold:
+            self.market_data.release(symbol)
+
+    # --------------------------------------------------
+    # Push loop
+    # --------------------------------------------------
+    async def flush(self):
+        batch, self.pending = self.pending, {}
+
+        for symbol, t in batch.items():
+            tick = ticker_snapshot(symbol, t)
+            await self.manager.publish(symbol, "tick", {"type": "tick", "data": [tick]})
+
+            if self.record:
+                self.record(tick)
+
+        self.stats["published"] += len(batch)
+
+    async def run(self):
+        while True:
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[tick_feed.py ERROR] {e}")
+
+            await asyncio.sleep(self.interval)
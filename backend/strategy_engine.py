@@ -1,56 +1,219 @@
 # <inserted above from final version># backend/strategy_engine.py
 
-from indicators.fractals import detect_fractals
-from indicators.vwap import anchored_vwap
-from indicators.macd import macd
+import threading
+import time
+
+import numpy as np
+
+from core.candle_buffer import COLUMNS, CandleBuffer
+from core.metrics import indicator_update_seconds
+from indicators.fractals import StreamingFractals
+from indicators.vwap import StreamingAnchoredVWAP
+from indicators.macd import StreamingMACD
 from indicators.fibonacci import fib_levels
+from strategy_params import DEFAULT_PARAMS
+
+
+TIMEFRAMES = ("1m", "5m", "15m", "1h")
+
+FRACTALS_SECONDS = indicator_update_seconds.labels("fractals")
+VWAP_SECONDS = indicator_update_seconds.labels("vwap")
+MACD_SECONDS = indicator_update_seconds.labels("macd")
+
+
+class TimeframeState:
+    """
+    Candles plus running indicator state for one (symbol, timeframe).
+
+    Every indicator is updated in O(1) when a candle is appended,
+    and compute() reuses the last result until new data arrives.
+
+    The forming (not yet closed) bar is kept aside: MACD and VWAP are
+    previewed with it, fractals only ever see closed bars.
+
+    Trend flips of the committed MACD (closed bars only) are queued in
+    crosses and handed out with the next result.
+
+    lock guards the state between the event loop (updates) and the
+    worker threads running compute().
+    """
+
+    def __init__(self, params=DEFAULT_PARAMS, capacity=500):
+        self.lock = threading.Lock()
+        self.bars = CandleBuffer(capacity)
+        self.fractals = StreamingFractals(params.fractal_width)
+        self.vwap = StreamingAnchoredVWAP()
+        self.macd = StreamingMACD(params.macd_fast, params.macd_slow, params.macd_signal)
+        self.forming = None
+        self.crosses = []
+        self.result = None
+        self.dirty = False
+
+    def update(self, candle):
+        self.bars.append(candle)
+
+        if self.forming and self.forming["time"] <= candle["time"]:
+            self.forming = None
+
+        t0 = time.perf_counter()
+        found = self.fractals.update(candle)
+        t1 = time.perf_counter()
+
+        if found:
+            # newest fractal becomes the anchor; it sits inside the fractal window
+            self.vwap.reanchor(found[-1]["time"], self.fractals.window)
+        else:
+            self.vwap.update(candle)
+
+        t2 = time.perf_counter()
+        before = self.macd.value
+        macd_val, signal_val = self.macd.update(candle["close"])
+        t3 = time.perf_counter()
+
+        if before[0] is not None and (before[0] > before[1]) != (macd_val > signal_val):
+            self.crosses.append({
+                "time": candle["time"],
+                "trend": "bullish" if macd_val > signal_val else "bearish",
+                "price": candle["close"],
+                "macd": macd_val,
+                "signal": signal_val,
+                "anchor_vwap": self.vwap.value,
+            })
+
+        FRACTALS_SECONDS.observe(t1 - t0)
+        VWAP_SECONDS.observe(t2 - t1)
+        MACD_SECONDS.observe(t3 - t2)
+        self.dirty = True
+
+    def load(self, columns):
+        """
+        Bulk-load bars and rebuild the streaming state from the
+        buffer with the vectorized indicators.
+
+        Live bars may already be in the buffer: history only fills in
+        before the first of them.
+        """
+        bars = self.bars
+
+        if len(bars):
+            older = np.asarray(columns["time"]) < bars.time[0]
+            columns = {name: np.concatenate([np.asarray(columns[name])[older], bars.column(name)]) for name in COLUMNS}
+            bars = self.bars = CandleBuffer(bars.capacity)
+
+        bars.extend(columns)
+
+        width = self.fractals.width
+        window = [bars.row(i) for i in range(max(0, len(bars) - width), len(bars))]
+        self.fractals.seed(bars.time, bars.high, bars.low, window)
+
+        anchor = self.fractals.last
+
+        if anchor:
+            self.vwap.seed(anchor["time"], bars.time, bars.close, bars.volume)
+
+        self.macd.seed(bars.close)
+        self.dirty = True
+
+    def set_forming(self, candle):
+        self.forming = candle
+        self.dirty = True
 
 
 class StrategyEngine:
-    def __init__(self):
-        self.data = {
-            "1m": [],
-            "5m": [],
-            "15m": [],
-            "1h": [],
-        }
+    def __init__(self, params=DEFAULT_PARAMS):
+        self.params = params.validate()
+        self.data = {}
+        # called with (symbol, tf) whenever that timeframe receives data
+        self.listeners = []
 
-    def update_candle(self, tf, candle):
-        self.data[tf].append(candle)
+    def track(self, symbol):
+        symbol = symbol.upper()
 
-        if len(self.data[tf]) > 500:
-            self.data[tf] = self.data[tf][-500:]
+        if symbol not in self.data:
+            self.data[symbol] = {tf: TimeframeState(self.params) for tf in TIMEFRAMES}
 
-    def compute(self, tf):
-        candles = self.data[tf]
+        return self.data[symbol]
 
-        if len(candles) < 30:
-            return None
+    def untrack(self, symbol):
+        self.data.pop(symbol.upper(), None)
+
+    def symbols(self):
+        return list(self.data)
+
+    def update_candle(self, symbol, tf, candle):
+        state = self.track(symbol)[tf]
+
+        with state.lock:
+            state.update(candle)
+
+        self._changed(symbol, tf)
+
+    def update_forming(self, symbol, tf, candle):
+        state = self.track(symbol)[tf]
 
-        fractals = detect_fractals(candles)
+        with state.lock:
+            state.set_forming(candle)
 
-        if len(fractals) < 2:
+        self._changed(symbol, tf)
+
+    def load_history(self, symbol, tf, columns):
+        state = self.track(symbol)[tf]
+
+        with state.lock:
+            state.load(columns)
+
+        self._changed(symbol, tf)
+
+    def _changed(self, symbol, tf):
+        for listener in self.listeners:
+            listener(symbol.upper(), tf)
+
+    def compute(self, symbol, tf):
+        state = self.data[symbol.upper()][tf]
+
+        with state.lock:
+            if not state.dirty:
+                return state.result
+
+            state.dirty = False
+            crosses, state.crosses = state.crosses, []
+            state.result = self._build_result(symbol.upper(), tf, state, crosses)
+
+            return state.result
+
+    def _build_result(self, symbol, tf, state, crosses=()):
+        if len(state.bars) < 30:
             return None
 
-        last_high = next(f for f in reversed(fractals) if f["type"] == "high")
-        last_low = next(f for f in reversed(fractals) if f["type"] == "low")
+        fractals = state.fractals
 
-        anchor = fractals[-1]
-        vwap = anchored_vwap(candles, anchor["time"])
+        if fractals.count < 2 or not fractals.last_high or not fractals.last_low:
+            return None
 
-        closes = [c["close"] for c in candles]
-        macd_val, signal_val = macd(closes)
+        if state.forming:
+            price = state.forming["close"]
+            macd_val, signal_val = state.macd.preview(price)
+            vwap = state.vwap.preview(state.forming)
+        else:
+            price = float(state.bars.close[-1])
+            macd_val, signal_val = state.macd.value
+            vwap = state.vwap.value
 
-        fibs = fib_levels(last_high["price"], last_low["price"])
+        fibs = fib_levels(fractals.last_high["price"], fractals.last_low["price"], self.params.fib_ratios)
 
         trend = "bullish" if macd_val > signal_val else "bearish"
 
         return {
+            "symbol": symbol,
             "timeframe": tf,
-            "fractals": fractals[-10:],
+            "price": price,
+            "fractals": list(fractals.recent),
             "anchor_vwap": vwap,
             "macd": macd_val,
             "signal": signal_val,
             "fib_levels": fibs,
-            "trend": trend
-        }
\ No newline at end of file
+            "trend": trend,
+            "forming": state.forming is not None,
+            # closed-bar trend flips since the previous result
+            "crosses": list(crosses),
+        }
@@ -0,0 +1,55 @@
+# backend/strategy_params.py
+
+from dataclasses import dataclass, asdict, fields
+
+from indicators.fibonacci import FIB_RATIOS
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    """
+    Tunable parameters of the fractal / anchored VWAP / MACD / Fibonacci
+    strategy, shared by StrategyEngine and the backtester.
+
+    Entries use the deepest fib ratio as the long filter and the
+    shallowest as the short filter (0.618 / 0.382 by default).
+    """
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    fractal_width: int = 5
+    fib_ratios: tuple = FIB_RATIOS
+
+    def validate(self):
+        for name in ("macd_fast", "macd_slow", "macd_signal"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1")
+
+        if self.macd_fast >= self.macd_slow:
+            raise ValueError("macd_fast must be below macd_slow")
+
+        if self.fractal_width < 3 or self.fractal_width % 2 == 0:
+            raise ValueError("fractal_width must be an odd number >= 3")
+
+        if not self.fib_ratios:
+            raise ValueError("fib_ratios must not be empty")
+
+        return self
+
+    @property
+    def long_ratio(self):
+        return f"{max(self.fib_ratios):g}"
+
+    @property
+    def short_ratio(self):
+        return f"{min(self.fib_ratios):g}"
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def field_names(cls):
+        return [f.name for f in fields(cls)]
+
+
+DEFAULT_PARAMS = StrategyParams()
@@ -0,0 +1,30 @@
+# backend/tests/bars.py
+#
+# Synthetic OHLCV shared by the tests (seeded: every run sees the same bars).
+
+import numpy as np
+
+from core.candle_buffer import COLUMNS
+
+
+def make_ohlcv(n, seed=7):
+    """Random-walk OHLCV columns, one bar a minute."""
+    rng = np.random.default_rng(seed)
+    open_ = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    close = open_ + rng.normal(0, 0.3, n)
+
+    return {
+        "time": np.arange(n, dtype=np.int64) * 60,
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(n),
+        "low": np.minimum(open_, close) - rng.random(n),
+        "close": close,
+        "volume": rng.integers(100, 10_000, n).astype(np.float64),
+    }
+
+
+def to_candles(cols):
+    return [
+        {"time": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(*(cols[name].tolist() for name in COLUMNS))
+    ]
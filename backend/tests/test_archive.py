@@ -0,0 +1,82 @@
+# backend/tests/test_archive.py
+#
+#   cd backend && python -m pytest -q tests
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from backtest.archive import archive_rows, export_parquet, import_file, partitions, read_bars, write_bars
+from core.candle_buffer import COLUMNS
+
+# 2024-03-01 00:00:00 UTC
+DAY0 = 1709251200
+
+
+def bars(start, n, step=60, price=100.0):
+    time = np.arange(start, start + n * step, step, dtype=np.int64)
+    close = price + np.arange(n, dtype=np.float64)
+
+    return {"time": time, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": np.ones(n)}
+
+
+def test_intraday_bars_are_split_by_utc_day(tmp_path):
+    # 22:00 on day 0 to 02:00 on day 1
+    written = write_bars("AAPL", "1 min", bars(DAY0 + 22 * 3600, 240), root=str(tmp_path))
+
+    assert written == 2
+    assert partitions("AAPL", "1 min", root=str(tmp_path)) == ["2024-03-01", "2024-03-02"]
+
+    got = read_bars("AAPL", "1 min", root=str(tmp_path))
+    assert len(got["time"]) == 240
+    assert np.all(np.diff(got["time"]) == 60)
+
+
+def test_range_reads_and_zero_copy_views(tmp_path):
+    write_bars("AAPL", "1 min", bars(DAY0, 600), root=str(tmp_path))
+
+    got = read_bars("AAPL", "1 min", DAY0 + 60, DAY0 + 180, root=str(tmp_path))
+
+    assert got["time"].tolist() == [DAY0 + 60, DAY0 + 120]
+    # one partition: views of the mapped file, not copies
+    assert not got["close"].flags.writeable
+
+
+def test_rewrites_replace_bars_at_the_same_time(tmp_path):
+    write_bars("AAPL", "1 min", bars(DAY0, 10), root=str(tmp_path))
+    write_bars("AAPL", "1 min", bars(DAY0 + 5 * 60, 10, price=500.0), root=str(tmp_path))
+
+    got = read_bars("AAPL", "1 min", root=str(tmp_path))
+
+    assert len(got["time"]) == 15
+    assert got["close"][4] == 104.0 and got["close"][5] == 500.0
+
+
+def test_series_are_kept_apart(tmp_path):
+    root = str(tmp_path)
+    archive_rows("AAPL", "1 day", [(DAY0, 1, 1, 1, 1.0, 1)], root, "TRADES", False)
+    archive_rows("AAPL", "1 day", [(DAY0, 2, 2, 2, 2.0, 2)], root, "TRADES", True)
+    archive_rows("AAPL", "1 day", [(DAY0, 3, 3, 3, 3.0, 3)], root, "MIDPOINT", False)
+
+    assert read_bars("AAPL", "1 day", root=root)["close"].tolist() == [1.0]
+    assert read_bars("AAPL", "1 day", root=root, use_rth=True)["close"].tolist() == [2.0]
+    assert read_bars("AAPL", "1 day", root=root, what_to_show="MIDPOINT")["close"].tolist() == [3.0]
+    assert partitions("AAPL", "1 day", root=root) == ["2024"]
+
+
+def test_parquet_round_trip_keeps_the_series(tmp_path):
+    source, target = str(tmp_path / "a"), str(tmp_path / "b")
+    write_bars("EUR.USD", "1 hour", bars(DAY0, 48, step=3600), root=source, use_rth=True)
+
+    out = str(tmp_path / "eurusd.parquet")
+    assert export_parquet("EUR.USD", "1 hour", out, root=source, use_rth=True) == 48
+
+    assert import_file(out, root=target) == ("EUR.USD", "1 hour", 48)
+
+    # forex defaults to MIDPOINT, RTH from the export metadata
+    got = read_bars("EUR.USD", "1 hour", root=target, what_to_show="MIDPOINT", use_rth=True)
+    want = read_bars("EUR.USD", "1 hour", root=source, use_rth=True)
+
+    for name in COLUMNS:
+        assert np.array_equal(got[name], want[name])
@@ -0,0 +1,49 @@
+# backend/tests/test_backtest.py
+#
+#   cd backend && python -m pytest -q tests
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes_backtest import router
+from backtest.engine import run_backtest
+
+
+def test_empty_bars_give_zeroed_metrics():
+    bars = {name: np.zeros(0) for name in ("open", "high", "low", "close", "volume")}
+    bars["time"] = np.zeros(0, dtype=np.int64)
+
+    result = run_backtest(bars, "EMPTY")
+
+    assert len(result.equity) == 0 and len(result.position) == 0
+    assert result.stats == {
+        "bars": 0,
+        "final_equity": 100_000.0,
+        "total_return": 0.0,
+        "sharpe": 0.0,
+        "max_drawdown": 0.0,
+        "trades": 0,
+        "hit_rate": None,
+    }
+
+
+@pytest.mark.parametrize("params", [
+    {"fractal_width": 7.0},
+    {"fractal_width": "7"},
+    {"fractal_width": 4},
+    {"macd_fast": True},
+    {"macd_fast": 0},
+    {"macd_fast": 30},
+    {"fib_ratios": ["a"]},
+    {"fib_ratios": []},
+    {"unknown": 1},
+])
+def test_bad_params_are_rejected_with_422(params):
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).post("/api/backtest", json={"symbols": ["TEST"], "params": params})
+
+    assert response.status_code == 422
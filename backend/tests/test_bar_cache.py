@@ -0,0 +1,189 @@
+# backend/tests/test_bar_cache.py
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from services import bar_cache
+from services.bar_cache import BarCache, duration_seconds, format_end, parse_end
+
+KEY = BarCache.make_key(1, "1 min", "TRADES", True)
+STEP = 60
+# 2024-01-02 15:00:00 UTC
+NOW = 1704207600
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BarCache(str(tmp_path / "bars.sqlite"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOW]
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(now[0], tz)
+
+    monkeypatch.setattr(bar_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    monkeypatch.setattr(bar_cache, "datetime", FakeDatetime)
+    return now
+
+
+class FakeIB:
+    """reqHistoricalData stand-in: one bar per minute in the requested range."""
+
+    def __init__(self, clock, session_start=None):
+        self.clock = clock
+        self.session_start = session_start
+        self.calls = []
+
+    async def fetch(self, end_spec, duration):
+        self.calls.append((end_spec, duration))
+        end = parse_end(end_spec) if end_spec else self.clock[0]
+        start = end - duration_seconds(duration)
+
+        # day durations follow the session: IBKR returns less than asked
+        if self.session_start is not None and not duration.endswith("S"):
+            start = max(start, self.session_start)
+
+        first = -(-int(start) // STEP) * STEP
+        return [self.bar(ts) for ts in range(first, int(end), STEP)]
+
+    def bar(self, ts):
+        # the forming bar closes at the current clock
+        close = self.clock[0] if ts + STEP > self.clock[0] else ts
+        return SimpleNamespace(date=ts, open=ts, high=ts + 1, low=ts - 1, close=close, volume=1.0)
+
+
+def get(cache, ib, duration, end_spec=""):
+    return asyncio.run(cache.get_bars(KEY, "1 min", duration, end_spec, ib.fetch))
+
+
+# --------------------------------------------------
+# _gaps / _add_range
+# --------------------------------------------------
+def test_gaps_without_ranges(cache):
+    assert cache._gaps(KEY, 100, 200) == [(100, 200)]
+
+
+def test_gaps_between_and_around_ranges(cache):
+    cache._write(KEY, [], (120, 140))
+    cache._write(KEY, [], (160, 180))
+
+    assert cache._gaps(KEY, 100, 200) == [(100, 120), (140, 160), (180, 200)]
+    assert cache._gaps(KEY, 130, 170) == [(140, 160)]
+    assert cache._gaps(KEY, 120, 140) == []
+
+
+def test_overlapping_and_touching_ranges_merge(cache):
+    cache._write(KEY, [], (100, 150))
+    cache._write(KEY, [], (140, 200))
+    cache._write(KEY, [], (200, 250))
+
+    assert cache.db.execute('SELECT start, "end" FROM ranges').fetchall() == [(100, 250)]
+    assert cache._gaps(KEY, 50, 300) == [(50, 100), (250, 300)]
+
+
+def test_gaps_are_per_key(cache):
+    cache._write(KEY, [], (100, 200))
+
+    assert cache._gaps(BarCache.make_key(1, "1 min", "MIDPOINT", True), 100, 200) == [(100, 200)]
+
+
+# --------------------------------------------------
+# get_bars: absolute end
+# --------------------------------------------------
+def test_absolute_seconds_request_is_cached(cache, clock):
+    ib = FakeIB(clock)
+    end = format_end(NOW - 3600)
+
+    rows, source = get(cache, ib, "1800 S", end)
+    assert source == "ibkr"
+    assert len(rows) == 30
+    assert ib.calls == [(end, "1800 S")]
+
+    again, source = get(cache, ib, "1800 S", end)
+    assert source == "cache"
+    assert again == rows
+    assert len(ib.calls) == 1
+
+
+def test_absolute_request_fetches_only_the_missing_part(cache, clock):
+    ib = FakeIB(clock)
+    end = format_end(NOW - 3600)
+
+    get(cache, ib, "1800 S", end)
+    rows, source = get(cache, ib, "3600 S", end)
+
+    assert source == "partial"
+    assert len(rows) == 60
+    # only the earlier half is fetched, ending where the cached range starts
+    assert ib.calls[1] == (format_end(NOW - 3600 - 1800), "1800 S")
+
+
+def test_day_duration_learns_the_session_start(cache, clock):
+    session = NOW - 6 * 3600
+    ib = FakeIB(clock, session_start=session)
+    end = format_end(NOW - 60)
+
+    rows, source = get(cache, ib, "1 D", end)
+    assert source == "ibkr"
+    assert ib.calls == [(end, "1 D")]
+    assert rows[0][0] == session
+
+    again, source = get(cache, ib, "1 D", end)
+    assert source == "cache"
+    assert again == rows
+    assert len(ib.calls) == 1
+
+
+# --------------------------------------------------
+# get_bars: relative end
+# --------------------------------------------------
+def test_relative_request_returns_the_live_forming_bar(cache, clock):
+    clock[0] = NOW + 30
+    ib = FakeIB(clock)
+
+    rows, source = get(cache, ib, "600 S")
+    assert source == "ibkr"
+    assert rows[-1][0] == NOW and rows[-1][4] == NOW + 30
+
+    # same bar later on: closed bars from the cache, the forming one refetched
+    clock[0] = NOW + 50
+    rows, source = get(cache, ib, "600 S")
+
+    assert source == "cache"
+    assert ib.calls[-1] == ("", "50 S")
+    assert rows[-1][0] == NOW and rows[-1][4] == NOW + 50
+    assert cache._read(KEY, NOW, NOW + STEP) == []
+
+    # next minute: the bar that was forming is complete and cached, the new one is live
+    clock[0] = NOW + 90
+    rows, source = get(cache, ib, "600 S")
+
+    assert source == "partial"
+    assert ib.calls[-2:] == [(format_end(NOW + 60), "60 S"), ("", "30 S")]
+    assert [r[0] for r in rows[-2:]] == [NOW, NOW + 60]
+    assert rows[-2][4] == NOW and rows[-1][4] == NOW + 90
+    assert len(rows) == 10
+
+
+def test_relative_day_duration_relearns_each_day(cache, clock):
+    ib = FakeIB(clock, session_start=NOW - 3600)
+
+    assert get(cache, ib, "1 D")[1] == "ibkr"
+    assert get(cache, ib, "1 D")[1] == "cache"
+
+    clock[0] = NOW + 86400
+    ib.session_start = NOW + 86400 - 3600
+
+    assert get(cache, ib, "1 D")[1] == "ibkr"
+    # the cache hit only asks for the forming bar
+    assert ib.calls == [("", "1 D"), ("", "1 S"), ("", "1 D")]
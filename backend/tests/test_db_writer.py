@@ -0,0 +1,131 @@
+# backend/tests/test_db_writer.py
+#
+# BatchWriter on SQLite (aiosqlite) as a local stand-in for Postgres.
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.database import Base
+from db.models import Order, QuoteSnapshot, StrategySignal
+from db.writer import BatchWriter
+
+
+def quote(i):
+    return {"symbol": f"SYM{i % 5}", "bid": 100.0, "ask": 100.01, "last": 100.0, "volume": float(i)}
+
+
+def run(tmp_path, scenario, **kwargs):
+    """scenario(writer) -> {model: rows} read back after it ran."""
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite'}")
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        writer = BatchWriter(engine, **kwargs)
+        models = await scenario(writer)
+
+        async with engine.connect() as conn:
+            tables = {model: (await conn.execute(select(model.__table__))).mappings().all() for model in models}
+
+        await engine.dispose()
+        return writer, tables
+
+    return asyncio.run(main())
+
+
+def test_rows_are_batched_by_size_and_interval(tmp_path):
+    async def scenario(writer):
+        runner = asyncio.create_task(writer.run())
+
+        for i in range(250):
+            writer.write(QuoteSnapshot, quote(i))
+
+        # 2 full batches go out at once, the rest on the interval
+        await asyncio.sleep(0.3)
+        runner.cancel()
+
+        return [QuoteSnapshot]
+
+    writer, tables = run(tmp_path, scenario, batch_size=100, interval_ms=100)
+
+    assert len(tables[QuoteSnapshot]) == 250
+    assert writer.status()["written"] == 250 and writer.status()["queued"] == 0
+    assert writer.stats["flushes"] == 3
+
+
+def test_defaults_carry_the_write_time(tmp_path):
+    async def scenario(writer):
+        writer.written_at = datetime.utcnow()
+        writer.write(QuoteSnapshot, quote(0))
+
+        await asyncio.sleep(0.2)
+        await writer.close()
+
+        return [QuoteSnapshot]
+
+    writer, tables = run(tmp_path, scenario)
+
+    # utcnow at write(), not at the flush 200 ms later
+    assert tables[QuoteSnapshot][0]["timestamp"] - writer.written_at < timedelta(seconds=0.1)
+
+
+def test_full_queue_drops_new_rows(tmp_path):
+    async def scenario(writer):
+        results = [writer.write(QuoteSnapshot, quote(i)) for i in range(5)]
+        await writer.close()
+        writer.results = results
+
+        return [QuoteSnapshot]
+
+    writer, tables = run(tmp_path, scenario, max_queue=3)
+
+    assert writer.results == [True, True, True, False, False]
+    assert len(tables[QuoteSnapshot]) == 3
+    assert writer.stats["dropped"] == 2
+
+
+def test_a_bad_row_only_loses_itself(tmp_path):
+    async def scenario(writer):
+        writer.write(StrategySignal, {"symbol": "A", "timeframe": "1m", "signal_type": "BUY", "price": 1.0, "reason": ""})
+        writer.write(StrategySignal, {"symbol": "B", "timeframe": "1m", "signal_type": "SELL", "price": None, "reason": ""})
+        writer.write(StrategySignal, {"symbol": "C", "timeframe": "1m", "signal_type": "BUY", "price": 3.0, "reason": ""})
+        writer.write(QuoteSnapshot, quote(0))
+        await writer.close()
+
+        return [StrategySignal, QuoteSnapshot]
+
+    writer, tables = run(tmp_path, scenario)
+
+    # price is NOT NULL: B fails, the other signals and the quote table still go in
+    assert [r["symbol"] for r in tables[StrategySignal]] == ["A", "C"]
+    assert len(tables[QuoteSnapshot]) == 1
+    assert writer.stats["written"] == 3 and writer.stats["failed"] == 1
+
+
+def test_upsert_keeps_the_last_row_per_key(tmp_path):
+    def order(status):
+        return {"id": 7, "symbol": "AAPL", "side": "BUY", "quantity": 1.0, "status": status}
+
+    async def scenario(writer):
+        writer.update_on_conflict[Order.__table__] = ("status",)
+
+        writer.write(Order, order("Submitted"))
+        await writer.close()
+
+        # twice in one batch: one statement can't touch the row twice
+        writer.write(Order, order("PreSubmitted"))
+        writer.write(Order, order("Filled"))
+        await writer.close()
+
+        return [Order]
+
+    writer, tables = run(tmp_path, scenario)
+
+    assert [(r["id"], r["status"]) for r in tables[Order]] == [(7, "Filled")]
+    assert writer.stats["failed"] == 0
@@ -0,0 +1,125 @@
+# backend/tests/test_indicators.py
+#
+# List reference implementations vs the vectorized / streaming ones.
+#
+#   cd backend && python -m pytest -q tests
+
+import numpy as np
+import pytest
+
+from bars import make_ohlcv, to_candles
+from indicators.fibonacci import fib_levels
+from indicators.fractals import HIGH, LOW, StreamingFractals, detect_fractals, detect_fractals_np
+from indicators.macd import MACD_WEIGHTS_MAX_BARS, ema, ema_np, macd, macd_np, macd_series_np
+from indicators.vwap import anchored_vwap, anchored_vwap_np, anchored_vwap_series_np
+
+SIZES = (500, 5000)
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n}bars")
+def data(request):
+    cols = make_ohlcv(request.param)
+    return cols, to_candles(cols)
+
+
+# --------------------------------------------------
+# Fractals
+# --------------------------------------------------
+def test_fractals_fixture():
+    # one high at bar 2, one low at bar 5
+    high = np.array([1, 2, 5, 2, 1, 1, 2, 3.0])
+    low = np.array([0, 1, 4, 1, 0.5, 0, 1, 2.0])
+    fr = detect_fractals_np(high, low)
+
+    assert fr.index.tolist() == [2, 5]
+    assert fr.kind.tolist() == [HIGH, LOW]
+
+
+def test_fractals_np_matches_list_version(data):
+    cols, candles = data
+    fr = detect_fractals_np(cols["high"], cols["low"])
+
+    want = [
+        {"type": "high" if k == HIGH else "low", "time": int(cols["time"][i]), "price": float(p)}
+        for i, k, p in zip(fr.index, fr.kind, fr.price)
+    ]
+
+    assert detect_fractals(candles) == want
+
+
+def test_streaming_fractals_match_vectorized(data):
+    cols, candles = data
+    sf = StreamingFractals()
+
+    for c in candles:
+        sf.update(c)
+
+    fr = detect_fractals_np(cols["high"], cols["low"])
+
+    assert sf.count == len(fr.index)
+    assert sf.last_high["time"] == int(cols["time"][fr.index[fr.last_high]])
+    assert sf.last_low["time"] == int(cols["time"][fr.index[fr.last_low]])
+
+
+# --------------------------------------------------
+# Anchored VWAP
+# --------------------------------------------------
+def test_vwap_fixture():
+    # (2 x 1, 4 x 2) from the anchor on
+    assert anchored_vwap_np(np.arange(3), np.array([1.0, 2, 4]), np.array([1.0, 1, 2]), 1) == pytest.approx(10 / 3)
+
+
+def test_vwap_np_matches_list_version(data):
+    cols, candles = data
+    half = len(candles) // 2
+    anchor = int(cols["time"][half])
+    want = np.dot(cols["close"][half:], cols["volume"][half:]) / cols["volume"][half:].sum()
+
+    assert anchored_vwap(candles, anchor) == pytest.approx(want, rel=1e-9)
+    assert anchored_vwap_np(cols["time"], cols["close"], cols["volume"], anchor) == pytest.approx(want, rel=1e-9)
+
+
+def test_vwap_series_ends_at_the_anchored_value(data):
+    cols, _ = data
+    n = len(cols["close"])
+    anchor_idx = np.where(np.arange(n) >= n // 2, n // 2, -1)
+
+    series = anchored_vwap_series_np(cols["close"], cols["volume"], anchor_idx)
+    want = anchored_vwap_np(cols["time"], cols["close"], cols["volume"], int(cols["time"][n // 2]))
+
+    assert series[-1] == pytest.approx(want, rel=1e-7)
+
+
+# --------------------------------------------------
+# EMA / MACD
+# --------------------------------------------------
+def test_ema_fixture():
+    # alpha 0.5: 1, 2, 2.5
+    assert ema_np(np.array([1.0, 3.0, 3.0]), 3).tolist() == pytest.approx([1, 2, 2.5])
+
+
+def test_ema_np_matches_list_version(data):
+    cols, _ = data
+
+    assert np.max(np.abs(np.asarray(ema(cols["close"].tolist(), 26)) - ema_np(cols["close"], 26))) < 1e-8
+
+
+def test_macd_matches_the_series(data):
+    cols, _ = data
+    line, signal = macd_series_np(cols["close"])
+    want = (float(line[-1]), float(signal[-1]))
+
+    assert macd(cols["close"].tolist()) == pytest.approx(want, rel=1e-7)
+    assert macd_np(cols["close"]) == pytest.approx(want, rel=1e-7)
+
+
+def test_macd_np_above_the_weights_window():
+    closes = make_ohlcv(MACD_WEIGHTS_MAX_BARS + 500)["close"]
+
+    assert macd_np(closes) == pytest.approx(macd(closes.tolist()), rel=1e-7)
+
+
+def test_fib_levels():
+    got = fib_levels(110.0, 100.0)
+
+    assert {k: got[k] for k in ("0.382", "0.5", "0.618")} == pytest.approx({"0.382": 106.18, "0.5": 105.0, "0.618": 103.82})
@@ -0,0 +1,153 @@
+# backend/tests/test_order_manager.py
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from ib_insync import Fill, LimitOrder, Stock, Trade, TradeLogEntry
+from ib_insync.objects import Execution
+
+from db.models import Order, OrderEvent
+from services.order_manager import OrderManager, OrderNotFound
+
+CLIENT_ID = 17
+
+
+class Event:
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def emit(self, *args):
+        for handler in self.handlers:
+            handler(*args)
+
+
+class FakeIB:
+    def __init__(self):
+        self.client = SimpleNamespace(clientId=CLIENT_ID)
+        self.orderStatusEvent = Event()
+        self.execDetailsEvent = Event()
+        self.existing = []
+        self.next_id = 1
+
+    def placeOrder(self, contract, order):
+        order.orderId, order.clientId = self.next_id, CLIENT_ID
+        self.next_id += 1
+        trade = Trade(contract, order)
+        trade.orderStatus.status = "PendingSubmit"
+        return trade
+
+    def trades(self):
+        return self.existing
+
+    def openTrades(self):
+        return self.existing
+
+    def cancelOrder(self, order):
+        pass
+
+
+class FakeWriter:
+    def __init__(self):
+        self.rows = []
+        self.update_on_conflict = {}
+
+    def write(self, model, row):
+        self.rows.append((model, row))
+
+
+def status(ib, trade, value, perm_id=None):
+    if perm_id:
+        trade.order.permId = perm_id
+
+    trade.orderStatus.status = value
+    trade.log.append(TradeLogEntry(None, value, f"{value} message"))
+    ib.orderStatusEvent.emit(trade)
+
+
+@pytest.fixture
+def ib():
+    return FakeIB()
+
+
+@pytest.fixture
+def writer():
+    return FakeWriter()
+
+
+def test_wait_returns_once_the_order_is_acknowledged(ib, writer):
+    async def main():
+        manager = OrderManager(ib, writer)
+        trade = manager.place(Stock("AAPL", "SMART", "USD"), LimitOrder("BUY", 10, 100.0))
+
+        waiting = asyncio.create_task(manager.wait(trade.order.orderId, timeout=1))
+        await asyncio.sleep(0)
+        status(ib, trade, "PreSubmitted", perm_id=555)
+
+        return await waiting, manager
+
+    (trade, reached), manager = asyncio.run(main())
+
+    assert reached and trade.orderStatus.status == "PreSubmitted"
+    assert len(manager.ack_latency) == 1
+    assert manager.waiters == {}
+
+
+def test_wait_times_out_on_a_status_never_reached(ib, writer):
+    async def main():
+        manager = OrderManager(ib, writer)
+        trade = manager.place(Stock("AAPL", "SMART", "USD"), LimitOrder("BUY", 10, 100.0))
+        status(ib, trade, "Submitted", perm_id=555)
+
+        return await manager.wait(trade.order.orderId, ("Filled",), timeout=0.05)
+
+    trade, reached = asyncio.run(main())
+
+    assert not reached and trade.orderStatus.status == "Submitted"
+
+
+def test_events_wait_for_the_perm_id_and_the_row_follows_the_status(ib, writer):
+    manager = OrderManager(ib, writer)
+    trade = manager.place(Stock("AAPL", "SMART", "USD"), LimitOrder("BUY", 10, 100.0))
+
+    status(ib, trade, "PendingSubmit")
+    assert writer.rows == []
+
+    status(ib, trade, "Submitted", perm_id=555)
+    fill = Fill(trade.contract, Execution(shares=10, price=100.0, exchange="NASDAQ"), None, None)
+    ib.execDetailsEvent.emit(trade, fill)
+    status(ib, trade, "Filled")
+
+    orders = [row for model, row in writer.rows if model is Order]
+    events = [row for model, row in writer.rows if model is OrderEvent]
+
+    assert {row["id"] for row in orders} == {555}
+    assert orders[-1]["status"] == "Filled"
+    assert [e["status"] for e in events] == ["PendingSubmit", "Submitted", "Fill", "Filled"]
+    assert all(e["order_id"] == 555 for e in events)
+    assert events[0]["timestamp"] <= events[1]["timestamp"]
+    assert writer.update_on_conflict[Order.__table__] == ("status",)
+    assert len(manager.fill_latency) == 1
+
+
+def test_unknown_orders_raise_and_older_ones_are_found(ib, writer):
+    manager = OrderManager(ib, writer)
+
+    with pytest.raises(OrderNotFound):
+        manager.get(42)
+
+    # placed before this process started
+    old = Trade(Stock("MSFT", "SMART", "USD"), LimitOrder("SELL", 1, 300.0, orderId=42, clientId=CLIENT_ID))
+    other_client = Trade(Stock("MSFT", "SMART", "USD"), LimitOrder("SELL", 1, 300.0, orderId=43, clientId=99))
+    ib.existing = [old, other_client]
+
+    assert manager.get(42) is old
+
+    with pytest.raises(OrderNotFound):
+        manager.get(43)
@@ -0,0 +1,126 @@
+# backend/tests/test_pacing.py
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+import time
+
+from core.pacing import PRIORITY_HIGH, PRIORITY_NORMAL, IBScheduler, TokenBucket
+
+
+def scheduler(msg_rate=1000, **lanes):
+    return IBScheduler(lanes=lanes, msg_rate=msg_rate)
+
+
+async def timed(pacer, cls, log, label=None, **kwargs):
+    await pacer.acquire(cls, **kwargs)
+    log.append((label or cls, time.monotonic()))
+
+
+def test_token_bucket_burst_then_rate():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0])
+
+    for _ in range(3):
+        assert bucket.delay(now[0]) == 0
+        bucket.take(now[0])
+
+    assert bucket.delay(now[0]) == 0.5
+
+    now[0] = 0.5
+    assert bucket.delay(now[0]) == 0
+
+
+def test_lane_is_paced_after_its_burst():
+    async def main():
+        pacer = scheduler(historical=(20.0, 2, PRIORITY_NORMAL, 0.0))
+        log = []
+        started = time.monotonic()
+
+        await asyncio.gather(*(timed(pacer, "historical", log) for _ in range(4)))
+        return [t - started for _, t in log]
+
+    waits = asyncio.run(main())
+
+    # two from the burst, then one every 50 ms
+    assert waits[1] < 0.02
+    assert 0.04 <= waits[2] < 0.09
+    assert 0.09 <= waits[3] < 0.14
+
+
+def test_an_empty_lane_does_not_block_the_others():
+    async def main():
+        pacer = scheduler(
+            historical=(1.0, 1, PRIORITY_NORMAL, 0.0),
+            orders=(100.0, 10, PRIORITY_HIGH, 0.0),
+        )
+        log = []
+
+        await pacer.acquire("historical")
+        queued = asyncio.create_task(timed(pacer, "historical", log))
+        await asyncio.sleep(0)
+
+        # historical has no token for a second: orders go out regardless
+        await asyncio.wait_for(timed(pacer, "orders", log), 0.05)
+        queued.cancel()
+
+        return [label for label, _ in log]
+
+    assert asyncio.run(main()) == ["orders"]
+
+
+def test_priority_wins_when_the_global_limit_is_short():
+    async def main():
+        pacer = scheduler(
+            msg_rate=20,
+            historical=(1000.0, 100, PRIORITY_NORMAL, 0.0),
+            orders=(1000.0, 100, PRIORITY_HIGH, 0.0),
+        )
+        pacer.global_bucket.tokens = 0
+        log = []
+
+        tasks = [asyncio.create_task(timed(pacer, "historical", log)) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(timed(pacer, "orders", log)))
+
+        await asyncio.gather(*tasks)
+        return [label for label, _ in log]
+
+    assert asyncio.run(main())[0] == "orders"
+
+
+def test_identical_requests_keep_the_same_key_gap():
+    async def main():
+        pacer = scheduler(historical=(1000.0, 100, PRIORITY_NORMAL, 0.1))
+        log = []
+
+        await asyncio.gather(
+            timed(pacer, "historical", log, "a1", key="a"),
+            timed(pacer, "historical", log, "a2", key="a"),
+            timed(pacer, "historical", log, "b", key="b"),
+        )
+        return dict(log)
+
+    times = asyncio.run(main())
+
+    assert abs(times["b"] - times["a1"]) < 0.05
+    assert times["a2"] - times["a1"] >= 0.1
+
+
+def test_cancelled_waiters_are_dropped():
+    async def main():
+        pacer = scheduler(historical=(20.0, 1, PRIORITY_NORMAL, 0.0))
+        log = []
+
+        await pacer.acquire("historical")
+        gone = asyncio.create_task(timed(pacer, "historical", log, "gone"))
+        await asyncio.sleep(0)
+        gone.cancel()
+
+        await timed(pacer, "historical", log, "next")
+        return log, pacer.lanes["historical"]
+
+    log, lane = asyncio.run(main())
+
+    assert [label for label, _ in log] == ["next"]
+    assert lane.waiting == [] and lane.granted == 2
@@ -0,0 +1,171 @@
+# backend/tests/test_portfolio.py
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from db.models import AccountSnapshot, Position
+from services import portfolio as portfolio_module
+from services.portfolio import ACCOUNT, Portfolio
+
+
+@pytest.fixture(autouse=True)
+def no_pacing(monkeypatch):
+    async def acquire(lane):
+        pass
+
+    monkeypatch.setattr(portfolio_module.pacer, "acquire", acquire)
+
+
+class Event:
+    def __iadd__(self, handler):
+        return self
+
+
+class FakeIB:
+    def __init__(self):
+        for name in (
+            "connectedEvent", "positionEvent", "pnlEvent", "pnlSingleEvent", "accountValueEvent",
+            "accountSummaryEvent", "execDetailsEvent", "orderStatusEvent",
+        ):
+            setattr(self, name, Event())
+
+        self.position_list = [position("AAPL", 1, 10)]
+        self.value_list = [value("NetLiquidation", "100000"), value("TotalCashValue", "50000")]
+        self.accounts = ["U1"]
+        self.requests = []
+
+    def isConnected(self):
+        return False
+
+    def positions(self):
+        return self.position_list
+
+    def accountValues(self):
+        return self.value_list
+
+    def managedAccounts(self):
+        return self.accounts
+
+    def reqAccountSummaryAsync(self):
+        self.requests.append(("summary",))
+
+    def reqPnL(self, account):
+        self.requests.append(("pnl", account))
+
+    def reqPnLSingle(self, account, model, con_id):
+        self.requests.append(("pnlSingle", account, con_id))
+
+    def cancelPnLSingle(self, account, model, con_id):
+        self.requests.append(("cancelPnLSingle", account, con_id))
+
+
+class FakeWriter:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, model, row):
+        self.rows.append((model, row))
+
+
+def position(symbol, con_id, qty, account="U1"):
+    return SimpleNamespace(account=account, contract=SimpleNamespace(symbol=symbol, conId=con_id), position=qty, avgCost=1.5)
+
+
+def value(tag, v, account="U1", currency="USD"):
+    return SimpleNamespace(account=account, tag=tag, currency=currency, value=v)
+
+
+def make(ib=None, writer=None):
+    ib = ib or FakeIB()
+    pushed = []
+
+    async def publish(symbol, topic, data):
+        pushed.append((symbol, topic, data))
+
+    portfolio = Portfolio(ib, None, publish, writer)
+    portfolio.on_connected()
+
+    return ib, portfolio, pushed
+
+
+def test_views_are_encoded_once_per_version():
+    async def main():
+        _, portfolio, _ = make()
+        body, etag = portfolio.view("positions")
+
+        assert portfolio.view("positions")[1] == etag
+        assert json.loads(body)[0]["symbol"] == "AAPL"
+
+        portfolio.on_position(position("AAPL", 1, 20))
+        body2, etag2 = portfolio.view("positions")
+
+        return etag, etag2, json.loads(body2)
+
+    etag, etag2, rows = asyncio.run(main())
+
+    assert etag != etag2
+    assert rows[0]["position"] == 20
+
+
+def test_changes_are_pushed_and_pnl_subscribed_with_pacing():
+    async def main():
+        ib, portfolio, pushed = make()
+        await asyncio.sleep(0.01)
+
+        portfolio.on_pnl_single(SimpleNamespace(account="U1", conId=1, dailyPnL=5.0, unrealizedPnL=7.0, realizedPnL=0.0, value=3000.0))
+        portfolio.on_account_value(value("NetLiquidation", "100500"))
+        await portfolio.push()
+
+        return ib, portfolio, pushed
+
+    ib, portfolio, pushed = asyncio.run(main())
+
+    assert ("pnlSingle", "U1", 1) in ib.requests and ("pnl", "U1") in ib.requests
+    assert portfolio.positions[("U1", 1)]["marketPrice"] == 300.0
+
+    by_topic = {(s, t): d for s, t, d in pushed}
+    assert by_topic[("AAPL", "position")]["unrealizedPnL"] == 7.0
+    assert by_topic[(ACCOUNT, "U1")]["NetLiquidation:USD"] == "100500"
+
+
+def test_reconnect_drops_state_that_is_gone():
+    async def main():
+        ib, portfolio, pushed = make()
+        await asyncio.sleep(0.01)
+        portfolio.on_pnl(SimpleNamespace(account="U1", dailyPnL=1.0, unrealizedPnL=2.0, realizedPnL=3.0))
+
+        # position closed while disconnected; a second account the library doesn't sync
+        ib.position_list, ib.value_list, ib.accounts = [], [], ["U1", "U2"]
+        portfolio.on_connected()
+        await portfolio.push()
+        await asyncio.sleep(0.01)
+
+        return ib, portfolio, pushed
+
+    ib, portfolio, pushed = asyncio.run(main())
+
+    assert portfolio.positions == {} and portfolio.values == {} and portfolio.pnl == {}
+    assert ("AAPL", "position", {"type": "position", "account": "U1", "symbol": "AAPL", "conId": 1, "position": 0}) in pushed
+    assert ("summary",) in ib.requests
+    assert json.loads(portfolio.view("positions")[0]) == []
+
+
+def test_samples_only_what_changed():
+    writer = FakeWriter()
+
+    async def main():
+        _, portfolio, _ = make(writer=writer)
+        portfolio.sample()
+        portfolio.sample()
+
+        return portfolio
+
+    asyncio.run(main())
+
+    assert [model for model, _ in writer.rows] == [Position, AccountSnapshot]
+    assert writer.rows[1][1]["net_liquidation"] == 100000.0
@@ -0,0 +1,122 @@
+# backend/tests/test_strategy_engine.py
+#
+#   cd backend && python -m pytest -q tests
+
+import numpy as np
+import pytest
+
+from bars import make_ohlcv, to_candles
+from indicators.fractals import detect_fractals_np
+from indicators.macd import macd_series_np
+from indicators.vwap import anchored_vwap_np
+from services.bar_aggregator import BarAggregator
+from strategy_engine import StrategyEngine
+
+STEP = 60
+START = 1704204000
+
+
+def history(n, end):
+    time = np.arange(end - n * STEP, end, STEP, dtype=np.int64)
+    close = 100 + np.sin(np.arange(n) / 5)
+
+    return {"time": time, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": np.ones(n)}
+
+
+def candle(ts, price):
+    return {"time": ts, "open": price, "high": price, "low": price, "close": price, "volume": 1.0}
+
+
+def test_history_fills_in_before_live_bars():
+    engine = StrategyEngine()
+    live = START + 100 * STEP
+    engine.update_candle("TEST", "1m", candle(live, 50.0))
+
+    # history overlapping the live bar: only the part before it is kept
+    engine.load_history("TEST", "1m", history(120, live + 20 * STEP))
+
+    bars = engine.data["TEST"]["1m"].bars
+    assert len(bars) == 101
+    assert list(np.diff(bars.time)) == [STEP] * 100
+    assert bars.close[-1] == 50.0
+
+
+def test_seeded_forming_bar_merges_ticks():
+    engine = StrategyEngine()
+    aggregator = BarAggregator(engine, ("1m",))
+    engine.load_history("TEST", "1m", history(60, START))
+
+    aggregator.seed("TEST", "1m", {"time": START, "open": 10, "high": 12, "low": 9, "close": 11, "volume": 5})
+    aggregator.on_tick("TEST", START + 30, 13, 2)
+    aggregator.on_tick("TEST", START + STEP, 14, 1)
+
+    bars = engine.data["TEST"]["1m"].bars
+    assert bars.time[-1] == START
+    assert (bars.open[-1], bars.high[-1], bars.low[-1], bars.close[-1], bars.volume[-1]) == (10, 13, 9, 13, 7)
+    assert engine.data["TEST"]["1m"].forming["time"] == START + STEP
+
+
+def test_seed_leaves_a_tick_built_bar_alone():
+    engine = StrategyEngine()
+    aggregator = BarAggregator(engine, ("1m",))
+
+    aggregator.on_tick("TEST", START + 5, 20, 1)
+    aggregator.seed("TEST", "1m", {"time": START, "open": 10, "high": 12, "low": 9, "close": 11, "volume": 5})
+
+    assert aggregator.forming[("TEST", "1m")]["open"] == 20
+
+
+# --------------------------------------------------
+# Streaming state vs the vectorized indicators
+# --------------------------------------------------
+def loaded_engine(n=2000):
+    cols = make_ohlcv(n)
+    engine = StrategyEngine()
+    engine.load_history("TEST", "1m", cols)
+
+    return engine, cols
+
+
+def test_load_matches_vectorized_macd_over_the_buffer():
+    engine, cols = loaded_engine()
+    result = engine.compute("TEST", "1m")
+
+    # only the last 500 bars are kept and seeded
+    line, signal = macd_series_np(cols["close"][-500:])
+
+    assert result is not None and not result["forming"]
+    assert (result["macd"], result["signal"]) == pytest.approx((line[-1], signal[-1]), rel=1e-7)
+
+
+def test_streamed_bars_match_vectorized_indicators():
+    engine, cols = loaded_engine(500)
+    streamed = to_candles(make_ohlcv(600, seed=8))
+    offset = int(cols["time"][-1]) + STEP
+
+    for i, c in enumerate(streamed):
+        engine.update_candle("TEST", "1m", {**c, "time": offset + i * STEP})
+
+    result = engine.compute("TEST", "1m")
+    state = engine.data["TEST"]["1m"]
+    bars = state.bars
+
+    # MACD: EMA recurrence over the seed window plus every streamed close
+    line, signal = macd_series_np(np.concatenate([cols["close"], [c["close"] for c in streamed]]))
+    assert (result["macd"], result["signal"]) == pytest.approx((line[-1], signal[-1]), rel=1e-7)
+
+    fr = detect_fractals_np(bars.high, bars.low)
+    assert state.fractals.last_high["time"] == int(bars.time[fr.index[fr.last_high]])
+    assert state.fractals.last_low["time"] == int(bars.time[fr.index[fr.last_low]])
+
+    want = anchored_vwap_np(bars.time, bars.close, bars.volume, state.vwap.anchor_time)
+    assert result["anchor_vwap"] == pytest.approx(want, rel=1e-7)
+
+
+def test_unchanged_state_is_not_recomputed():
+    engine, _ = loaded_engine(500)
+    first = engine.compute("TEST", "1m")
+
+    assert engine.compute("TEST", "1m") is first
+
+    engine.update_forming("TEST", "1m", candle(int(engine.data["TEST"]["1m"].bars.time[-1]) + STEP, 100.0))
+    assert engine.compute("TEST", "1m") is not first
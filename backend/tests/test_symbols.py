@@ -0,0 +1,99 @@
+# backend/tests/test_symbols.py
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core import symbols
+from core.symbols import SymbolIndex
+
+LISTING = """Symbol|Security Name|Market Category
+AAPL|Apple Inc. - Common Stock|Q
+AMD|Advanced Micro Devices, Inc. - Common Stock|Q
+AMZN|Amazon.com, Inc. - Common Stock|Q
+MSFT|Microsoft Corporation - Common Stock|Q
+A|Agilent Technologies, Inc. Common Stock|N
+File Creation Time: 0101202400:00||
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "nasdaqlisted.txt"
+    path.write_text(LISTING)
+
+    index = SymbolIndex(str(tmp_path / "symbols.sqlite"))
+    assert index.load_file(str(path)) == 5
+
+    return index
+
+
+def found(results):
+    return [e["symbol"] for e in results]
+
+
+def test_exact_then_prefix_then_name_word(index):
+    # exact symbol first, shorter symbols before longer ones
+    assert found(index.search("a"))[:4] == ["A", "AMD", "AAPL", "AMZN"]
+    assert found(index.search("micro")) == ["AMD", "MSFT"]
+    assert index.search("apple")[0]["name"] == "Apple Inc. - Common Stock"
+
+
+def test_fuzzy_fallback_for_typos(index):
+    assert found(index.search("APPL"))[0] == "AAPL"
+    assert found(index.search("amazn"))[0] == "AMZN"
+
+
+def test_entries_persist_and_updates_reindex_the_name(index, tmp_path):
+    index.add([{"symbol": "AMD", "name": "Renamed Chips"}])
+
+    reopened = SymbolIndex(str(tmp_path / "symbols.sqlite"))
+
+    assert len(reopened) == 5
+    assert found(reopened.search("renamed")) == ["AMD"]
+    assert "AMD" not in found(reopened.search("micro"))
+
+
+def test_repeated_queries_are_served_from_the_cache(index):
+    first = index.search("am")
+
+    assert index.search("am") is first
+    assert index.stats["cached"] == 1
+
+    # any change drops the cache
+    index.add([{"symbol": "AMAT", "name": "Applied Materials"}])
+    assert "AMAT" in found(index.search("am"))
+
+
+def test_misses_go_to_ibkr_once_and_empty_answers_are_retried(index, monkeypatch):
+    calls = []
+    replies = [[], [SimpleNamespace(contract=SimpleNamespace(
+        symbol="ZZZT", description="Zed Corp", secType="STK", primaryExchange="NASDAQ", exchange="SMART",
+    ))]]
+
+    async def matching(q):
+        calls.append(q)
+        await asyncio.sleep(0.01)
+        return replies.pop(0)
+
+    async def acquire(cls, **kwargs):
+        pass
+
+    monkeypatch.setattr(symbols.ib, "reqMatchingSymbolsAsync", matching, raising=False)
+    monkeypatch.setattr(symbols.pacer, "acquire", acquire)
+
+    async def main():
+        # concurrent misses share one request; the empty answer is not final
+        first = await asyncio.gather(index.lookup("zzzt"), index.lookup("ZZZT"))
+        assert first == [[], []] and calls == ["ZZZT"]
+        assert not index.is_miss("ZZZT")
+
+        index.fetched["ZZZT"] = 0
+        return await index.lookup("zzzt")
+
+    assert found(asyncio.run(main())) == ["ZZZT"]
+    assert calls == ["ZZZT", "ZZZT"]
+    assert not index.is_miss("ZZZT")
@@ -0,0 +1,185 @@
+# backend/tests/test_ws_manager.py
+#
+#   cd backend && python -m pytest -q tests
+
+import asyncio
+import json
+
+from ws.manager import Client, ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, block=None):
+        self.sent = []
+        self.closed = None
+        # set: every send waits for it
+        self.block = block
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.block is not None:
+            await self.block.wait()
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+async def drain(manager):
+    for _ in range(100):
+        if not any(c.queue for c in manager.clients.values()):
+            break
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+async def close(manager):
+    tasks = [c.task for c in manager.clients.values()]
+
+    for ws in list(manager.clients):
+        manager.disconnect(ws)
+
+    await asyncio.wait(tasks, timeout=1)
+
+
+async def subscribe(manager, ws, **msg):
+    await manager.handle(ws, json.dumps({"op": "subscribe", **msg}))
+
+
+# --------------------------------------------------
+# Client queue
+# --------------------------------------------------
+def test_newer_message_replaces_the_unsent_one_in_place():
+    async def main():
+        client = Client(FakeSocket(), max_queue=10)
+
+        client.enqueue(("A", "1m"), "a1")
+        client.enqueue(("B", "1m"), "b1")
+        outcome = client.enqueue(("A", "1m"), "a2")
+
+        return outcome, [(k, p) for k, (p, _) in client.queue.items()]
+
+    outcome, queue = asyncio.run(main())
+
+    assert outcome == "conflated"
+    assert queue == [(("A", "1m"), "a2"), (("B", "1m"), "b1")]
+
+
+def test_full_queue_drops_the_oldest_topic_and_marks_it_stale():
+    async def main():
+        client = Client(FakeSocket(), max_queue=2)
+
+        client.enqueue("a", 1)
+        client.enqueue("b", 2)
+        outcome = client.enqueue("c", 3)
+
+        return outcome, list(client.queue), client.needs_full("a")
+
+    assert asyncio.run(main()) == ("dropped", ["b", "c"], True)
+
+
+# --------------------------------------------------
+# Fan-out
+# --------------------------------------------------
+def test_subscribers_only_get_their_topics():
+    async def main():
+        manager = ConnectionManager(channel="test")
+        aapl, everything, legacy = FakeSocket(), FakeSocket(), FakeSocket()
+
+        for ws in (aapl, everything, legacy):
+            await manager.connect(ws)
+
+        await subscribe(manager, aapl, symbol="aapl", tf="5m")
+        await subscribe(manager, everything, symbol="MSFT")
+
+        await manager.publish("AAPL", "1m", {"price": 1})
+        await manager.publish("AAPL", "5m", {"price": 2})
+        await manager.publish("MSFT", "1h", {"price": 3})
+        await drain(manager)
+        await close(manager)
+
+        return [[m["price"] for m in ws.sent] for ws in (aapl, everything, legacy)]
+
+    assert asyncio.run(main()) == [[2], [3], [1, 2, 3]]
+
+
+def test_delta_clients_get_changed_keys_only():
+    async def main():
+        manager = ConnectionManager(channel="test")
+        ws = FakeSocket()
+        await manager.connect(ws)
+
+        await manager.publish("AAPL", "1m", {"price": 1, "trend": "bullish"})
+        await subscribe(manager, ws, symbol="AAPL", delta=True)
+        await drain(manager)
+
+        await manager.publish("AAPL", "1m", {"price": 2, "trend": "bullish"})
+        await drain(manager)
+        await manager.publish("AAPL", "1m", {"price": 2, "trend": "bullish"})
+        await drain(manager)
+        await close(manager)
+
+        return ws.sent
+
+    sent = asyncio.run(main())
+
+    # current state on subscribe, then the change; the identical result is skipped
+    assert sent == [
+        {"price": 1, "trend": "bullish"},
+        {"type": "delta", "symbol": "AAPL", "timeframe": "1m", "changes": {"price": 2}},
+    ]
+
+
+# --------------------------------------------------
+# Slow clients
+# --------------------------------------------------
+def test_blocked_client_is_disconnected_without_holding_up_the_others():
+    async def main():
+        manager = ConnectionManager(send_timeout=0.05, channel="test")
+        slow, fast = FakeSocket(block=asyncio.Event()), FakeSocket()
+
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        await manager.broadcast({"symbol": "AAPL", "timeframe": "1m", "price": 1})
+        await drain(manager)
+        delivered = len(fast.sent)
+
+        await asyncio.sleep(0.1)
+        remaining = len(manager.clients)
+        await close(manager)
+
+        return delivered, remaining, manager
+
+    delivered, remaining, manager = asyncio.run(main())
+
+    assert delivered == 1
+    assert remaining == 1
+    assert manager.counters["slowDisconnects"] == 1
+
+
+def test_lagging_client_is_disconnected():
+    async def main():
+        manager = ConnectionManager(send_timeout=10, max_lag=0.05, channel="test")
+        slow = FakeSocket(block=asyncio.Event())
+        await manager.connect(slow)
+
+        # first message is stuck in send, the second waits in the queue
+        await manager.publish("AAPL", "1m", {"price": 1})
+        await asyncio.sleep(0)
+        await manager.publish("AAPL", "1m", {"price": 2})
+        await asyncio.sleep(0.1)
+        await manager.publish("AAPL", "1m", {"price": 3})
+        await asyncio.sleep(0)
+
+        return manager, slow
+
+    manager, slow = asyncio.run(main())
+
+    assert manager.clients == {}
+    assert slow.closed == 1013
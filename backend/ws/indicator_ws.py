@@ -4,7 +4,7 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from .manager import ConnectionManager
 
 router = APIRouter()
-manager = ConnectionManager()
+manager = ConnectionManager(channel="indicator")
 
 
 @router.websocket("/ws/indicators")
@@ -5,7 +5,7 @@ from ws.manager import ConnectionManager
 
 router = APIRouter()
 
-manager = ConnectionManager()
+manager = ConnectionManager(channel="indicators")
 
 
 @router.websocket("/ws/indicators")
@@ -16,12 +16,18 @@ async def websocket_indicators(ws: WebSocket):
 
     try:
         while True:
-            await ws.receive_text()
+            # {"op": "subscribe" | "unsubscribe", "symbol", "tf", "format", "delta"}
+            await manager.handle(ws, await ws.receive_text())
 
     except WebSocketDisconnect:
         manager.disconnect(ws)
         print("[indicators.py] client disconnected")
 
 
+@router.get("/api/ws/indicators/stats")
+async def indicator_ws_stats():
+    return manager.stats()
+
+
 async def broadcast_indicator(data: dict):
     await manager.broadcast(data)
\ No newline at end of file
@@ -1,55 +1,350 @@
 # backend/ws/manager.py
 
+import asyncio
+import itertools
+import json
+import time
+from collections import OrderedDict, deque
+
 from fastapi import WebSocket
 
+from core.config import WS_QUEUE_MAX, WS_SEND_TIMEOUT, WS_MAX_LAG
+from core.metrics import Gauge, ws_disconnects_total, ws_messages_total, ws_send_seconds
+
+try:
+    import msgpack
+except ImportError:  # binary format is optional
+    msgpack = None
+
+ALL = "*"
+FORMATS = ("json", "msgpack")
+
+# every ConnectionManager, for the queue depth / client gauges
+managers = []
+
+
+def encode(data, fmt):
+    if fmt == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+
+    return json.dumps(data, separators=(",", ":"))
+
+
+def diff(previous, current):
+    """Top-level keys whose value changed (None = nothing to compare against)."""
+    if previous is None:
+        return None
+
+    return {k: v for k, v in current.items() if previous.get(k) != v}
+
+
+class Client:
+    """
+    One websocket plus its outbound queue and sender task.
+
+    The queue holds at most one pending message per topic: a newer
+    result replaces the unsent one (conflate-latest) and keeps its place
+    in line. Past max_queue distinct entries the oldest is dropped.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue=256):
+        self.websocket = websocket
+        # (symbol, tf) pairs; tf == ALL matches every timeframe
+        self.topics = set()
+        self.subscribed = False
+        self.format = "json"
+        self.delta = False
+
+        self.max_queue = max_queue
+        self.queue = OrderedDict()
+        # topics whose last update was dropped or merged: next one goes out in full
+        self.stale = set()
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.closed = False
+
+    def wants(self, symbol, tf):
+        # clients that never subscribed keep getting everything
+        if not self.subscribed:
+            return True
+
+        return (symbol, tf) in self.topics or (symbol, ALL) in self.topics
+
+    def symbols(self):
+        return {symbol for symbol, _ in self.topics}
+
+    def needs_full(self, topic):
+        return topic in self.queue or topic in self.stale
+
+    def enqueue(self, key, payload):
+        """Queue payload under key; returns "conflated", "dropped" or None."""
+        now = time.monotonic()
+        self.wakeup.set()
+
+        if key in self.queue:
+            self.queue[key] = (payload, self.queue[key][1])
+            return "conflated"
+
+        self.stale.discard(key)
+        self.queue[key] = (payload, now)
+
+        if len(self.queue) > self.max_queue:
+            dropped, _ = self.queue.popitem(last=False)
+            self.stale.add(dropped)
+            return "dropped"
+
+        return None
+
+    def lag(self, now):
+        """Age of the oldest unsent message (s)."""
+        if not self.queue:
+            return 0.0
+
+        return now - next(iter(self.queue.values()))[1]
+
+    async def send(self, payload):
+        if isinstance(payload, bytes):
+            await self.websocket.send_bytes(payload)
+        else:
+            await self.websocket.send_text(payload)
+
 
 class ConnectionManager:
-    def __init__(self):
+    """
+    Topic fan-out for websocket clients.
+
+    Clients pick what they receive with
+        {"op": "subscribe", "symbol": "AAPL", "tf": "5m", "format": "msgpack", "delta": true}
+    ("tf" omitted = all timeframes, "op": "unsubscribe" to drop a topic).
+    Each published message is encoded once per (format, full/delta)
+    variant and the same bytes are queued for every subscriber.
+
+    Delta clients get the full payload on subscribe and afterwards only
+    {"type": "delta", "symbol", "timeframe", "changes"} with the
+    top-level keys that changed. When a delta would be merged into an
+    unsent update or its predecessor was dropped, the full payload is
+    queued instead.
+
+    publish() only queues; each client has its own sender task, so a
+    slow socket never delays the others or the caller. A client whose
+    send blocks longer than send_timeout, or whose oldest queued message
+    is older than max_lag, is disconnected.
+    """
+
+    def __init__(self, max_queue=WS_QUEUE_MAX, send_timeout=WS_SEND_TIMEOUT, max_lag=WS_MAX_LAG, channel="ws"):
+        self.channel = channel
         self.active_connections = []
+        self.clients = {}
+        self.last = {}
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.max_lag = max_lag
+        self._control = itertools.count()
+
+        # callbacks (symbol, added) when a symbol gains / loses a subscriber
+        self.topic_listeners = []
+
+        self.counters = {"sent": 0, "conflated": 0, "dropped": 0, "slowDisconnects": 0}
+        self.latencies = deque(maxlen=1000)
+
+        # /metrics children resolved once, not per message
+        self.metrics = {
+            outcome: ws_messages_total.labels(channel, outcome) for outcome in ("sent", "conflated", "dropped")
+        }
+        self.send_seconds = ws_send_seconds.labels(channel)
+        managers.append(self)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
+        client = Client(websocket, self.max_queue)
+
         self.active_connections.append(websocket)
+        self.clients[websocket] = client
+        client.task = asyncio.create_task(self._sender(client))
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
 
-    async def broadcast(self, data: dict):
-        disconnected = []
+        client = self.clients.pop(websocket, None)
+
+        if client is None:
+            return
 
-        for connection in self.active_connections:
+        # the flag ends the sender even if wait_for swallows the cancel (3.11)
+        client.closed = True
+        client.wakeup.set()
+
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+        for symbol in client.symbols():
+            self._topic_changed(symbol, False)
+
+    def _topic_changed(self, symbol, added):
+        for listener in self.topic_listeners:
+            try:
+                listener(symbol, added)
+            except Exception as e:
+                print(f"[manager.py] topic listener failed: {e}")
+
+    def _kick(self, client, reason):
+        print(f"[manager.py] disconnecting slow client: {reason}")
+        self.counters["slowDisconnects"] += 1
+        ws_disconnects_total.labels(self.channel).inc()
+        self.disconnect(client.websocket)
+
+        async def close():
             try:
-                await connection.send_json(data)
+                await asyncio.wait_for(client.websocket.close(code=1013), self.send_timeout)
             except Exception:
-                disconnected.append(connection)
+                pass
+
+        asyncio.create_task(close())
+
+    async def _sender(self, client):
+        try:
+            while not client.closed:
+                await client.wakeup.wait()
+                client.wakeup.clear()
+
+                while client.queue and not client.closed:
+                    _, (payload, since) = client.queue.popitem(last=False)
+
+                    await asyncio.wait_for(client.send(payload), self.send_timeout)
+
+                    latency = time.monotonic() - since
+                    self.counters["sent"] += 1
+                    self.latencies.append(latency)
+                    self.metrics["sent"].inc()
+                    self.send_seconds.observe(latency)
+
+        except asyncio.TimeoutError:
+            self._kick(client, f"send blocked > {self.send_timeout}s")
+        except Exception:
+            self.disconnect(client.websocket)
+
+    def _reply(self, client, data):
+        client.enqueue(("control", next(self._control)), encode(data, client.format))
+
+    # --------------------------------------------------
+    # Client -> server
+    # --------------------------------------------------
+    async def handle(self, websocket: WebSocket, message: str):
+        client = self.clients.get(websocket)
+
+        if client is None:
+            return
+
+        try:
+            msg = json.loads(message)
+            op = msg["op"]
+            symbol = str(msg["symbol"]).upper()
+        except (ValueError, KeyError, TypeError):
+            self._reply(client, {"type": "error", "error": "expected {op, symbol[, tf]}"})
+            return
+
+        topic = (symbol, msg.get("tf") or ALL)
+        had_symbol = symbol in client.symbols()
+
+        if op == "subscribe":
+            fmt = msg.get("format", client.format)
+
+            if fmt not in FORMATS or (fmt == "msgpack" and msgpack is None):
+                self._reply(client, {"type": "error", "error": f"unsupported format {fmt}"})
+                return
 
-        for dead in disconnected:
-            self.disconnect(dead)
+            client.format = fmt
+            client.delta = bool(msg.get("delta", client.delta))
+            client.subscribed = True
+            client.topics.add(topic)
+
+            if not had_symbol:
+                self._topic_changed(symbol, True)
+
+            # current state right away so deltas have a base
+            for (s, tf), data in list(self.last.items()):
+                if s == symbol and topic[1] in (ALL, tf):
+                    client.enqueue((s, tf), encode(data, client.format))
+
+        elif op == "unsubscribe":
+            client.topics.discard(topic)
+
+            if topic[1] == ALL:
+                client.topics = {t for t in client.topics if t[0] != symbol}
+
+            if had_symbol and symbol not in client.symbols():
+                self._topic_changed(symbol, False)
+
+    # --------------------------------------------------
+    # Server -> clients
+    # --------------------------------------------------
+    async def publish(self, symbol, tf, data: dict):
+        topic = (symbol, tf)
+        previous = self.last.get(topic)
+        self.last[topic] = data
+
+        changes = diff(previous, data)
+        encoded = {}
+
+        def payload(delta, fmt):
+            if (fmt, delta) not in encoded:
+                body = {"type": "delta", "symbol": symbol, "timeframe": tf, "changes": changes} if delta else data
+                encoded[(fmt, delta)] = encode(body, fmt)
+
+            return encoded[(fmt, delta)]
+
+        now = time.monotonic()
+
+        for client in list(self.clients.values()):
+            if not client.wants(symbol, tf):
+                continue
+
+            delta = client.delta and changes is not None and not client.needs_full(topic)
+
+            # identical result: nothing new for a delta client
+            if delta and not changes:
+                continue
+
+            outcome = client.enqueue(topic, payload(delta, client.format))
+
+            if outcome:
+                self.counters[outcome] += 1
+                self.metrics[outcome].inc()
+
+            if client.lag(now) > self.max_lag:
+                self._kick(client, f"lagging {client.lag(now):.1f}s")
+
+    async def broadcast(self, data: dict):
+        await self.publish(data.get("symbol"), data.get("timeframe"), data)
 
-# # backend/ws/manager.py
+    def stats(self):
+        depths = [len(c.queue) for c in self.clients.values()]
+        latencies = sorted(self.latencies)
 
-# from fastapi import WebSocket
-# from typing import List
-# import json
+        return {
+            "clients": len(self.clients),
+            "queued": sum(depths),
+            "maxQueue": max(depths, default=0),
+            **self.counters,
+            "sendLatencyMs": {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                "p99": round(latencies[int(len(latencies) * 0.99)] * 1000, 3) if latencies else 0.0,
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+        }
 
 
-# class ConnectionManager:
-#     def __init__(self):
-#         self.active_connections: List[WebSocket] = []
+def _by_channel(value):
+    totals = {}
 
-#     async def connect(self, websocket: WebSocket):
-#         await websocket.accept()
-#         self.active_connections.append(websocket)
-#         print(f"[manager.py] 연결 추가 | 현재 연결 수: {len(self.active_connections)}")
+    for m in managers:
+        totals[(m.channel,)] = totals.get((m.channel,), 0) + value(m)
 
-#     def disconnect(self, websocket: WebSocket):
-#         self.active_connections.remove(websocket)
-#         print(f"[manager.py] 연결 제거 | 현재 연결 수: {len(self.active_connections)}")
+    return totals
 
-#     async def send_personal(self, message: dict, websocket: WebSocket):
-#         await websocket.send_text(json.dumps(message))
 
-#     async def broadcast(self, message: dict):
-#         for connection in self.active_connections:
-#             await connection.send_text(json.dumps(message))
+Gauge("ws_clients", "connected websocket clients", ("channel",),
+      fn=lambda: _by_channel(lambda m: len(m.clients)))
+Gauge("ws_queue_depth", "messages queued for websocket clients", ("channel",),
+      fn=lambda: _by_channel(lambda m: sum(len(c.queue) for c in list(m.clients.values()))))
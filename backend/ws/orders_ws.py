@@ -0,0 +1,25 @@
+# backend/ws/orders_ws.py
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from .manager import ConnectionManager
+
+router = APIRouter()
+manager = ConnectionManager(channel="orders")
+
+
+@router.websocket("/ws/orders")
+async def websocket_orders(ws: WebSocket):
+    await manager.connect(ws)
+
+    try:
+        while True:
+            # {"op": "subscribe", "symbol"}: only that symbol's orders
+            await manager.handle(ws, await ws.receive_text())
+    except WebSocketDisconnect:
+        manager.disconnect(ws)
+        print("[orders_ws.py] orders 연결 종료")
+
+
+async def publish_order(state: dict):
+    # one topic per order: a slow client only keeps each order's latest state
+    await manager.publish(state["symbol"], f"order:{state['orderId']}", {"type": "order", **state})
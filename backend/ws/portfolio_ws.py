@@ -0,0 +1,25 @@
+# backend/ws/portfolio_ws.py
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from .manager import ConnectionManager
+
+router = APIRouter()
+manager = ConnectionManager(channel="portfolio")
+
+
+@router.websocket("/ws/portfolio")
+async def websocket_portfolio(ws: WebSocket):
+    await manager.connect(ws)
+
+    try:
+        while True:
+            # {"op": "subscribe", "symbol", "delta": true}; symbol "ACCOUNT" for account values / PnL
+            await manager.handle(ws, await ws.receive_text())
+    except WebSocketDisconnect:
+        manager.disconnect(ws)
+        print("[portfolio_ws.py] portfolio 연결 종료")
+
+
+@router.get("/api/ws/portfolio/stats")
+async def portfolio_ws_stats():
+    return manager.stats()
@@ -6,7 +6,7 @@ from datetime import datetime
 from .manager import ConnectionManager
 
 router = APIRouter()
-manager = ConnectionManager()
+manager = ConnectionManager(channel="test")
 
 
 @router.websocket("/ws/test")
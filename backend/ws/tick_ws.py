@@ -4,21 +4,37 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from .manager import ConnectionManager
 
 router = APIRouter()
-manager = ConnectionManager()
+manager = ConnectionManager(channel="ticks")
 
 
-@router.websocket("/ws/ticks")
-async def websocket_ticks(ws: WebSocket):
+async def serve_ticks(ws: WebSocket):
     await manager.connect(ws)
 
     try:
         while True:
-            await ws.receive_text()  # keep alive
+            # {"op": "subscribe" | "unsubscribe", "symbol"}
+            await manager.handle(ws, await ws.receive_text())
     except WebSocketDisconnect:
         manager.disconnect(ws)
         print("[tick_ws.py] tick 연결 종료")
 
 
+@router.websocket("/ws/ticks")
+async def websocket_ticks(ws: WebSocket):
+    await serve_ticks(ws)
+
+
+# frontend IBKRFeed endpoint
+@router.websocket("/ws/stream")
+async def websocket_stream(ws: WebSocket):
+    await serve_ticks(ws)
+
+
+@router.get("/api/ws/ticks/stats")
+async def tick_ws_stats():
+    return manager.stats()
+
+
 # 외부에서 호출할 broadcast 함수
 async def broadcast_tick(data: dict):
     await manager.broadcast(data)
@@ -6,7 +6,7 @@ export default function DebugConsole() {
   const ref = useRef<HTMLDivElement | null>(null);
 
   useEffect(() => {
-    const ws = new WebSocket("ws://localhost:8000/ws/stream"); // reuse tick stream for heartbeats/errors
+    const ws = new WebSocket("ws://localhost:8000/ws/test"); // heartbeats only; /ws/stream is the tick feed
     ws.onopen = () => setLines((p) => [`[open] connected`, ...p]);
     ws.onclose = () => setLines((p) => [`[close] disconnected`, ...p]);
     ws.onerror = (e) => setLines((p) => [`[error] ${String(e)}`, ...p]);
@@ -42,12 +42,8 @@ export const TopBar: React.FC<TopBarProps> = ({
       const data = await res.json();
       const results: SymbolInfo[] = data.results || [];
 
-      const filtered = results
-        .filter((s) => s.symbol.startsWith(q.toUpperCase()))
-        .sort((a, b) => a.symbol.localeCompare(b.symbol))
-        .slice(0, 15);
-
-      setSuggestions(filtered);
+      // already ranked by the backend (symbol prefix, then name, then fuzzy)
+      setSuggestions(results.slice(0, 15));
       setShowDropdown(true);
     } catch (err) {
       console.error('[TopBar] search fetch error:', err);